@@ -11,6 +11,19 @@ functions:
 
     * assemble_url - an auxiliary function which return the url based on the endpoint
     * make_request - makes a request and returns a response from the server
+    * create_session - returns a requests session with a keep-alive connection pool
+    * get_default_client - returns the pooled client used by the module-level functions for the url
+    * SAS9APIClient - a client bound to one server which exposes every function below as a method
+    * AsyncSAS9APIClient - an asyncio client which exposes every function below as a coroutine method
+    * ResponseCache - an opt-in TTL and LRU cache of metadata responses for SAS9APIClient
+    * DatasetCache - a memory and disk cache of datasets validated by their modification date
+    * ColumnStore - a directory of datasets stored column by column for memory-mapped access
+    * Query - an aggregation query compiled to PROC SQL for run_query
+    * Predicate - a typed condition on records for filter_, compiled to the server filter where possible
+    * Rows - a list of compact records with the shared column names, returned for a row_format
+    * SpooledPages - undecoded pages of a dataset written by spool_pages, read through memory maps
+    * ExtractionJob - a resumable, checkpointed download of the pages of a dataset
+    * ExtractionPlan - a dataset split into shards claimed and downloaded by independent workers
     * get_metadata_server_config - returns the current metadata server configuration
     * get_license_info - returns the information about active SAS Proxy license
     * get_workspace_server_list - returns the list of available workspace servers and their 
@@ -37,18 +50,91 @@ functions:
     * get_dataset_info - returns dataset information by dataset name and library name
     * retrieve_data - retrieves data from a dataset by dataset name and library name
     * insert_data - inserts data into a dataset or replaces data by a key
+    * insert_data_bulk - inserts records into a dataset in chunks uploaded concurrently
     * replace_all_data - replaces all data in a dataset with input data
+    * replace_all_data_stream - replaces all data in a dataset with records streamed from an iterable or a file
+    * upsert_changes - inserts only new and changed records by a key after comparing them with a dataset
     * delete_dataset - deletes dataset from a library
     * find_object - searches for objects
     * copy - copies an object to a folder
     * move_object - moves an object between folders
     * delete_object - deletes an object by its name and folder name
+    * iter_data - lazily iterates over the records of a dataset page by page
+    * AdaptivePageSize - a page size for iter_data adapted to observed response sizes and latencies
+    * iter_data_parallel - retrieves pages of a dataset concurrently
+    * retrieve_data_parallel - retrieves all records of a dataset with concurrent requests
+    * retrieve_data_cached - retrieves a dataset unless an unchanged copy is cached
+    * iter_data_keyset - iterates over the records of a dataset with keyset pagination on a sorted column
+    * retrieve_columns - retrieves a dataset as one masked NumPy array per column
+    * retrieve_columns_parallel - retrieves a dataset as NumPy arrays decoding pages in a process pool
+    * to_dataframe - retrieves a dataset as a pandas DataFrame with typed columns
+    * to_arrow - retrieves a dataset as a pyarrow Table with typed columns
+    * spool_columns - retrieves a dataset into a ColumnStore of memory-mapped column files
+    * sync_columns - incrementally synchronizes a dataset into a ColumnStore by a high-water mark
+    * reconcile_datasets - compares a dataset with its copy by block checksums computed on the servers
+    * run_query - runs an aggregation Query on the workspace server and retrieves only its result
+    * col - returns a column reference for building a Predicate for filter_
+    * spool_pages - downloads the undecoded pages of a dataset to numbered files with a manifest
+    * plan_extraction - splits a dataset into shards for extraction by independent workers
 """
 
 
+import asyncio
+import codecs
+import collections
+import copy
+import csv
+import datetime
+import functools
+import hashlib
+import itertools
+import json
+import mmap
+import multiprocessing
+import operator
+import os
+import pickle
+import re
+import shutil
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+_default_lock = threading.Lock()
+_default_session = None
+_default_clients = {}
+
 
 def assemble_url(url, endpoint):
     """This is an auxiliary function. It checks whether '/' is provided by the user at the end of the url.
@@ -75,7 +161,8 @@ def assemble_url(url, endpoint):
     return url
 
 
-def make_request(method, url, initial_params={}, data="", json_data=[], only_payload=False):
+def make_request(method, url, initial_params={}, data="", json_data=[], only_payload=False,
+                 session=None, timeout=None, on_response=None, row_format="dict", columns=None):
     """Makes HTTP requests.
        
     Parameters
@@ -94,6 +181,19 @@ def make_request(method, url, initial_params={}, data="", json_data=[], only_pay
         A flag used to determine the content of the response returned by the function (default is
         False). If True - the function will return the truncated server response containing only
         the payload. If False - the function will return the full response from the server.
+    session : requests.Session, optional
+        Session used to make the request (default is None). If None - the pooled session shared
+        by the module-level functions is used, so the connection is kept alive between requests.
+    timeout : float/tuple, optional
+        Timeout of the request in seconds (default is None - wait forever).
+    on_response : callable, optional
+        A function called with the requests.Response as soon as it is received, before its status
+        is checked (default is None).
+    row_format : str, optional
+        Format of the records of a list payload (default is 'dict'), see retrieve_data.
+    columns : list, optional
+        Column names of the records in the 'tuple' and 'slots' formats (default is None - the
+        keys of the first record).
         
     Returns
     -------
@@ -103,8 +203,14 @@ def make_request(method, url, initial_params={}, data="", json_data=[], only_pay
     """
     
 
+    decoder = _RowDecoder(row_format, columns)
+    if session is None:
+        session = _get_default_session()
     try:
-        response = requests.request(method, url=url, params=initial_params, data=data, json=json_data)
+        response = session.request(method, url=url, params=initial_params, data=data, json=json_data,
+                                   timeout=timeout)
+        if on_response is not None:
+            on_response(response)
         # If the response was successful, no Exception will be raised
         response.raise_for_status()
     except HTTPError as http_err:
@@ -114,468 +220,4056 @@ def make_request(method, url, initial_params={}, data="", json_data=[], only_pay
         print(f'Other error occurred: {err}')
     else:
         print('Success!')
+        response_json = decoder.decode(response.content)
         if only_payload:
-            return response.json()["payload"]
+            return response_json["payload"]
         else:
-            return response.json()
+            return response_json
 
 
-def get_metadata_server_config(url, only_payload=False):
-    """Gets the current metadata server configuration.
+class Rows(list):
+    """A list of records in the 'tuple' or 'slots' row format with the column names shared by
+       the records. See retrieve_data.
+    """
 
-    Parameters
-    ----------
-    url : str
-        The URL of the server with the installed SAS9API.
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        False). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
 
-    Returns
-    -------
-    dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
-    """
-    
-    
-    endpoint = "sas/"
-    
-    return make_request("GET", assemble_url(url, endpoint), only_payload=only_payload)
+    def __init__(self, rows=(), columns=()):
+        super().__init__(rows)
+        self.columns = list(columns)
 
 
-def get_license_info(url, only_payload=False):
-    """Gets the information about active SAS Proxy license.
+class _Row:
+    """The base of the classes with __slots__ generated for records in the 'slots' row format."""
 
-    Parameters
-    ----------
-    url : str
-        The URL of the server with the installed SAS9API.
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        False). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
 
-    Returns
-    -------
-    dict/list
-        The server response (either full or truncated depending on the 'only_payload' flag) 
-        as a dictionary (full) or a list (truncated).
+    __slots__ = ()
+    _fields = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self._fields, values):
+            setattr(self, name, value)
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self._fields)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and tuple(self) == tuple(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Row({', '.join(f'{name}={value!r}' for name, value in zip(self._fields, self))})"
+
+    def _asdict(self):
+        return dict(zip(self._fields, self))
+
+
+@functools.lru_cache(maxsize=256)
+def _row_class(fields):
+    """This is an auxiliary function. It returns a class with __slots__ for records with the fields."""
+
+
+    invalid = [name for name in fields if not name.isidentifier() or name.startswith("_") or hasattr(_Row, name)]
+    if invalid:
+        raise ValueError(f"Columns {', '.join(invalid)} cannot be attributes, use row_format='tuple'.")
+    return type("Row", (_Row,), {"__slots__": fields, "_fields": fields})
+
+
+class _RowDecoder:
+    """This is an auxiliary class. It decodes a response body building the records of the payload
+       in the row format directly from the key-value pairs of the JSON objects, so no dictionary
+       is created per record. The records have the given columns, or the keys of the first record
+       if no columns are given.
     """
-    
 
-    endpoint = "sas/license"
-    
-    return make_request("GET", assemble_url(url, endpoint), only_payload=only_payload)
 
+    FORMATS = ("dict", "tuple", "slots")
 
-def get_workspace_server_list(url, repository_name="Foundation", only_payload=False):
-    """Gets the list of available workspace servers and their connections from the metadata server.
+    def __init__(self, row_format, columns=None):
+        if row_format not in self.FORMATS:
+            raise ValueError(f"Unknown row format {row_format}, expected one of {', '.join(self.FORMATS)}.")
+        self.row_format = row_format
+        self.columns = None
+        self.row_class = None
+        if columns is not None and row_format != "dict":
+            self._set_columns(tuple(columns))
 
-    Parameters
-    ----------
-    url : str
-        The URL of the server with the installed SAS9API.
-    repository_name : str, optional
-        Repository name (default is 'Foundation').
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
+    def _set_columns(self, columns):
+        self.columns = columns
+        if self.row_format == "slots":
+            self.row_class = _row_class(columns)
 
-    Returns
-    -------
-    dict/list
-        The server response (either full or truncated depending on the 'only_payload' flag) 
-        as a dictionary (full) or a list (truncated).
+    def __call__(self, pairs):
+        # Records only hold scalars; the response object and its nested objects are left as dictionaries
+        if any(key == "payload" or isinstance(value, (list, dict)) for key, value in pairs):
+            return dict(pairs)
+        names = tuple(key for key, _ in pairs)
+        if self.columns is None:
+            self._set_columns(names)
+        if names == self.columns:
+            values = [value for _, value in pairs]
+        else:
+            record = dict(pairs)
+            values = [record.get(name) for name in self.columns]
+        if self.row_format == "tuple":
+            return tuple(values)
+        return self.row_class(*values)
+
+    def decode(self, content):
+        """Decodes a response body, wrapping a list payload in Rows."""
+
+
+        if self.row_format == "dict":
+            return json.loads(content)
+        response_json = json.loads(content, object_pairs_hook=self)
+        if isinstance(response_json, dict) and isinstance(response_json.get("payload"), list):
+            response_json["payload"] = Rows(response_json["payload"], self.columns or ())
+        return response_json
+
+
+def _column_names(info, library_name, dataset_name):
+    """This is an auxiliary function. It returns the column names from the dataset information."""
+
+
+    if info is None or info.get("columns") is None:
+        raise RuntimeError(f"Failed to get the columns of {library_name}.{dataset_name}.")
+    return [column["name"] for column in info["columns"]]
+
+
+# Number of records yielded at once from a streamed response
+STREAM_CHUNK_ROWS = 1000
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _iter_json_array(chunks, key, object_pairs_hook=None):
+    """This is an auxiliary function. It yields the items of the array under 'key' of the JSON
+       object whose UTF-8 text arrives in byte chunks. Only the undecoded rest of the text and one
+       item are held at a time; other members of the object are decoded and dropped.
     """
 
-    
-    endpoint = "sas/servers"
-    
-    initial_params = {"repositoryName": repository_name}
-  
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    decoder = json.JSONDecoder(object_pairs_hook=object_pairs_hook)
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    position = 0
+    ended = False
 
-def get_workspace_server_config(url, server_name, repository_name="Foundation", only_payload=False):
-    """Gets the workspace server information and its connections from the metadata server by a server name.
+    def more():
+        nonlocal buffer, position, ended
+        for chunk in chunks:
+            text = text_decoder.decode(chunk)
+            if text:
+                buffer = buffer[position:] + text
+                position = 0
+                return True
+        buffer = buffer[position:] + text_decoder.decode(b"", final=True)
+        position = 0
+        ended = True
+        return False
 
-    Parameters
-    ----------
-    url : str
-        The URL of the server with the installed SAS9API.
-    server_name : str
-        Server name.
-    repository_name : str, optional
-        Repository name (default is 'Foundation').
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
-    Returns
-    -------
-    dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    def skip_whitespace():
+        nonlocal position
+        while True:
+            position = _WHITESPACE.match(buffer, position).end()
+            if position < len(buffer) or ended or not more():
+                return
+
+    def expect(characters):
+        nonlocal position
+        skip_whitespace()
+        if position >= len(buffer) or buffer[position] not in characters:
+            raise ValueError(f"Expected one of {characters!r} in the response at {buffer[position:position + 20]!r}.")
+        position += 1
+        return buffer[position - 1]
+
+    def value():
+        nonlocal position
+        while True:
+            skip_whitespace()
+            try:
+                result, end = decoder.raw_decode(buffer, position)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(buffer) or ended:
+                    position = end
+                    return result
+            except json.JSONDecodeError:
+                if ended:
+                    raise
+            more()
+
+    expect("{")
+    skip_whitespace()
+    if buffer.startswith("}", position):
+        return
+    while True:
+        name = value()
+        expect(":")
+        if name == key:
+            skip_whitespace()
+            if buffer.startswith("[", position):
+                position += 1
+                skip_whitespace()
+                if buffer.startswith("]", position):
+                    position += 1
+                else:
+                    while True:
+                        yield value()
+                        if expect(",]") == "]":
+                            break
+            # A response without records may have a null payload
+            elif value() is not None:
+                raise ValueError(f"The '{key}' of the response is neither an array nor null.")
+        else:
+            value()
+        if expect(",}") == "}":
+            return
+
+
+def _iter_payload(response, decoder):
+    """This is an auxiliary function. It yields the records of the payload of a streamed
+       requests.Response in the row format of the decoder, with 'ijson' if it is installed.
     """
-    
 
-    endpoint = f"sas/servers/{server_name}"
-    
-    initial_params = {"repositoryName": repository_name}
-    
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    if ijson is not None:
+        response.raw.decode_content = True
+        items = ijson.items(response.raw, "payload.item", use_float=True)
+        if decoder.row_format == "dict":
+            yield from items
+        else:
+            yield from (decoder(list(item.items())) for item in items)
+    else:
+        hook = None if decoder.row_format == "dict" else decoder
+        yield from _iter_json_array(response.iter_content(chunk_size=64 * 1024), "payload", hook)
 
-def get_stp_server_list(url, repository_name="Foundation", only_payload=False):
-    """Gets the list of available Stored Process Servers and their connections from the metadata server.
+
+def create_session(pool_connections=10, pool_maxsize=10, headers=None, auth=None):
+    """Creates a requests session with a keep-alive connection pool.
 
     Parameters
     ----------
-    url : str
-        The URL of the server with the installed SAS9API.
-    repository_name : str, optional
-        Repository name (default is 'Foundation').
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    pool_connections : int, optional
+        Number of per-host connection pools to cache (default is 10).
+    pool_maxsize : int, optional
+        Maximum number of connections kept alive per host (default is 10).
+    headers : dict, optional
+        Headers sent with every request (default is None).
+    auth : tuple/requests.auth.AuthBase, optional
+        Authentication used for every request (default is None).
+
     Returns
     -------
-    dict/list
-        The server response (either full or truncated depending on the 'only_payload' flag) 
-        as a dictionary (full) or a list (truncated).
+    requests.Session
+        The session ready to be used to make requests.
     """
 
-    
-    endpoint = "sas/stp"
-    
-    initial_params = {"repositoryName": repository_name}
-   
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers is not None:
+        session.headers.update(headers)
+    if auth is not None:
+        session.auth = auth
+    return session
 
-def get_stp_server_config(url, server_name, repository_name="Foundation", only_payload=False):
-    """Gets the Stored Process Server information and its connections from the metadata server by a server name.
+
+def _get_default_session():
+    """Returns the session shared by the module-level functions, creating it on first use."""
+
+
+    global _default_session
+    with _default_lock:
+        if _default_session is None:
+            _default_session = create_session()
+        return _default_session
+
+
+def get_default_client(url):
+    """Returns the client used by the module-level functions for the given URL.
+
+    All default clients share one pooled session, so repeated calls to the module-level
+    functions reuse open connections instead of opening a new one for every request.
 
     Parameters
     ----------
     url : str
         The URL of the server with the installed SAS9API.
-    server_name : str
-        Server name.
-    repository_name : str, optional
-        Repository name (default is 'Foundation').
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+
     Returns
     -------
-    dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    SAS9APIClient
+        The default client for the URL.
     """
 
-    
-    endpoint = f"sas/stp/{server_name}"
-    
-    initial_params = {"repositoryName": repository_name}
-        
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    session = _get_default_session()
+    with _default_lock:
+        client = _default_clients.get(url)
+        if client is None:
+            client = SAS9APIClient(url, session=session)
+            _default_clients[url] = client
+        return client
 
-def execute_command(url, command, server_name=None, repository_name="Foundation", 
-                    server_url=None, server_port=None, log_enabled=True, only_payload=False):
-    """Sends a SAS command for execution to the workspace server.
+
+def _select_server(endpoint, initial_params, server_name, repository_name, server_url, server_port):
+    """This is an auxiliary function. It returns the endpoint for the workspace server chosen by
+       'server_name' or by the pair ('server_url' and 'server_port') and adds the matching
+       parameters to 'initial_params'.
 
     Parameters
     ----------
-    url : str
-        The URL of the server with the installed SAS9API
-    command : str
-        SAS command to send to the server.
-    server_name : str (optional, the default Server Name from the configuration file will be used 
-                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
-        Workspace server name (default is None). 
-    repository_name : str, optional
-        Repository name (default is 'Foundation').
-    server_url : str (optional; must come in pair with 'server_port' if specified)
-        Workspace server URL (default is None).
-    server_port : int/str (optional; must come in pair with 'server_url' if specified)
-        Workspace server port (default is None). 
-        
-    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
-    the request is made using 'server_name'.
-    
-    log_enabled : bool
-        A flag which enables log output in the endpoint response (default is True); doesn't populate response fields
-        if set to False.
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    endpoint : str
+        Endpoint relative to the workspace server, e.g. 'libraries/sashelp'.
+    initial_params : dict
+        Parameters of the request, updated in place.
+    server_name : str
+        Workspace server name or None.
+    repository_name : str
+        Repository name.
+    server_url : str
+        Workspace server URL or None.
+    server_port : int/str
+        Workspace server port or None.
+
     Returns
     -------
-    dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
-        
-    Example
-    -------
-        >>> execute_command(url, "proc print data=sashelp.class;run;")
+    str
+        Endpoint ready to be used to make requests.
     """
 
-    
-    if log_enabled:
-        initial_params = {"logEnabled": "true"}
-    else:
-        initial_params = {"logEnabled": "false"}
-        
-    endpoint = "sas/cmd"
-    
+
     if server_name is not None:
-        endpoint = f"sas/servers/{server_name}/cmd"
-        initial_params["repositoryName"] = repository_name    
+        initial_params["repositoryName"] = repository_name
+        return f"sas/servers/{server_name}/{endpoint}"
     elif server_url is not None and server_port is not None:
         initial_params["serverUrl"] = server_url
         initial_params["serverPort"] = server_port
     else:
         print("The default Server Name from the configuration file will be used "
               "because neither 'server_name' nor ('server_url' and 'server_port') are specified!")
-    
-    return make_request("PUT", assemble_url(url, endpoint),
-                       initial_params=initial_params, data=command, only_payload=only_payload)
-
+    return f"sas/{endpoint}"
 
-# USERS *********************************************************************************************************
-def get_user_list(url, repository_name="Foundation", only_payload=False):
-    """Gets the list of server users and their identities.
 
-    Parameters
-    ----------
-    url : str
-        The URL of the server with the installed SAS9API.
-    repository_name : str, optional
-        Repository name (default is 'Foundation').
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
-    Returns
-    -------
-    dict/list
-        The server response (either full or truncated depending on the 'only_payload' flag) 
-        as a dictionary (full) or a list (truncated).
+def _dataset_key(url, library_name, dataset_name, server, filter_=None):
+    """This is an auxiliary function. It returns a tuple identifying the records of a dataset
+       retrieved from a server with a filter, used as a key of the local copies of datasets.
     """
 
-    
-    endpoint = "sas/meta/users"
-    
-    initial_params = {"repositoryName": repository_name}
-        
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    if isinstance(filter_, Predicate):
+        filter_ = filter_._key()
+    return (url.rstrip("/"), server["server_name"], server["repository_name"], server["server_url"],
+            server["server_port"], library_name.upper(), dataset_name.upper(), filter_)
 
-def get_configured_user_info(url, repository_name="Foundation", only_payload=False):
-    """Gets the configured user information and its identities.
 
-    Parameters
-    ----------
-    url : str
-        The URL of the server with the installed SAS9API.
-    repository_name : str, optional
-        Repository name (default is 'Foundation').
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
-    Returns
-    -------
-    dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+def _choose_key(columns):
+    """This is an auxiliary function. It returns the name of the column the dataset is sorted by
+       first if the sort is ascending, else None. An index does not define the order in which the
+       records are returned, and a descending sort key cannot be paged with 'key >= last'.
     """
- 
 
-    endpoint = "sas/user"
-    
-    initial_params = {"repositoryName": repository_name}
-        
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    sorted_columns = [column for column in columns if column.get("sortedBy")]
+    if not sorted_columns:
+        return None
+    first = min(sorted_columns, key=lambda column: abs(column["sortedBy"]))
+    return first["name"] if first["sortedBy"] > 0 else None
+
+
+def _and_filters(*filters):
+    """This is an auxiliary function. It combines dataset filters (dictionaries or None) with AND."""
+
+
+    filters = [filter_ for filter_ in filters if filter_]
+    if not filters:
+        return None
+    if len(filters) == 1:
+        return filters[0]
+    return {"$and": filters}
+
+
+def _server_filter(filter_, columns):
+    """This is an auxiliary function. It returns the dataset filter (JSON) sent to the server for
+       a filter or a Predicate bound to the dataset columns, for the functions which cannot
+       evaluate the part of a Predicate not supported by the server.
+    """
+
+
+    if not isinstance(filter_, Predicate):
+        return filter_
+    server_filter, residual = filter_.bind(columns).split()
+    if residual is not None:
+        raise ValueError(f"Filtering by {residual!r} is not supported by the server; use iter_data, "
+                         f"retrieve_columns or retrieve_columns_parallel.")
+    return json.dumps(server_filter) if server_filter is not None else None
+
+
+def _iter_concurrently(function, arguments, max_workers, max_pending=None, ordered=True):
+    """This is an auxiliary function. It calls 'function' for every argument in a thread pool and
+       yields pairs (argument, result). At most 'max_pending' calls are submitted or finished but
+       not yet yielded at any time, so memory stays bounded for long argument sequences.
+
+    Parameters
+    ----------
+    function : callable
+        Function of one argument.
+    arguments : iterable
+        Arguments, consumed lazily.
+    max_workers : int
+        Number of worker threads.
+    max_pending : int, optional
+        Maximum number of submitted calls (default is None - twice 'max_workers').
+    ordered : bool, optional
+        A flag which defines whether results are yielded in the order of the arguments (default
+        is True). If False - results are yielded as soon as they are ready.
+
+    Yields
+    ------
+    tuple
+        Pairs (argument, result).
+    """
+
+
+    if max_pending is None:
+        max_pending = 2 * max_workers
+    max_pending = max(max_pending, 1)
+    arguments = iter(arguments)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = collections.deque()
+        try:
+            for argument in itertools.islice(arguments, max_pending):
+                pending.append((argument, executor.submit(function, argument)))
+            while pending:
+                if ordered:
+                    argument, future = pending.popleft()
+                else:
+                    wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                    argument, future = next(item for item in pending if item[1].done())
+                    pending.remove((argument, future))
+                result = future.result()
+                for next_argument in itertools.islice(arguments, 1):
+                    pending.append((next_argument, executor.submit(function, next_argument)))
+                yield argument, result
+        finally:
+            # The consumer stopped early or a call failed: do not start the remaining calls
+            for _, future in pending:
+                future.cancel()
+
+
+class _ClientMethods:
+    """Endpoint methods shared by SAS9APIClient and AsyncSAS9APIClient.
+
+    Each method builds the endpoint and the parameters of the request and returns the result of
+    'self.make_request', so the methods of AsyncSAS9APIClient return coroutines.
+    """
+
+
+    def get_metadata_server_config(self, only_payload=False):
+        """Gets the current metadata server configuration. See get_metadata_server_config."""
+
+
+        return self.make_request("GET", "sas/", only_payload=only_payload)
+
+    def get_license_info(self, only_payload=False):
+        """Gets the information about active SAS Proxy license. See get_license_info."""
+
+
+        return self.make_request("GET", "sas/license", only_payload=only_payload)
+
+    def get_workspace_server_list(self, repository_name="Foundation", only_payload=False):
+        """Gets the list of available workspace servers. See get_workspace_server_list."""
+
+
+        initial_params = {"repositoryName": repository_name}
+
+        return self.make_request("GET", "sas/servers",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def get_workspace_server_config(self, server_name, repository_name="Foundation", only_payload=False):
+        """Gets the workspace server information by a server name. See get_workspace_server_config."""
+
+
+        initial_params = {"repositoryName": repository_name}
+
+        return self.make_request("GET", f"sas/servers/{server_name}",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def get_stp_server_list(self, repository_name="Foundation", only_payload=False):
+        """Gets the list of available Stored Process Servers. See get_stp_server_list."""
+
+
+        initial_params = {"repositoryName": repository_name}
+
+        return self.make_request("GET", "sas/stp",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def get_stp_server_config(self, server_name, repository_name="Foundation", only_payload=False):
+        """Gets the Stored Process Server information by a server name. See get_stp_server_config."""
+
+
+        initial_params = {"repositoryName": repository_name}
+
+        return self.make_request("GET", f"sas/stp/{server_name}",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def execute_command(self, command, server_name=None, repository_name="Foundation",
+                        server_url=None, server_port=None, log_enabled=True, only_payload=False):
+        """Sends a SAS command for execution to the workspace server. See execute_command."""
+
+
+        if log_enabled:
+            initial_params = {"logEnabled": "true"}
+        else:
+            initial_params = {"logEnabled": "false"}
+
+        endpoint = _select_server("cmd", initial_params, server_name, repository_name,
+                                  server_url, server_port)
+
+        return self.make_request("PUT", endpoint,
+                                 initial_params=initial_params, data=command, only_payload=only_payload)
+
+    def get_user_list(self, repository_name="Foundation", only_payload=False):
+        """Gets the list of server users and their identities. See get_user_list."""
+
+
+        initial_params = {"repositoryName": repository_name}
+
+        return self.make_request("GET", "sas/meta/users",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def get_configured_user_info(self, repository_name="Foundation", only_payload=False):
+        """Gets the configured user information and its identities. See get_configured_user_info."""
+
+
+        initial_params = {"repositoryName": repository_name}
+
+        return self.make_request("GET", "sas/user",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def get_user_info(self, user_name, repository_name="Foundation", only_payload=False):
+        """Gets the server user information by a user name. See get_user_info."""
+
+
+        initial_params = {"repositoryName": repository_name}
+
+        return self.make_request("GET", f"sas/meta/users/{user_name}",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def get_group_list(self, repository_name="Foundation", only_payload=False):
+        """Gets the list of groups and their associated groups and users. See get_group_list."""
+
+
+        initial_params = {"repositoryName": repository_name}
+
+        return self.make_request("GET", "sas/meta/groups",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def get_group_info(self, group_name, repository_name="Foundation", only_payload=False):
+        """Gets the group information by a group name. See get_group_info."""
+
+
+        initial_params = {"repositoryName": repository_name}
+
+        return self.make_request("GET", f"sas/meta/groups/{group_name}",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def get_role_list(self, repository_name="Foundation", only_payload=False):
+        """Gets the list of roles and their associated groups and users. See get_role_list."""
+
+
+        initial_params = {"repositoryName": repository_name}
+
+        return self.make_request("GET", "sas/meta/roles",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def get_role_info(self, role_name, repository_name="Foundation", only_payload=False):
+        """Gets the role information by a role name. See get_role_info."""
+
+
+        initial_params = {"repositoryName": repository_name}
+
+        return self.make_request("GET", f"sas/meta/roles/{role_name}",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def get_library_list(self, server_name=None, repository_name="Foundation",
+                         server_url=None, server_port=None, only_payload=False):
+        """Gets the list of libraries for the workspace server. See get_library_list."""
+
+
+        initial_params = dict()
+
+        endpoint = _select_server("libraries", initial_params, server_name, repository_name,
+                                  server_url, server_port)
+
+        return self.make_request("GET", endpoint,
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def get_library_info(self, library_name, server_name=None, repository_name="Foundation",
+                         server_url=None, server_port=None, only_payload=False):
+        """Gets the library information by a library name. See get_library_info."""
+
+
+        initial_params = dict()
+
+        endpoint = _select_server(f"libraries/{library_name}", initial_params, server_name,
+                                  repository_name, server_url, server_port)
+
+        return self.make_request("GET", endpoint,
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def create_library(self, server_name, library_name, engine, display_name, path, location,
+                       repository_name="Foundation", is_preassigned=False, only_payload=False):
+        """Creates a library at a given server. See create_library."""
+
+
+        endpoint = f"sas/servers/{server_name}/libraries/{library_name}"
+
+        initial_params = {"engine": engine, "displayName": display_name, "path": path,
+                          "location": location, "repositoryName": repository_name}
+        if is_preassigned:
+            initial_params["isPreassigned"] = "true"
+        else:
+            initial_params["isPreassigned"] = "false"
+
+        return self.make_request("POST", endpoint,
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def delete_library(self, server_name, library_name, repository_name="Foundation", only_payload=False):
+        """Removes all libraries with matching library name. See delete_library."""
+
+
+        endpoint = f"sas/servers/{server_name}/libraries/{library_name}"
+
+        initial_params = {"repositoryName": repository_name}
+
+        return self.make_request("DELETE", endpoint,
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def get_dataset_list(self, library_name, server_name=None, repository_name="Foundation",
+                         server_url=None, server_port=None, only_payload=False):
+        """Gets the list of datasets for the library by a library name. See get_dataset_list."""
+
+
+        initial_params = dict()
+
+        endpoint = _select_server(f"libraries/{library_name}/datasets", initial_params, server_name,
+                                  repository_name, server_url, server_port)
+
+        return self.make_request("GET", endpoint,
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def get_dataset_info(self, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                         server_url=None, server_port=None, only_payload=False):
+        """Gets the dataset information by a dataset name and a library name. See get_dataset_info."""
+
+
+        initial_params = dict()
+
+        endpoint = _select_server(f"libraries/{library_name}/datasets/{dataset_name}", initial_params,
+                                  server_name, repository_name, server_url, server_port)
+
+        return self.make_request("GET", endpoint,
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def retrieve_data(self, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                      server_url=None, server_port=None, limit=100, offset=0, filter_=None, only_payload=False,
+                      row_format="dict", columns=None):
+        """Retrieves data from the dataset by a dataset name and a library name. See retrieve_data."""
+
+
+        initial_params = {"limit": limit, "offset": offset}
+
+        if filter_ is not None:
+            initial_params["filter"] = filter_
+
+        endpoint = _select_server(f"libraries/{library_name}/datasets/{dataset_name}/data", initial_params,
+                                  server_name, repository_name, server_url, server_port)
+
+        return self.make_request("GET", endpoint,
+                                 initial_params=initial_params, only_payload=only_payload, row_format=row_format,
+                                 columns=columns)
+
+    def insert_data(self, library_name, dataset_name, json_data, server_name=None, repository_name="Foundation",
+                    server_url=None, server_port=None, by_key=None, only_payload=False):
+        """Inserts data into the dataset or replaces data by a key. See insert_data."""
+
+
+        initial_params = dict()
+        if by_key is not None:
+            initial_params["byKey"] = by_key
+
+        endpoint = _select_server(f"libraries/{library_name}/datasets/{dataset_name}/data", initial_params,
+                                  server_name, repository_name, server_url, server_port)
+
+        return self.make_request("PUT", endpoint,
+                                 initial_params=initial_params,
+                                 json_data=json_data, only_payload=only_payload)
+
+    def replace_all_data(self, library_name, dataset_name, json_data, server_name=None,
+                         repository_name="Foundation", server_url=None, server_port=None, only_payload=False):
+        """Replaces all data in the dataset with input data. See replace_all_data."""
+
+
+        initial_params = dict()
+
+        endpoint = _select_server(f"libraries/{library_name}/datasets/{dataset_name}/data", initial_params,
+                                  server_name, repository_name, server_url, server_port)
+
+        return self.make_request("POST", endpoint,
+                                 initial_params=initial_params,
+                                 json_data=json_data, only_payload=only_payload)
+
+    def delete_dataset(self, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                       server_url=None, server_port=None, only_payload=False):
+        """Deletes dataset from a library. See delete_dataset."""
+
+
+        initial_params = dict()
+
+        endpoint = _select_server(f"libraries/{library_name}/datasets/{dataset_name}/data", initial_params,
+                                  server_name, repository_name, server_url, server_port)
+
+        return self.make_request("DELETE", endpoint,
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def find_object(self, repository_name="Foundation", location=None, location_recursive=True, object_id=None,
+                    object_type=None, public_type=None, name_equals=None, name_starts=None, name_contains=None,
+                    name_regex=None, description_contains=None, description_regex=None, created_gt=None,
+                    created_lt=None, modified_gt=None, modified_lt=None, table_libref=None, table_dbms=None,
+                    include_associations=False, include_permissions=False, only_payload=False):
+        """Finds objects. See find_object."""
+
+
+        initial_params = {"repositoryName": repository_name, "location": location,
+                          "locationRecursive": location_recursive, "objectID": object_id,
+                          "objectType": object_type, "publicType": public_type,
+                          "nameEquals": name_equals, "nameStarts": name_starts,
+                          "nameContains": name_contains, "nameRegex": name_regex,
+                          "descriptionContains": description_contains, "descriptionRegex": description_regex,
+                          "createdGt": created_gt, "createdLt": created_lt, "modifiedGt": modified_gt,
+                          "modifiedLt": modified_lt, "tableLibref": table_libref, "tableDBMS": table_dbms,
+                          "includeAssociations": include_associations, "includePermissions": include_permissions}
+
+        return self.make_request("GET", "sas/meta/search",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def move_object(self, source_location, source_name, public_type, destination_location,
+                    repository_name="Foundation", only_payload=False):
+        """Moves object between folders. See move_object."""
+
+
+        # Error in the source code!!! Correcting it here, but when it is corrected in Java code,
+        # will have to flip destinationLocation and PublicType !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
+
+        initial_params = {"sourceLocation": source_location, "sourceName": source_name,
+                          "destinationLocation": public_type, "publicType": destination_location,
+                          "repositoryName": repository_name}
+
+        return self.make_request("POST", "sas/meta/objects/move",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+    def delete_object(self, source_location, source_name, public_type, repository_name="Foundation",
+                      only_payload=False):
+        """Deletes object by its name and location. See delete_object."""
+
+
+        initial_params = {"sourceLocation": source_location, "sourceName": source_name,
+                          "publicType": public_type, "repositoryName": repository_name}
+
+        return self.make_request("POST", "sas/meta/objects/delete",
+                                 initial_params=initial_params, only_payload=only_payload)
+
+
+class SAS9APIClient(_ClientMethods):
+    """A client bound to one SAS9API server which reuses pooled keep-alive connections.
+
+    Every module-level function is available as a method with the same parameters except 'url'.
+    The client can be used as a context manager; the session is closed on exit unless it was
+    passed in by the caller.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    pool_connections : int, optional
+        Number of per-host connection pools to cache (default is 10).
+    pool_maxsize : int, optional
+        Maximum number of connections kept alive per host (default is 10).
+    headers : dict, optional
+        Headers sent with every request (default is None).
+    auth : tuple/requests.auth.AuthBase, optional
+        Authentication used for every request (default is None).
+    timeout : float/tuple, optional
+        Timeout of every request in seconds (default is None - wait forever).
+    session : requests.Session, optional
+        Session to use instead of creating a new one (default is None).
+    cache : ResponseCache, optional
+        Cache of metadata responses (default is None - responses are not cached).
+
+    Example
+    -------
+        >>> with SAS9APIClient(url, pool_maxsize=20, cache=ResponseCache()) as client:
+        ...     client.get_library_list(server_name="SASApp", only_payload=True)
+    """
+
+
+    def __init__(self, url, pool_connections=10, pool_maxsize=10, headers=None, auth=None,
+                 timeout=None, session=None, cache=None):
+        self.url = url
+        self.timeout = timeout
+        self.cache = cache
+        self._local = threading.local()
+        self._owns_session = session is None
+        if session is None:
+            session = create_session(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                     headers=headers, auth=auth)
+        self.session = session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the pooled connections if the session is owned by the client."""
+
+
+        if self._owns_session:
+            self.session.close()
+
+    def make_request(self, method, endpoint, initial_params={}, data="", json_data=[], only_payload=False,
+                     row_format="dict", columns=None):
+        """Makes an HTTP request to the endpoint of the client's server over the pooled session.
+           If the client has a cache, cacheable GET responses are served from it and other
+           requests invalidate the cached responses they may change.
+
+        See make_request for the description of the parameters and the returned value.
+        """
+
+
+        cache = self.cache
+        if cache is None or row_format != "dict":
+            return self._make_request(method, endpoint, initial_params, data, json_data, only_payload, row_format,
+                                      columns)
+        if method != "GET":
+            response = self._make_request(method, endpoint, initial_params, data, json_data, only_payload)
+            cache.invalidate(endpoint)
+            return response
+
+        key = cache.make_key(endpoint, initial_params)
+        if key is None:
+            return self._make_request(method, endpoint, initial_params, data, json_data, only_payload)
+        response = cache.get(key)
+        if response is None:
+            response = self._make_request(method, endpoint, initial_params, data, json_data, False)
+            if response is None:
+                return None
+            cache.put(key, response)
+        if only_payload:
+            return response["payload"]
+        return response
+
+    def _make_request(self, method, endpoint, initial_params, data, json_data, only_payload, row_format="dict",
+                      columns=None):
+        """Makes an HTTP request bypassing the cache."""
+
+
+        return make_request(method, assemble_url(self.url, endpoint), initial_params=initial_params,
+                            data=data, json_data=json_data, only_payload=only_payload,
+                            session=self.session, timeout=self.timeout, on_response=self._record_response,
+                            row_format=row_format, columns=columns)
+
+    def retrieve_data(self, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                      server_url=None, server_port=None, limit=100, offset=0, filter_=None, only_payload=False,
+                      row_format="dict", columns=None):
+        """Retrieves data from the dataset by a dataset name and a library name. See retrieve_data."""
+
+
+        if row_format != "dict" and columns is None:
+            info = self.get_dataset_info(library_name, dataset_name, server_name=server_name,
+                                         repository_name=repository_name, server_url=server_url,
+                                         server_port=server_port, only_payload=True)
+            columns = _column_names(info, library_name, dataset_name)
+        return super().retrieve_data(library_name, dataset_name, server_name=server_name,
+                                     repository_name=repository_name, server_url=server_url,
+                                     server_port=server_port, limit=limit, offset=offset, filter_=filter_,
+                                     only_payload=only_payload, row_format=row_format, columns=columns)
+
+    def _record_response(self, response):
+        """Remembers the body size of the last response received by the current thread."""
+
+
+        self._local.response_size = len(response.content)
+
+    def _last_response_size(self):
+        """Returns the body size of the last response received by the current thread."""
+
+
+        return getattr(self._local, "response_size", None)
+
+    def _retrieve_page(self, library_name, dataset_name, server, offset, limit, filter_=None, row_format="dict",
+                       columns=None):
+        """Retrieves one page of records and raises RuntimeError if the request failed, so that
+           a paging loop never mistakes a failed request for the end of the dataset.
+        """
+
+
+        page = self.retrieve_data(library_name, dataset_name, limit=limit, offset=offset,
+                                  filter_=filter_, only_payload=True, row_format=row_format, columns=columns,
+                                  **server)
+        if page is None:
+            raise RuntimeError(f"Failed to retrieve data from {library_name}.{dataset_name} "
+                               f"at offset {offset}.")
+        return page
+
+    def _fresh_dataset_info(self, library_name, dataset_name, server):
+        """Gets the dataset information payload bypassing the cache, since the number of records
+           and the modification date must be current to page through or to validate data.
+        """
+
+
+        initial_params = dict()
+
+        endpoint = _select_server(f"libraries/{library_name}/datasets/{dataset_name}", initial_params,
+                                  server["server_name"], server["repository_name"], server["server_url"],
+                                  server["server_port"])
+
+        return self._make_request("GET", endpoint, initial_params, "", [], True)
+
+    def _count_records(self, library_name, dataset_name, server):
+        """Returns 'objectsNumber' of the dataset or None if it is not available."""
+
+
+        info = self._fresh_dataset_info(library_name, dataset_name, server)
+        if info is None:
+            return None
+        return info.get("objectsNumber")
+
+    def iter_data(self, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                  server_url=None, server_port=None, page_size=1000, offset=0, filter_=None, pages=False,
+                  prefetch=0, row_format="dict", stream=False):
+        """Lazily iterates over the records of the dataset page by page. See iter_data."""
+
+
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        if isinstance(filter_, Predicate):
+            yield from self._iter_predicate(library_name, dataset_name, server, page_size, offset, filter_,
+                                            pages, prefetch, row_format, stream)
+            return
+        adaptive = isinstance(page_size, AdaptivePageSize)
+        if adaptive and prefetch > 0:
+            raise ValueError("'prefetch' cannot be combined with an adaptive page size.")
+        if stream and (adaptive or prefetch > 0):
+            raise ValueError("'stream' cannot be combined with 'prefetch' or an adaptive page size.")
+        info = None
+        if filter_ is None or adaptive or row_format != "dict":
+            info = self._fresh_dataset_info(library_name, dataset_name, server)
+        # 'objectsNumber' counts all records, so it is only a valid stop condition without a filter
+        total = None
+        if info is not None and filter_ is None:
+            total = info.get("objectsNumber")
+        columns = None
+        if row_format != "dict":
+            columns = _column_names(info, library_name, dataset_name)
+
+        if adaptive:
+            if info is not None and info.get("columns"):
+                page_size.estimate(info["columns"])
+            results = self._iter_adaptive_pages(library_name, dataset_name, server, offset, total,
+                                                filter_, page_size, row_format, columns)
+        else:
+            if total is None:
+                offsets = itertools.count(offset, page_size)
+            else:
+                offsets = range(offset, total, page_size)
+            if stream:
+                yield from self._iter_streamed_pages(library_name, dataset_name, server, offsets, page_size,
+                                                     filter_, pages, row_format, columns)
+                return
+
+            def retrieve(page_offset):
+                page = self._retrieve_page(library_name, dataset_name, server, page_offset, page_size, filter_,
+                                           row_format, columns)
+                return page_size, page
+
+            if prefetch > 0:
+                results = (result for _, result in _iter_concurrently(retrieve, offsets, prefetch,
+                                                                      max_pending=prefetch))
+            else:
+                results = (retrieve(page_offset) for page_offset in offsets)
+        try:
+            for limit, page in results:
+                if page:
+                    if pages:
+                        yield page
+                    else:
+                        yield from page
+                if len(page) < limit:
+                    break
+        finally:
+            results.close()
+
+    def _iter_streamed_pages(self, library_name, dataset_name, server, offsets, page_size, filter_, pages,
+                             row_format, columns=None):
+        """Retrieves pages at the offsets with streamed responses and yields records or chunks of
+           at most STREAM_CHUNK_ROWS records as they are decoded.
+        """
+
+
+        for page_offset in offsets:
+            count = 0
+            for chunk in self._stream_page(library_name, dataset_name, server, page_offset, page_size, filter_,
+                                           row_format, columns):
+                count += len(chunk)
+                if pages:
+                    yield chunk
+                else:
+                    yield from chunk
+            if count < page_size:
+                break
+
+    def _stream_page(self, library_name, dataset_name, server, offset, limit, filter_=None, row_format="dict",
+                     columns=None):
+        """Retrieves one page of records with a streamed response and yields chunks of at most
+           STREAM_CHUNK_ROWS records, decoding the payload incrementally as the body arrives.
+        """
+
+
+        decoder = _RowDecoder(row_format, columns)
+        initial_params = {"limit": limit, "offset": offset}
+        if filter_ is not None:
+            initial_params["filter"] = filter_
+        endpoint = _select_server(f"libraries/{library_name}/datasets/{dataset_name}/data", initial_params,
+                                  server["server_name"], server["repository_name"], server["server_url"],
+                                  server["server_port"])
+        with self.session.get(assemble_url(self.url, endpoint), params=initial_params, timeout=self.timeout,
+                              stream=True) as response:
+            if not response.ok:
+                raise RuntimeError(f"Failed to retrieve data from {library_name}.{dataset_name} at offset "
+                                   f"{offset}: HTTP {response.status_code}.")
+            for chunk in _chunk_records(_iter_payload(response, decoder), STREAM_CHUNK_ROWS):
+                yield chunk if row_format == "dict" else Rows(chunk, decoder.columns)
+
+    def _iter_predicate(self, library_name, dataset_name, server, page_size, offset, predicate, pages, prefetch,
+                        row_format, stream=False):
+        """Iterates over the records matching a Predicate: the part of it supported by the server
+           is sent as the filter and the rest is evaluated on every page with NumPy.
+        """
+
+
+        info = self.get_dataset_info(library_name, dataset_name, only_payload=True, **server)
+        if info is None:
+            raise RuntimeError(f"Failed to get the columns of {library_name}.{dataset_name}.")
+        columns = info["columns"]
+        server_filter, residual = predicate.bind(columns).split()
+        if residual is not None and np is None:
+            raise ImportError(f"Filtering by {residual!r} requires the 'numpy' module to be installed.")
+        if residual is not None and row_format == "tuple":
+            raise ValueError(f"Filtering by {residual!r} requires the 'dict' or 'slots' row format.")
+        if server_filter is not None:
+            server_filter = json.dumps(server_filter)
+        if residual is not None:
+            # Only the columns of the residual are converted to evaluate it
+            referenced = residual._columns()
+            columns = [column for column in columns if column["name"] in referenced]
+        for page in self.iter_data(library_name, dataset_name, page_size=page_size, offset=offset,
+                                   filter_=server_filter, pages=True, prefetch=prefetch, row_format=row_format,
+                                   stream=stream, **server):
+            if residual is not None:
+                mask = residual.evaluate(_page_to_columns(page, columns))
+                page = type(page)(itertools.compress(page, mask), page.columns) \
+                    if isinstance(page, Rows) else list(itertools.compress(page, mask))
+            if page:
+                if pages:
+                    yield page
+                else:
+                    yield from page
+
+    def _iter_adaptive_pages(self, library_name, dataset_name, server, offset, total, filter_, sizer,
+                             row_format="dict", columns=None):
+        """Retrieves pages sized by 'sizer' and yields pairs (limit, page). Failed requests are
+           retried with a smaller page after a growing delay until 'sizer' gives up.
+        """
+
+
+        while total is None or offset < total:
+            limit = sizer.page_size
+            started = time.perf_counter()
+            page = self.retrieve_data(library_name, dataset_name, limit=limit, offset=offset,
+                                      filter_=filter_, only_payload=True, row_format=row_format, columns=columns,
+                                      **server)
+            seconds = time.perf_counter() - started
+            if page is None:
+                delay = sizer.failed()
+                if delay is None:
+                    raise RuntimeError(f"Failed to retrieve data from {library_name}.{dataset_name} "
+                                       f"at offset {offset}.")
+                time.sleep(delay)
+                continue
+            sizer.observe(len(page), self._last_response_size(), seconds)
+            yield limit, page
+            offset += len(page)
+
+    def iter_data_keyset(self, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                         server_url=None, server_port=None, key=None, page_size=1000, filter_=None, pages=False):
+        """Iterates over the records of the dataset with keyset pagination. See iter_data_keyset."""
+
+
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        if key is None or isinstance(filter_, Predicate):
+            info = self.get_dataset_info(library_name, dataset_name, only_payload=True, **server)
+            if info is None:
+                raise RuntimeError(f"Failed to get the columns of {library_name}.{dataset_name}.")
+            filter_ = _server_filter(filter_, info.get("columns") or [])
+        if key is None:
+            key = _choose_key(info.get("columns") or [])
+            if key is None:
+                raise ValueError(f"{library_name}.{dataset_name} is not sorted in ascending order, "
+                                 f"'key' must be specified.")
+
+        base_filter = json.loads(filter_) if filter_ is not None else None
+        # 'last' is the greatest key value retrieved so far and 'ties' is the number of retrieved
+        # records with this value; the next page skips them instead of skipping every record before
+        last = None
+        ties = 0
+        while True:
+            if last is None:
+                # Missing values sort first and cannot be compared, so they are paged by offset
+                page_filter = base_filter
+            else:
+                page_filter = _and_filters(base_filter, {key: {"$gte": last}})
+            if page_filter is not None:
+                page_filter = json.dumps(page_filter)
+            page = self._retrieve_page(library_name, dataset_name, server, ties, page_size, page_filter)
+            if page:
+                if pages:
+                    yield page
+                else:
+                    yield from page
+            if len(page) < page_size:
+                break
+            page_last = page[-1].get(key)
+            if page_last == last:
+                ties += len(page)
+            else:
+                last = page_last
+                ties = 0
+                for record in reversed(page):
+                    if record.get(key) != last:
+                        break
+                    ties += 1
+
+    def retrieve_columns(self, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                         server_url=None, server_port=None, page_size=10000, filter_=None, fixed_width=True,
+                         prefetch=0):
+        """Retrieves the dataset as one masked NumPy array per column. See retrieve_columns."""
+
+
+        if np is None:
+            raise ImportError("retrieve_columns requires the 'numpy' module to be installed.")
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        columns, chunks = self._retrieve_column_chunks(library_name, dataset_name, server, page_size,
+                                                       filter_, fixed_width, prefetch)
+        return {column["name"]: _concatenate_columns(chunks[column["name"]], column, fixed_width)
+                for column in columns}
+
+    def _retrieve_column_chunks(self, library_name, dataset_name, server, page_size, filter_, fixed_width,
+                                prefetch):
+        """Retrieves the dataset columns and the (values, missing) chunks of every column, one per page."""
+
+
+        info = self.get_dataset_info(library_name, dataset_name, only_payload=True, **server)
+        if info is None:
+            raise RuntimeError(f"Failed to get the columns of {library_name}.{dataset_name}.")
+        columns = info["columns"]
+
+        chunks = {column["name"]: [] for column in columns}
+        for page in self.iter_data(library_name, dataset_name, page_size=page_size, filter_=filter_,
+                                   pages=True, prefetch=prefetch, **server):
+            for name, chunk in _page_to_columns(page, columns, fixed_width).items():
+                chunks[name].append(chunk)
+        return columns, chunks
+
+    def to_dataframe(self, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                     server_url=None, server_port=None, page_size=10000, filter_=None, prefetch=0):
+        """Retrieves the dataset as a pandas DataFrame with typed columns. See to_dataframe."""
+
+
+        if pd is None:
+            raise ImportError("to_dataframe requires the 'pandas' module to be installed.")
+        arrays = self.retrieve_columns(library_name, dataset_name, server_name=server_name,
+                                       repository_name=repository_name, server_url=server_url,
+                                       server_port=server_port, page_size=page_size, filter_=filter_,
+                                       fixed_width=False, prefetch=prefetch)
+        data = dict()
+        for name, array in arrays.items():
+            values = array.data
+            if values.dtype == object:
+                values[array.mask] = None
+            elif values.dtype.kind == "f":
+                values[array.mask] = np.nan
+            elif values.dtype.kind == "M":
+                values[array.mask] = np.datetime64("NaT")
+            data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                 server_url=None, server_port=None, page_size=10000, filter_=None, prefetch=0):
+        """Retrieves the dataset as a pyarrow Table with typed columns. See to_arrow."""
+
+
+        if pa is None or np is None:
+            raise ImportError("to_arrow requires the 'pyarrow' and 'numpy' modules to be installed.")
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        columns, chunks = self._retrieve_column_chunks(library_name, dataset_name, server, page_size,
+                                                       filter_, False, prefetch)
+        arrays = []
+        for column in columns:
+            column_chunks = [pa.array(values, mask=missing, type=pa.string() if values.dtype == object else None)
+                             for values, missing in chunks[column["name"]]]
+            types = [chunk.type for chunk in column_chunks if chunk.null_count < len(chunk)]
+            if types:
+                type_ = types[0]
+            elif column["type"] == "num":
+                type_ = pa.float64()
+            else:
+                type_ = pa.string()
+            # A date column is only recognized on pages where it has values
+            column_chunks = [chunk if chunk.type == type_ else pa.nulls(len(chunk), type=type_)
+                             for chunk in column_chunks]
+            arrays.append(pa.chunked_array(column_chunks, type=type_))
+        return pa.Table.from_arrays(arrays, names=[column["name"] for column in columns])
+
+    def iter_data_parallel(self, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                           server_url=None, server_port=None, page_size=10000, max_workers=4, offset=0,
+                           filter_=None, ordered=True):
+        """Retrieves pages of the dataset concurrently and yields pairs (offset, page).
+           See iter_data_parallel.
+        """
+
+
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        info = self._fresh_dataset_info(library_name, dataset_name, server)
+        if info is None or info.get("objectsNumber") is None:
+            raise RuntimeError(f"Failed to get the number of records of {library_name}.{dataset_name}.")
+        total = info["objectsNumber"]
+        filter_ = _server_filter(filter_, info.get("columns") or [])
+
+        def retrieve(page_offset):
+            return self._retrieve_page(library_name, dataset_name, server, page_offset, page_size, filter_)
+
+        partitions = range(offset, total, page_size)
+        yield from _iter_concurrently(retrieve, partitions, max_workers, ordered=ordered)
+
+    def retrieve_data_parallel(self, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                               server_url=None, server_port=None, page_size=10000, max_workers=4, offset=0,
+                               filter_=None):
+        """Retrieves all records of the dataset with concurrent requests. See retrieve_data_parallel."""
+
+
+        records = []
+        for _, page in self.iter_data_parallel(library_name, dataset_name, server_name=server_name,
+                                               repository_name=repository_name, server_url=server_url,
+                                               server_port=server_port, page_size=page_size,
+                                               max_workers=max_workers, offset=offset, filter_=filter_):
+            records.extend(page)
+        return records
+
+    def insert_data_bulk(self, library_name, dataset_name, records, server_name=None, repository_name="Foundation",
+                         server_url=None, server_port=None, by_key=None, chunk_rows=1000, chunk_bytes=None,
+                         max_workers=4, max_retries=3, backoff_delay=1.0, progress=None):
+        """Inserts records into the dataset in chunks uploaded concurrently. See insert_data_bulk."""
+
+
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+
+        def upload(indexed_chunk):
+            _, chunk = indexed_chunk
+            for attempt in range(max_retries + 1):
+                if attempt:
+                    time.sleep(backoff_delay * 2 ** (attempt - 1))
+                payload = self.insert_data(library_name, dataset_name, chunk, by_key=by_key,
+                                           only_payload=True, **server)
+                if payload is not None:
+                    return payload
+            return None
+
+        summary = {"itemsInserted": 0, "itemsUpdated": 0, "itemsRemoved": 0, "records": 0, "chunks": 0,
+                   "failed": []}
+        chunks = enumerate(_chunk_records(records, chunk_rows, chunk_bytes))
+        for (index, chunk), payload in _iter_concurrently(upload, chunks, max_workers, ordered=False):
+            summary["chunks"] += 1
+            if payload is None:
+                print(f"Chunk {index} of {len(chunk)} records failed after {max_retries} retries.")
+                summary["failed"].append(chunk)
+            else:
+                summary["records"] += len(chunk)
+                for counter in ("itemsInserted", "itemsUpdated", "itemsRemoved"):
+                    summary[counter] += payload.get(counter) or 0
+            if progress is not None:
+                progress(summary)
+        return summary
+
+    def replace_all_data_stream(self, library_name, dataset_name, source, server_name=None,
+                                repository_name="Foundation", server_url=None, server_port=None, chunk_rows=1000,
+                                chunk_bytes=None, max_workers=1, max_retries=3, backoff_delay=1.0, progress=True):
+        """Replaces all data in the dataset with records streamed from an iterable or a file.
+           See replace_all_data_stream.
+        """
+
+
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        if isinstance(source, (str, os.PathLike)):
+            columns = None
+            if str(source).lower().endswith(".csv"):
+                # CSV values are strings; the dataset columns tell which of them are numbers
+                info = self.get_dataset_info(library_name, dataset_name, only_payload=True, **server)
+                if info is None:
+                    raise RuntimeError(f"Failed to get the columns of {library_name}.{dataset_name}.")
+                columns = info["columns"]
+            source = _read_records(source, columns)
+
+        started = time.perf_counter()
+
+        def report(summary):
+            seconds = time.perf_counter() - started
+            if callable(progress):
+                progress(summary["records"], seconds)
+            elif progress:
+                print(f"Sent {summary['records']} records in {seconds:.1f} s "
+                      f"({summary['records'] / max(seconds, 1e-9):.0f} records/s).")
+
+        chunks = _chunk_records(source, chunk_rows, chunk_bytes)
+        first = next(chunks, [])
+        payload = self.replace_all_data(library_name, dataset_name, first, only_payload=True, **server)
+        if payload is None:
+            raise RuntimeError(f"Failed to replace the data of {library_name}.{dataset_name}.")
+        summary = {"itemsInserted": payload.get("itemsInserted") or 0, "itemsUpdated": 0,
+                   "itemsRemoved": payload.get("itemsRemoved") or 0, "records": len(first), "chunks": 1,
+                   "failed": []}
+        report(summary)
+
+        def report_rest(rest):
+            report({"records": summary["records"] + rest["records"]})
+
+        rest = self.insert_data_bulk(library_name, dataset_name, itertools.chain.from_iterable(chunks),
+                                     chunk_rows=chunk_rows, chunk_bytes=chunk_bytes, max_workers=max_workers,
+                                     max_retries=max_retries, backoff_delay=backoff_delay,
+                                     progress=report_rest if progress else None, **server)
+        for counter in ("itemsInserted", "itemsUpdated", "records", "chunks"):
+            summary[counter] += rest[counter]
+        summary["failed"] = rest["failed"]
+        if summary["failed"]:
+            raise RuntimeError(f"{len(summary['failed'])} chunks of {sum(map(len, summary['failed']))} records "
+                               f"could not be appended to {library_name}.{dataset_name} after "
+                               f"{max_retries} retries; the data is only partly replaced.")
+        return summary
+
+    def retrieve_data_cached(self, library_name, dataset_name, cache, server_name=None, repository_name="Foundation",
+                             server_url=None, server_port=None, filter_=None, page_size=10000, prefetch=0):
+        """Retrieves all records of the dataset unless an unchanged copy is cached.
+           See retrieve_data_cached.
+        """
+
+
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        info = self._fresh_dataset_info(library_name, dataset_name, server)
+        if info is None:
+            raise RuntimeError(f"Failed to get the information of {library_name}.{dataset_name}.")
+        version = (info.get("modificationDate"), info.get("objectsNumber"))
+        key = _dataset_key(self.url, library_name, dataset_name, server, filter_)
+
+        records = cache.get(key, version)
+        if records is None:
+            records = list(self.iter_data(library_name, dataset_name, page_size=page_size, filter_=filter_,
+                                          prefetch=prefetch, **server))
+            cache.put(key, version, records)
+        return records
+
+    def spool_columns(self, library_name, dataset_name, store, server_name=None, repository_name="Foundation",
+                      server_url=None, server_port=None, filter_=None, page_size=10000, prefetch=0):
+        """Retrieves the dataset into a memory-mapped column store. See spool_columns."""
+
+
+        if np is None:
+            raise ImportError("spool_columns requires the 'numpy' module to be installed.")
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        info = self._fresh_dataset_info(library_name, dataset_name, server)
+        if info is None:
+            raise RuntimeError(f"Failed to get the columns of {library_name}.{dataset_name}.")
+        columns = info["columns"]
+        pages = self.iter_data(library_name, dataset_name, page_size=page_size, filter_=filter_, pages=True,
+                               prefetch=prefetch, **server)
+        chunks = (_page_to_columns(page, columns) for page in pages)
+        key = _dataset_key(self.url, library_name, dataset_name, server, filter_)
+        return store.write(key, info, chunks)
+
+    def sync_columns(self, library_name, dataset_name, store, watermark, server_name=None,
+                     repository_name="Foundation", server_url=None, server_port=None, filter_=None,
+                     page_size=10000, prefetch=0, full=False):
+        """Brings the dataset in a column store up to date by its high-water mark. See sync_columns."""
+
+
+        if np is None:
+            raise ImportError("sync_columns requires the 'numpy' module to be installed.")
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        info = self._fresh_dataset_info(library_name, dataset_name, server)
+        if info is None:
+            raise RuntimeError(f"Failed to get the columns of {library_name}.{dataset_name}.")
+        columns = info["columns"]
+        if watermark not in [column["name"] for column in columns]:
+            raise ValueError(f"{library_name}.{dataset_name} has no column {watermark}.")
+        key = _dataset_key(self.url, library_name, dataset_name, server, filter_)
+        filter_ = _server_filter(filter_, columns)
+
+        dataset = None if full else store.open(key)
+        if dataset is not None:
+            stored = dataset.meta
+            layout = [(column["name"], column["type"], column["length"]) for column in columns]
+            # A smaller dataset means that records were deleted or the dataset was replaced, so
+            # records above the mark would not bring the copy up to date
+            if (stored.get("watermark") is None or stored["watermark"]["column"] != watermark
+                    or layout != [(column["name"], column["type"], column["length"])
+                                  for column in stored["columns"]]
+                    or (info.get("objectsNumber") or 0) < (stored["info"].get("objectsNumber") or 0)):
+                dataset = None
+
+        if dataset is not None:
+            mark = dict(dataset.watermark)
+            page_filter = json.loads(filter_) if filter_ is not None else None
+            if mark["value"] is not None:
+                page_filter = _and_filters(page_filter, {watermark: {"$gt": mark["value"]}})
+            if page_filter is not None:
+                page_filter = json.dumps(page_filter)
+            pages = self.iter_data(library_name, dataset_name, page_size=page_size, filter_=page_filter,
+                                   pages=True, prefetch=prefetch, **server)
+            chunks = (_page_to_columns(page, columns) for page in _track_watermark(pages, mark))
+            try:
+                return store.append(key, info, chunks, mark)
+            except ValueError:
+                # A column stored without values could not tell dates from numbers
+                pass
+            finally:
+                pages.close()
+
+        mark = {"column": watermark, "value": None}
+        pages = self.iter_data(library_name, dataset_name, page_size=page_size, filter_=filter_, pages=True,
+                               prefetch=prefetch, **server)
+        chunks = (_page_to_columns(page, columns) for page in _track_watermark(pages, mark))
+        return store.write(key, info, chunks, mark)
+
+    def upsert_changes(self, library_name, dataset_name, records, by_key, server_name=None,
+                       repository_name="Foundation", server_url=None, server_port=None, delete=False,
+                       page_size=10000, prefetch=0, chunk_rows=1000, chunk_bytes=None, max_workers=4,
+                       max_retries=3, backoff_delay=1.0, progress=None):
+        """Inserts only the new and changed records by a key. See upsert_changes."""
+
+
+        if np is None:
+            raise ImportError("upsert_changes requires the 'numpy' module to be installed.")
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        info = self._fresh_dataset_info(library_name, dataset_name, server)
+        if info is None:
+            raise RuntimeError(f"Failed to get the columns of {library_name}.{dataset_name}.")
+        names = {column["name"].upper(): column for column in info["columns"]}
+        if by_key.upper() not in names:
+            raise ValueError(f"{library_name}.{dataset_name} has no column {by_key}.")
+        key_column = names[by_key.upper()]
+
+        records = iter(records)
+        first = next(records, None)
+        columns = list(first) if first is not None else [by_key]
+        unknown = [name for name in columns if name.upper() not in names]
+        if unknown:
+            raise ValueError(f"{library_name}.{dataset_name} has no columns {', '.join(unknown)}.")
+        if first is not None:
+            records = itertools.chain([first], records)
+        server_columns = [names[name.upper()]["name"] for name in columns]
+        local_key = next((name for name in columns if name.upper() == by_key.upper()), by_key)
+
+        # The server side of the diff is kept as two arrays of 64-bit hashes - 16 bytes per record
+        key_hashes = []
+        row_hashes = []
+        for page in self.iter_data(library_name, dataset_name, page_size=page_size, pages=True,
+                                   prefetch=prefetch, **server):
+            key_hashes.append(_hash_records(page, [key_column["name"]]))
+            row_hashes.append(_hash_records(page, server_columns))
+        key_hashes = np.concatenate(key_hashes) if key_hashes else np.empty(0, dtype=np.uint64)
+        row_hashes = np.concatenate(row_hashes) if row_hashes else np.empty(0, dtype=np.uint64)
+        order = np.argsort(key_hashes, kind="stable")
+        key_hashes = key_hashes[order]
+        row_hashes = row_hashes[order]
+        del order
+        # A single input record cannot be compared with the several records sharing its key
+        if len(key_hashes) > 1 and (key_hashes[1:] == key_hashes[:-1]).any():
+            raise ValueError(f"The values of {key_column['name']} are not unique in {library_name}.{dataset_name}.")
+        seen = np.zeros(len(key_hashes), dtype=bool)
+
+        counts = {"inserted": 0, "changed": 0, "unchanged": 0}
+
+        def changed_records():
+            for chunk in _chunk_records(records, 10000):
+                chunk_keys = _hash_records(chunk, [local_key])
+                positions = np.searchsorted(key_hashes, chunk_keys)
+                found = np.zeros(len(chunk), dtype=bool)
+                if len(key_hashes):
+                    positions = np.minimum(positions, len(key_hashes) - 1)
+                    found = key_hashes[positions] == chunk_keys
+                    seen[positions[found]] = True
+                same = found.copy()
+                same[found] = row_hashes[positions[found]] == _hash_records(chunk, columns)[found]
+                counts["inserted"] += int((~found).sum())
+                counts["changed"] += int((found & ~same).sum())
+                counts["unchanged"] += int(same.sum())
+                yield from itertools.compress(chunk, ~same)
+
+        summary = self.insert_data_bulk(library_name, dataset_name, changed_records(), by_key=key_column["name"],
+                                        chunk_rows=chunk_rows, chunk_bytes=chunk_bytes, max_workers=max_workers,
+                                        max_retries=max_retries, backoff_delay=backoff_delay, progress=progress,
+                                        **server)
+        summary.update(counts)
+        summary["deleted"] = int((~seen).sum())
+        if delete and summary["deleted"]:
+            self._delete_unseen_keys(library_name, dataset_name, server, key_column, key_hashes, seen,
+                                     page_size, prefetch)
+        return summary
+
+    def _delete_unseen_keys(self, library_name, dataset_name, server, key_column, key_hashes, seen,
+                            page_size, prefetch):
+        """Deletes the records whose key hashes were not seen with PROC SQL, 1000 keys per command.
+           The hashes do not hold the key values, so they are collected from the dataset again.
+        """
+
+
+        name = key_column["name"]
+        unseen = key_hashes[~seen]
+        keys = []
+        for page in self.iter_data(library_name, dataset_name, page_size=page_size, pages=True,
+                                   prefetch=prefetch, **server):
+            hashes = _hash_records(page, [name])
+            for record, deleted in zip(page, np.isin(hashes, unseen)):
+                if deleted:
+                    keys.append(record.get(name))
+        keys = list(dict.fromkeys(keys))
+        for start in range(0, len(keys), 1000):
+            literals = ", ".join(_sas_literal(key, key_column["type"]) for key in keys[start:start + 1000])
+            command = (f"proc sql; delete from {library_name}.{dataset_name} "
+                       f"where {name} in ({literals}); quit;")
+            if self.execute_command(command, only_payload=True, **server) is None:
+                raise RuntimeError(f"Failed to delete records from {library_name}.{dataset_name}.")
+
+    def _query_scratch(self, make_command, scratch_library, server, with_info=False):
+        """Runs the SAS code returned by 'make_command' for a table name in the scratch library,
+           retrieves the table and deletes it. Returns the records or, if 'with_info' is True, the
+           pair of the table information and the records.
+        """
+
+
+        name = _scratch_name()
+        command = make_command(f"{scratch_library}.{name}")
+        try:
+            if self.execute_command(command, log_enabled=False, only_payload=True, **server) is None:
+                raise RuntimeError(f"Failed to execute the SAS code creating {scratch_library}.{name}.")
+            info = None
+            if with_info:
+                info = self._fresh_dataset_info(scratch_library, name, server)
+                if info is None:
+                    raise RuntimeError(f"The SAS code did not create {scratch_library}.{name}.")
+            records = list(self.iter_data(scratch_library, name, page_size=10000, **server))
+            return (info, records) if with_info else records
+        finally:
+            self.delete_dataset(scratch_library, name, only_payload=True, **server)
+
+    def _block_checksums(self, library_name, dataset_name, server, key, columns, scratch_library, blocks):
+        """Returns (rows, h1, h2) by block number of the dataset computed on the server."""
+
+
+        def make_command(table):
+            return (f"data {table}_v / view={table}_v;\n"
+                    f"  set {library_name}.{dataset_name}(keep={' '.join(column['name'] for column in columns)});\n"
+                    f"  length _md5 $16;\n"
+                    f"  _md5 = md5({_sas_row_expression(columns)});\n"
+                    f"  _block = {_sas_block_expression(key, blocks)};\n"
+                    f"  _h1 = input(put(substr(_md5, 1, 4), $hex8.), hex8.);\n"
+                    f"  _h2 = input(put(substr(_md5, 5, 4), $hex8.), hex8.);\n"
+                    f"  keep _block _h1 _h2;\n"
+                    f"run;\n"
+                    f"proc sql;\n"
+                    f"  create table {table} as select _block, count(*) as _rows, sum(_h1) as _h1, sum(_h2) as _h2\n"
+                    f"  from {table}_v group by _block;\n"
+                    f"  drop view {table}_v;\n"
+                    f"quit;\n")
+
+        records = self._query_scratch(make_command, scratch_library, server)
+        return {int(record["_block"]): (record["_rows"], record["_h1"], record["_h2"]) for record in records}
+
+    def _block_records(self, library_name, dataset_name, server, key, scratch_library, blocks, selected):
+        """Returns the records of the dataset in the selected blocks."""
+
+
+        numbers = " ".join(map(str, sorted(selected)))
+
+        def make_command(table):
+            return (f"data {table}(drop=_block);\n"
+                    f"  set {library_name}.{dataset_name};\n"
+                    f"  _block = {_sas_block_expression(key, blocks)};\n"
+                    f"  if _block in ({numbers}) then output;\n"
+                    f"run;\n")
+
+        return self._query_scratch(make_command, scratch_library, server)
+
+    def reconcile_datasets(self, library_name, dataset_name, by_key, scratch_library, server_name=None,
+                           repository_name="Foundation", server_url=None, server_port=None,
+                           target_library_name=None, target_dataset_name=None, target_server_name=None,
+                           target_repository_name=None, target_server_url=None, target_server_port=None,
+                           blocks=1024, fetch_records=True):
+        """Compares two datasets by block checksums computed on the servers. See reconcile_datasets."""
+
+
+        source = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        target_repository_name = target_repository_name or repository_name
+        if target_server_name is None and target_server_url is None and target_server_port is None:
+            target = dict(source, repository_name=target_repository_name)
+        else:
+            target = {"server_name": target_server_name, "repository_name": target_repository_name,
+                      "server_url": target_server_url, "server_port": target_server_port}
+        target_library_name = target_library_name or library_name
+        target_dataset_name = target_dataset_name or dataset_name
+
+        source_info = self.get_dataset_info(library_name, dataset_name, only_payload=True, **source)
+        target_info = self.get_dataset_info(target_library_name, target_dataset_name, only_payload=True, **target)
+        if source_info is None or target_info is None:
+            raise RuntimeError(f"Failed to get the columns of {library_name}.{dataset_name} or "
+                               f"{target_library_name}.{target_dataset_name}.")
+        columns = source_info["columns"]
+        target_names = {column["name"].upper(): column for column in target_info["columns"]}
+        different = [column["name"] for column in columns
+                     if column["type"] != target_names.get(column["name"].upper(), {}).get("type")]
+        if different:
+            raise ValueError(f"{target_library_name}.{target_dataset_name} has no columns "
+                             f"{', '.join(different)} of the same type.")
+        key = next((column for column in columns if column["name"].upper() == by_key.upper()), None)
+        if key is None:
+            raise ValueError(f"{library_name}.{dataset_name} has no column {by_key}.")
+
+        source_checksums = self._block_checksums(library_name, dataset_name, source, key, columns,
+                                                 scratch_library, blocks)
+        target_checksums = self._block_checksums(target_library_name, target_dataset_name, target, key, columns,
+                                                 scratch_library, blocks)
+        differing = sorted(block for block in set(source_checksums) | set(target_checksums)
+                           if source_checksums.get(block) != target_checksums.get(block))
+        result = {"blocks": blocks, "differing_blocks": differing,
+                  "source_records": int(sum(rows for rows, _, _ in source_checksums.values())),
+                  "target_records": int(sum(rows for rows, _, _ in target_checksums.values()))}
+        if not fetch_records:
+            return result
+
+        result.update({"missing": [], "extra": [], "changed": []})
+        if not differing:
+            return result
+        source_records = self._block_records(library_name, dataset_name, source, key, scratch_library,
+                                             blocks, differing)
+        target_records = self._block_records(target_library_name, target_dataset_name, target, key,
+                                             scratch_library, blocks, differing)
+        names = [column["name"] for column in columns]
+
+        def values(record):
+            return [_normalize_value(record.get(name)) for name in names]
+
+        target_by_key = collections.defaultdict(list)
+        for record in target_records:
+            target_by_key[_normalize_value(record.get(key["name"]))].append(record)
+        for record in source_records:
+            matches = target_by_key.pop(_normalize_value(record.get(key["name"])), [])
+            if not matches:
+                result["missing"].append(record)
+            elif len(matches) > 1 or values(record) != values(matches[0]):
+                result["changed"].append((record, matches))
+        for matches in target_by_key.values():
+            result["extra"].extend(matches)
+        return result
+
+    def run_query(self, query, scratch_library, server_name=None, repository_name="Foundation", server_url=None,
+                  server_port=None, as_columns=True):
+        """Runs an aggregation query on the server and retrieves its result. See run_query."""
+
+
+        if as_columns and np is None:
+            raise ImportError("run_query requires the 'numpy' module to be installed unless 'as_columns' is False.")
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        info = self.get_dataset_info(query.library_name, query.dataset_name, only_payload=True, **server)
+        if info is None:
+            raise RuntimeError(f"Failed to get the columns of {query.library_name}.{query.dataset_name}.")
+        result_info, records = self._query_scratch(lambda table: query.compile(info["columns"], table),
+                                                   scratch_library, server, with_info=True)
+        if not as_columns:
+            return records
+        columns = _page_to_columns(records, result_info["columns"])
+        return {column["name"]: _concatenate_columns([columns[column["name"]]], column)
+                for column in result_info["columns"]}
+
+    def _retrieve_raw_page(self, library_name, dataset_name, server, offset, limit, filter_=None):
+        """Retrieves the undecoded response body of one page of records."""
+
+
+        initial_params = {"limit": limit, "offset": offset}
+        if filter_ is not None:
+            initial_params["filter"] = filter_
+        endpoint = _select_server(f"libraries/{library_name}/datasets/{dataset_name}/data", initial_params,
+                                  server["server_name"], server["repository_name"], server["server_url"],
+                                  server["server_port"])
+        response = self.session.get(assemble_url(self.url, endpoint), params=initial_params, timeout=self.timeout)
+        if not response.ok:
+            raise RuntimeError(f"Failed to retrieve data from {library_name}.{dataset_name} at offset "
+                               f"{offset}: HTTP {response.status_code}.")
+        return response.content
+
+    def retrieve_columns_parallel(self, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                                  server_url=None, server_port=None, page_size=10000, filter_=None,
+                                  fixed_width=True, max_workers=4, processes=None):
+        """Retrieves the dataset as masked NumPy arrays decoding pages in a process pool.
+           See retrieve_columns_parallel.
+        """
+
+
+        if np is None:
+            raise ImportError("retrieve_columns_parallel requires the 'numpy' module to be installed.")
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        info = self._fresh_dataset_info(library_name, dataset_name, server)
+        if info is None or info.get("objectsNumber") is None:
+            raise RuntimeError(f"Failed to get the columns of {library_name}.{dataset_name}.")
+        columns = info["columns"]
+        residual = None
+        if isinstance(filter_, Predicate):
+            filter_, residual = filter_.bind(columns).split()
+            if filter_ is not None:
+                filter_ = json.dumps(filter_)
+
+        def retrieve(page_offset):
+            return self._retrieve_raw_page(library_name, dataset_name, server, page_offset, page_size, filter_)
+
+        chunks = {column["name"]: [] for column in columns}
+
+        def collect(future):
+            for name, chunk in future.result().items():
+                chunks[name].append(chunk)
+
+        partitions = range(0, info["objectsNumber"], page_size)
+        processes = processes or os.cpu_count() or 1
+        # Forking lazily after the request threads started could copy a lock they hold into a worker
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context(method)) as pool:
+            # Pages are decoded in the order of the offsets; at most two per process wait in the pool
+            pending = collections.deque()
+            for _, content in _iter_concurrently(retrieve, partitions, max_workers):
+                pending.append(pool.submit(_decode_columns, content, columns, fixed_width, residual))
+                while len(pending) > 2 * processes:
+                    collect(pending.popleft())
+            while pending:
+                collect(pending.popleft())
+        return {column["name"]: _concatenate_columns(chunks[column["name"]], column, fixed_width)
+                for column in columns}
+
+    def _download_page(self, library_name, dataset_name, server, offset, limit, filter_, path, chunk_size,
+                       cancel=None):
+        """Streams the undecoded response body of one page of records to a file in chunks and
+           returns the number of bytes written. The file appears only when it is complete. Setting
+           the threading.Event 'cancel' stops the download before the next chunk with RuntimeError.
+        """
+
+
+        initial_params = {"limit": limit, "offset": offset}
+        if filter_ is not None:
+            initial_params["filter"] = filter_
+        endpoint = _select_server(f"libraries/{library_name}/datasets/{dataset_name}/data", initial_params,
+                                  server["server_name"], server["repository_name"], server["server_url"],
+                                  server["server_port"])
+        temporary_path = f"{path}.{_worker_name()}.{threading.get_ident()}.tmp"
+        size = 0
+        with self.session.get(assemble_url(self.url, endpoint), params=initial_params, timeout=self.timeout,
+                              stream=True) as response:
+            if not response.ok:
+                raise RuntimeError(f"Failed to retrieve data from {library_name}.{dataset_name} at offset "
+                                   f"{offset}: HTTP {response.status_code}.")
+            try:
+                with open(temporary_path, "wb") as file:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if cancel is not None and cancel.is_set():
+                            raise RuntimeError(f"The download of {library_name}.{dataset_name} at offset "
+                                               f"{offset} was cancelled.")
+                        file.write(chunk)
+                        size += len(chunk)
+                if cancel is not None and cancel.is_set():
+                    raise RuntimeError(f"The download of {library_name}.{dataset_name} at offset {offset} "
+                                       f"was cancelled.")
+                os.replace(temporary_path, path)
+            except BaseException:
+                if os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+                raise
+        return size
+
+    def spool_pages(self, library_name, dataset_name, directory, server_name=None, repository_name="Foundation",
+                    server_url=None, server_port=None, page_size=10000, filter_=None, max_workers=1,
+                    chunk_size=1024 * 1024):
+        """Writes the undecoded pages of the dataset to files with a manifest. See spool_pages."""
+
+
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        info = self._fresh_dataset_info(library_name, dataset_name, server)
+        if info is None or info.get("objectsNumber") is None:
+            raise RuntimeError(f"Failed to get the number of records of {library_name}.{dataset_name}.")
+        filter_ = _server_filter(filter_, info.get("columns") or [])
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, SpooledPages.MANIFEST)
+        # A rerun must not look complete until it is
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+        def download(indexed_offset):
+            index, page_offset = indexed_offset
+            name = SpooledPages.page_file(index)
+            size = self._download_page(library_name, dataset_name, server, page_offset, page_size, filter_,
+                                       os.path.join(directory, name), chunk_size)
+            return {"file": name, "offset": page_offset, "limit": page_size, "bytes": size}
+
+        partitions = enumerate(range(0, info["objectsNumber"], page_size))
+        pages = [page for _, page in _iter_concurrently(download, partitions, max_workers)]
+        return SpooledPages.write_manifest(directory, {"url": self.url, "library_name": library_name,
+                                                       "dataset_name": dataset_name, "server": server,
+                                                       "filter": filter_, "page_size": page_size, "info": info},
+                                           pages)
+
+
+def _clean_params(initial_params):
+    """This is an auxiliary function. It drops parameters set to None and converts the rest to
+       strings the same way requests does, since aiohttp only accepts string query parameters.
+    """
+
+
+    return {key: str(value) for key, value in initial_params.items() if value is not None}
+
+
+class AsyncSAS9APIClient(_ClientMethods):
+    """An asyncio client bound to one SAS9API server.
+
+    Every module-level function is available as a coroutine method with the same parameters
+    except 'url'. All requests share one aiohttp connection pool, and at most 'max_concurrency'
+    requests are in flight at a time. This client requires the `aiohttp` module.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    max_concurrency : int, optional
+        Maximum number of requests in flight at the same time (default is 10).
+    pool_maxsize : int, optional
+        Maximum number of open connections in the pool (default is 100).
+    headers : dict, optional
+        Headers sent with every request (default is None).
+    auth : tuple/aiohttp.BasicAuth, optional
+        Authentication used for every request (default is None).
+    timeout : float, optional
+        Total timeout of every request in seconds (default is None - wait forever).
+
+    Example
+    -------
+        >>> async with AsyncSAS9APIClient(url, max_concurrency=50) as client:
+        ...     infos = await asyncio.gather(*(client.get_dataset_info("sashelp", name, server_name="SASApp")
+        ...                                    for name in ("class", "cars", "buy")))
+    """
+
+
+    def __init__(self, url, max_concurrency=10, pool_maxsize=100, headers=None, auth=None, timeout=None):
+        if aiohttp is None:
+            raise ImportError("AsyncSAS9APIClient requires the 'aiohttp' module to be installed.")
+        if isinstance(auth, tuple):
+            auth = aiohttp.BasicAuth(*auth)
+        self.url = url
+        self.max_concurrency = max_concurrency
+        self.pool_maxsize = pool_maxsize
+        self.headers = headers
+        self.auth = auth
+        self.timeout = timeout
+        self.session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Closes the connection pool."""
+
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self):
+        """Creates the session on first use, as aiohttp requires a running event loop."""
+
+
+        if self.session is None:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize)
+            self.session = aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                                 auth=self.auth, timeout=timeout)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.session
+
+    async def make_request(self, method, endpoint, initial_params={}, data="", json_data=[], only_payload=False,
+                           row_format="dict", columns=None):
+        """Makes an HTTP request to the endpoint of the client's server over the shared pool.
+
+        See make_request for the description of the parameters and the returned value.
+        """
+
+
+        decoder = _RowDecoder(row_format, columns)
+        session = self._get_session()
+        if data:
+            body = {"data": data}
+        else:
+            body = {"json": json_data}
+        async with self._semaphore:
+            try:
+                async with session.request(method, assemble_url(self.url, endpoint),
+                                           params=_clean_params(initial_params), **body) as response:
+                    content = await response.read()
+                    # If the response was successful, no Exception will be raised
+                    response.raise_for_status()
+                    response_json = decoder.decode(content)
+            except aiohttp.ClientResponseError as http_err:
+                print(f'HTTP error occurred: {http_err}')
+                print(json.loads(content)['error'])
+            except Exception as err:
+                print(f'Other error occurred: {err}')
+            else:
+                print('Success!')
+                if only_payload:
+                    return response_json["payload"]
+                else:
+                    return response_json
+
+    async def retrieve_data(self, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                            server_url=None, server_port=None, limit=100, offset=0, filter_=None,
+                            only_payload=False, row_format="dict", columns=None):
+        """Retrieves data from the dataset by a dataset name and a library name. See retrieve_data."""
+
+
+        if row_format != "dict" and columns is None:
+            info = await self.get_dataset_info(library_name, dataset_name, server_name=server_name,
+                                               repository_name=repository_name, server_url=server_url,
+                                               server_port=server_port, only_payload=True)
+            columns = _column_names(info, library_name, dataset_name)
+        return await super().retrieve_data(library_name, dataset_name, server_name=server_name,
+                                           repository_name=repository_name, server_url=server_url,
+                                           server_port=server_port, limit=limit, offset=offset, filter_=filter_,
+                                           only_payload=only_payload, row_format=row_format, columns=columns)
+
+
+def get_metadata_server_config(url, only_payload=False):
+    """Gets the current metadata server configuration.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        False). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    """
+
+
+    return get_default_client(url).get_metadata_server_config(only_payload=only_payload)
+
+
+def get_license_info(url, only_payload=False):
+    """Gets the information about active SAS Proxy license.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        False). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+
+    Returns
+    -------
+    dict/list
+        The server response (either full or truncated depending on the 'only_payload' flag) 
+        as a dictionary (full) or a list (truncated).
+    """
+
+
+    return get_default_client(url).get_license_info(only_payload=only_payload)
+
+
+def get_workspace_server_list(url, repository_name="Foundation", only_payload=False):
+    """Gets the list of available workspace servers and their connections from the metadata server.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+
+    Returns
+    -------
+    dict/list
+        The server response (either full or truncated depending on the 'only_payload' flag) 
+        as a dictionary (full) or a list (truncated).
+    """
+
+
+    return get_default_client(url).get_workspace_server_list(repository_name=repository_name,
+                                                             only_payload=only_payload)
+
+
+def get_workspace_server_config(url, server_name, repository_name="Foundation", only_payload=False):
+    """Gets the workspace server information and its connections from the metadata server by a server name.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    server_name : str
+        Server name.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    """
+
+
+    return get_default_client(url).get_workspace_server_config(server_name, repository_name=repository_name,
+                                                               only_payload=only_payload)
+
+
+def get_stp_server_list(url, repository_name="Foundation", only_payload=False):
+    """Gets the list of available Stored Process Servers and their connections from the metadata server.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict/list
+        The server response (either full or truncated depending on the 'only_payload' flag) 
+        as a dictionary (full) or a list (truncated).
+    """
+
+
+    return get_default_client(url).get_stp_server_list(repository_name=repository_name,
+                                                       only_payload=only_payload)
+
+
+def get_stp_server_config(url, server_name, repository_name="Foundation", only_payload=False):
+    """Gets the Stored Process Server information and its connections from the metadata server by a server name.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    server_name : str
+        Server name.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    """
+
+
+    return get_default_client(url).get_stp_server_config(server_name, repository_name=repository_name,
+                                                         only_payload=only_payload)
+
+
+def execute_command(url, command, server_name=None, repository_name="Foundation", 
+                    server_url=None, server_port=None, log_enabled=True, only_payload=False):
+    """Sends a SAS command for execution to the workspace server.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API
+    command : str
+        SAS command to send to the server.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None). 
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None). 
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    log_enabled : bool
+        A flag which enables log output in the endpoint response (default is True); doesn't populate response fields
+        if set to False.
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+        
+    Example
+    -------
+        >>> execute_command(url, "proc print data=sashelp.class;run;")
+    """
+
+
+    return get_default_client(url).execute_command(command, server_name=server_name,
+                                                   repository_name=repository_name, server_url=server_url,
+                                                   server_port=server_port, log_enabled=log_enabled,
+                                                   only_payload=only_payload)
+
+
+# USERS *********************************************************************************************************
+def get_user_list(url, repository_name="Foundation", only_payload=False):
+    """Gets the list of server users and their identities.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict/list
+        The server response (either full or truncated depending on the 'only_payload' flag) 
+        as a dictionary (full) or a list (truncated).
+    """
+
+
+    return get_default_client(url).get_user_list(repository_name=repository_name, only_payload=only_payload)
+
+
+def get_configured_user_info(url, repository_name="Foundation", only_payload=False):
+    """Gets the configured user information and its identities.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    """
+
+
+    return get_default_client(url).get_configured_user_info(repository_name=repository_name,
+                                                            only_payload=only_payload)
+
+
+def get_user_info(url, user_name, repository_name="Foundation", only_payload=False):
+    """Gets the server user information and its identities by a user name.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    user_name : str
+        User name.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    """
+
+
+    return get_default_client(url).get_user_info(user_name, repository_name=repository_name,
+                                                 only_payload=only_payload)
+
+
+def get_group_list(url, repository_name="Foundation", only_payload=False):
+    """Gets the list of groups and their associated groups and users.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict/list
+        The server response (either full or truncated depending on the 'only_payload' flag) 
+        as a dictionary (full) or a list (truncated).
+    """
+
+
+    return get_default_client(url).get_group_list(repository_name=repository_name, only_payload=only_payload)
+
+
+def get_group_info(url, group_name, repository_name="Foundation", only_payload=False):
+    """Gets the group information and its associated groups and users by a group name.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    group_name : str
+        Group name.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    """
+
+
+    return get_default_client(url).get_group_info(group_name, repository_name=repository_name,
+                                                  only_payload=only_payload)
+
+
+def get_role_list(url, repository_name="Foundation", only_payload=False):
+    """Gets the list of roles and their associated groups and users.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict/list
+        The server response (either full or truncated depending on the 'only_payload' flag) 
+        as a dictionary (full) or a list (truncated).
+    """
+
+
+    return get_default_client(url).get_role_list(repository_name=repository_name, only_payload=only_payload)
+
+
+def get_role_info(url, role_name, repository_name="Foundation", only_payload=False):
+    """Gets the role information and its associated groups and users by a role name.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    role_name : str
+        Role name.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    """
+
+
+    return get_default_client(url).get_role_info(role_name, repository_name=repository_name,
+                                                 only_payload=only_payload)
+
+
+# LIBRARIES *********************************************************************************************************
+def get_library_list(url, server_name=None, repository_name="Foundation", 
+                    server_url=None, server_port=None, only_payload=False):
+    """Gets the list of libraries for the workspace server.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict/list
+        The server response (either full or truncated depending on the 'only_payload' flag) 
+        as a dictionary (full) or a list (truncated).
+    """
+
+
+    return get_default_client(url).get_library_list(server_name=server_name, repository_name=repository_name,
+                                                    server_url=server_url, server_port=server_port,
+                                                    only_payload=only_payload)
+
+
+def get_library_info(url, library_name, server_name=None, repository_name="Foundation", 
+                    server_url=None, server_port=None, only_payload=False):
+    """Gets the library information for the workspace server by a library name.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+        
+    Example
+    -------
+        >>> get_library_info(url, "sashelp", server_name="SASApp")
+        {'status': 200,
+         'error': None,
+         'payload': {'id': None,
+         'libname': 'SASHELP',
+         'engine': 'V9',
+         'path': 'your_path',
+         'level': 1,
+         'readonly': False,
+         'sequential': False,
+         'temp': False}}
+    """
+
+
+    return get_default_client(url).get_library_info(library_name, server_name=server_name,
+                                                    repository_name=repository_name, server_url=server_url,
+                                                    server_port=server_port, only_payload=only_payload)
+
+
+def create_library(url, server_name, library_name, engine, display_name, path, location, 
+                   repository_name="Foundation", is_preassigned=False, only_payload=False):
+    """Creates a library at a given server with given library name and parameters.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    server_name : str
+        Workspace server name.
+    library_name : str
+        Created library name as will be used in a LIBNAME statement.
+    engine : str
+        LIBNAME engine.
+    display_name : str
+        Library display name.
+    path : str
+        Library data path.
+    location : str
+        Folder to place metadata object in.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    is_preassigned : bool
+        A flag whic defines whether the created library should be preassigned (default is False).  
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    """
+
+
+    return get_default_client(url).create_library(server_name, library_name, engine, display_name, path,
+                                                  location, repository_name=repository_name,
+                                                  is_preassigned=is_preassigned, only_payload=only_payload)
+
+
+def delete_library(url, server_name, library_name, repository_name="Foundation", only_payload=False):
+    """Removes all libraries with matching library name.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    server_name : str
+        Workspace server name.
+    library_name : str
+        Library name.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict/bool
+        The server response (either full or truncated depending on the 'only_payload' flag) 
+        as a dictionary (full) or a boolean (truncated).
+    """
+
+
+    return get_default_client(url).delete_library(server_name, library_name, repository_name=repository_name,
+                                                  only_payload=only_payload)
+
+
+# DATASETS *********************************************************************************************************
+def get_dataset_list(url, library_name, server_name=None, repository_name="Foundation", 
+                    server_url=None, server_port=None, only_payload=False):
+    """Gets the list of datasets for the specific library by a library name.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict/list
+        The server response (either full or truncated depending on the 'only_payload' flag) 
+        as a dictionary (full) or a list (truncated).
+        
+    Example
+    -------
+        >>> get_dataset_list(url, "sashelp", server_name="SASApp", only_payload=True)
+        [{'name': 'AACOMP',
+          'type': 'DATA',
+          'label': '',
+          'creationDate': '2018-11-01T01:15:06.18',
+          'modificationDate': '2018-11-01T01:15:06.18',
+          'objectsNumber': 2020,
+          'columns': None},
+         {'name': 'AARFM',
+          'type': 'DATA',
+          'label': '',
+          'creationDate': '2018-10-25T02:06:00.634',
+          'modificationDate': '2018-10-25T02:06:00.634',
+          'objectsNumber': 130,
+          'columns': None},
+         {'name': 'ADSMSG',
+          'type': 'MSGFILE',
+          'label': '',
+          'creationDate': '2018-10-25T02:13:18.751',
+          'modificationDate': '2018-10-25T02:13:18.751',
+          'objectsNumber': 426,
+          'columns': None},
+          ...]
+    """
+
+
+    return get_default_client(url).get_dataset_list(library_name, server_name=server_name,
+                                                    repository_name=repository_name, server_url=server_url,
+                                                    server_port=server_port, only_payload=only_payload)
+
+
+def get_dataset_info(url, library_name, dataset_name, server_name=None, repository_name="Foundation", 
+                    server_url=None, server_port=None, only_payload=False):
+    """Gets the dataset information by a dataset name and a library name.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict/list
+        The server response (either full or truncated depending on the 'only_payload' flag) 
+        as a dictionary (full) or a list (truncated).
+        
+    Example
+    -------
+        >>> get_dataset_info(url, "sashelp", "class", server_name="SASApp", only_payload=True)
+        {'name': 'CLASS',
+         'type': 'DATA',
+         'label': 'Student Data',
+         'creationDate': '2018-10-25T02:06:04.07',
+         'modificationDate': '2018-10-25T02:06:04.07',
+         'objectsNumber': 19,
+         'columns': [{'name': 'Name',
+           'type': 'char',
+           'extendedType': 'char',
+           'length': 8,
+           'notNull': False,
+           'indexType': '',
+           'sortedBy': 0,
+           'columnNumber': 1,
+           'label': ''},
+          {'name': 'Sex',
+           'type': 'char',
+           'extendedType': 'char',
+           'length': 1,
+           'notNull': False,
+           'indexType': '',
+           'sortedBy': 0,
+           'columnNumber': 2,
+           'label': ''},
+          {'name': 'Age',
+           'type': 'num',
+           'extendedType': 'num',
+           'length': 8,
+           'notNull': False,
+           'indexType': '',
+           'sortedBy': 0,
+           'columnNumber': 3,
+           'label': ''},
+          {'name': 'Height',
+           'type': 'num',
+           'extendedType': 'num',
+           'length': 8,
+           'notNull': False,
+           'indexType': '',
+           'sortedBy': 0,
+           'columnNumber': 4,
+           'label': ''},
+          {'name': 'Weight',
+           'type': 'num',
+           'extendedType': 'num',
+           'length': 8,
+           'notNull': False,
+           'indexType': '',
+           'sortedBy': 0,
+           'columnNumber': 5,
+           'label': ''}]}
+    """
+
+
+    return get_default_client(url).get_dataset_info(library_name, dataset_name, server_name=server_name,
+                                                    repository_name=repository_name, server_url=server_url,
+                                                    server_port=server_port, only_payload=only_payload)
+
+
+def retrieve_data(url, library_name, dataset_name, server_name=None, repository_name="Foundation", 
+                    server_url=None, server_port=None, limit=100, offset=0, filter_=None, only_payload=False,
+                    row_format="dict", columns=None):
+    """Retrieves data from the dataset by a dataset name and a library name.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    limit : int
+        Number of records to retrieve (default is 100, maximum value is 10000).
+    offset : int
+        Dataset record offset (default is 0).
+    filter_ : string    
+        Dataset filter (JSON). Default is None.
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+    row_format : str, optional
+        Format of the records (default is 'dict'). The records are built while the response is
+        decoded, so the compact formats never create a dictionary per record:
+            'dict' - dictionaries;
+            'tuple' - tuples of values in the column order;
+            'slots' - objects of a class with __slots__ generated for the columns, with the values
+                      as attributes (row.AMOUNT) and items (row["AMOUNT"]).
+        With 'tuple' and 'slots' the records come in a Rows list whose 'columns' holds the names.
+    columns : list, optional
+        Column names of the records in the 'tuple' and 'slots' formats (default is None - all
+        columns of the dataset, from get_dataset_info). A column missing from a record is None.
+ 
+    Returns
+    -------
+    dict/list
+        The server response (either full or truncated depending on the 'only_payload' flag) 
+        as a dictionary (full) or a list of records (truncated).
+        
+    Examples
+    -------
+        >>> retrieve_data(url, "sashelp", "buy", server_name="SASApp", only_payload=True)
+        [{'AMOUNT': -110000.0, 'DATE': '1996-01-01'},
+         {'AMOUNT': -1000.0, 'DATE': '1997-01-01'},
+         {'AMOUNT': -1000.0, 'DATE': '1998-01-01'},
+         {'AMOUNT': -51000.0, 'DATE': '1999-01-01'},
+         {'AMOUNT': -2000.0, 'DATE': '2000-01-01'},
+         {'AMOUNT': -2000.0, 'DATE': '2001-01-01'},
+         {'AMOUNT': -2000.0, 'DATE': '2002-01-01'},
+         {'AMOUNT': -2000.0, 'DATE': '2003-01-01'},
+         {'AMOUNT': -2000.0, 'DATE': '2004-01-01'},
+         {'AMOUNT': -2000.0, 'DATE': '2005-01-01'},
+         {'AMOUNT': 48000.0, 'DATE': '2006-01-01'}]
+         
+        >>> retrieve_data(url, "sashelp", "buy", server_name="SASApp", filter_='{"AMOUNT":-2000}', only_payload=True)
+        [{'AMOUNT': -2000.0, 'DATE': '2000-01-01'},
+         {'AMOUNT': -2000.0, 'DATE': '2001-01-01'},
+         {'AMOUNT': -2000.0, 'DATE': '2002-01-01'},
+         {'AMOUNT': -2000.0, 'DATE': '2003-01-01'},
+         {'AMOUNT': -2000.0, 'DATE': '2004-01-01'},
+         {'AMOUNT': -2000.0, 'DATE': '2005-01-01'}]
+
+        >>> rows = retrieve_data(url, "sashelp", "buy", server_name="SASApp", limit=2, only_payload=True,
+        ...                      row_format="tuple")
+        >>> rows.columns, rows
+        (['AMOUNT', 'DATE'], [(-110000.0, '1996-01-01'), (-1000.0, '1997-01-01')])
+    """
+
+
+    return get_default_client(url).retrieve_data(library_name, dataset_name, server_name=server_name,
+                                                 repository_name=repository_name, server_url=server_url,
+                                                 server_port=server_port, limit=limit, offset=offset,
+                                                 filter_=filter_, only_payload=only_payload,
+                                                 row_format=row_format, columns=columns)
+
+
+def insert_data(url, library_name, dataset_name, json_data, server_name=None, repository_name="Foundation", 
+                    server_url=None, server_port=None, by_key=None, only_payload=False):
+    """Inserts data into the dataset or replaces data by a key.
+       The dataset column name ('by_key') is used to update all records with the 'by_key' value in this column.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    json_data : list
+        Data to insert (see an example below).
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    by_key : str
+        Dataset key for record matching (default is None).
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+        
+    Example
+    -------
+        >>> insert_data(url, "mylib", "class", [{"Name": "Bill", "Sex": "M"}, {"Name":"John", "Sex": "M"}], 
+                        server_name="SASApp", only_payload=True)
+        {'status': 200,
+         'error': None,
+         'payload': {'itemsInserted': 2, 'itemsRemoved': 0, 'itemsUpdated': None}}
+    """
+
+
+    return get_default_client(url).insert_data(library_name, dataset_name, json_data, server_name=server_name,
+                                               repository_name=repository_name, server_url=server_url,
+                                               server_port=server_port, by_key=by_key,
+                                               only_payload=only_payload)
+
+
+def replace_all_data(url, library_name, dataset_name, json_data, server_name=None, repository_name="Foundation", 
+                    server_url=None, server_port=None, only_payload=False):
+    """Replaces all data in the dataset with input data.
+       
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    json_data : list
+        Data to replace (see an example below).
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+        
+    Example
+    -------
+        >>> replace_all_data(url, "mylib", "class", [{"Name":"A"},{"Age":45}], server_name="SASApp", only_payload=False)
+        
+        {'status': 200,
+         'error': None,
+         'payload': {'itemsInserted': 2, 'itemsRemoved': 21, 'itemsUpdated': None}}
+    """
+
+
+    return get_default_client(url).replace_all_data(library_name, dataset_name, json_data,
+                                                    server_name=server_name, repository_name=repository_name,
+                                                    server_url=server_url, server_port=server_port,
+                                                    only_payload=only_payload)
+
+
+def delete_dataset(url, library_name, dataset_name, server_name=None, repository_name="Foundation", 
+                    server_url=None, server_port=None, only_payload=False):
+    """Deletes dataset from a library.
+       
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    """
+
+
+    return get_default_client(url).delete_dataset(library_name, dataset_name, server_name=server_name,
+                                                  repository_name=repository_name, server_url=server_url,
+                                                  server_port=server_port, only_payload=only_payload)
+
+
+# OBJECTS *********************************************************************************************************
+def find_object(url, repository_name="Foundation", location=None, location_recursive=True, object_id=None,
+                object_type=None, public_type=None, name_equals=None, name_starts=None, name_contains=None,
+                name_regex=None, description_contains=None, description_regex=None, created_gt=None,
+                created_lt=None, modified_gt=None, modified_lt=None, table_libref=None, table_dbms=None,
+                include_associations=False, include_permissions=False, only_payload=False):
+    """Finds objects.
+       
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    location : str, optional
+        Folder location to search in (default is None).
+    location_recursive : bool, optional
+        A flag defining whether to search in subfolders or not (default is True).
+    object_id : str, optional
+        SAS Metadata object ID (default is None).
+    object_type : str, optional
+        SAS Metadata object type (default is None). Omit for any object types
+    public_type : str, optional
+        Comma-separated list of target PublicType attributes.
+    name_equals : str, optional (if at least one other search criteria is specified)
+        Search criteria: name matches (case-insensitive). Default is None.
+    name_starts : str, optional (if at least one other search criteria is specified)
+        Search criteria: name starts with (case-insensitive). Default is None.
+    name_contains : str, optional (if at least one other search criteria is specified)
+        Search criteria: name contains (case-insensitive). Default is None.
+    name_regex : str, optional (if at least one other search criteria is specified)
+        Search criteria: name matches regex. Default is None.
+    description_contains : str, optional (if at least one other search criteria is specified)
+        Search criteria: description contains (case-insensitive). Default is None.
+    description_regex : str, optional (if at least one other search criteria is specified)
+        Search criteria: description matches regex. Default is None.
+    created_gt : str, optional (if at least one other search criteria is specified)
+        Search criteria: MetadataCreated greater than (ISO datatime format). Default is None.
+    created_lt : str, optional (if at least one other search criteria is specified)
+        Search criteria: MetadataCreated lower than (ISO datatime format). Default is None.
+    modified_gt : str, optional (if at least one other search criteria is specified)
+        Search criteria: MetadataModified greater than (ISO datatime format). Default is None.
+    modified_lt : str, optional (if at least one other search criteria is specified)
+        Search criteria: MetadataModified lower than (ISO datatime format). Default is None.
+    table_libref : str, optional (if at least one other search criteria is specified)
+        Search criteria: libref name for associated library object for a table. For table types only. Default is None.
+    table_dbms : str, optional (if at least one other search criteria is specified)
+        Search criteria: DBMS engine name for associated library object for a table. For table types only. Default is None.
+        
+    Note: at least one search criteria must be specified.
+    
+    include_associations : bool, optional
+        A flag defining whether to include object associations in the search. Default is False.
+    include_permissions : bool, optional
+        A flag defining whether to include metadata object permissions in the search. Default is False.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
  
-def get_user_info(url, user_name, repository_name="Foundation", only_payload=False):
-    """Gets the server user information and its identities by a user name.
+    Returns
+    -------
+    dict/list
+        The server response (either full or truncated depending on the 'only_payload' flag) 
+        as a dictionary (full) or a list (truncated).
+    """
+
+
+    return get_default_client(url).find_object(repository_name=repository_name, location=location,
+                                               location_recursive=location_recursive, object_id=object_id,
+                                               object_type=object_type, public_type=public_type,
+                                               name_equals=name_equals, name_starts=name_starts,
+                                               name_contains=name_contains, name_regex=name_regex,
+                                               description_contains=description_contains,
+                                               description_regex=description_regex, created_gt=created_gt,
+                                               created_lt=created_lt, modified_gt=modified_gt,
+                                               modified_lt=modified_lt, table_libref=table_libref,
+                                               table_dbms=table_dbms,
+                                               include_associations=include_associations,
+                                               include_permissions=include_permissions,
+                                               only_payload=only_payload)
+
+
+"""
+def copy(url, sourceLocation, sourceName, destinationLocation, publicType="", **kwargs):
+    #
+    #    This method will copy object to folder.
+    #    This method will return a response as a dictionary.
+    #
+    endpoint = f"sas/meta/objects/copy"
+    
+    initial_params = {"sourceLocation":sourceLocation, "sourceName":sourceName, "destinationLocation":destinationLocation, 
+              "publicType":publicType}
+    valid_params = ["repositoryName"]
+    
+    return make_request("GET", assemble_url(url, endpoint),
+                       initial_params=initial_params, valid_params=valid_params, kwargs=kwargs, onlyPayload=onlyPayload)
+"""
+    
+
+def move_object(url, source_location, source_name, public_type, destination_location,  
+                repository_name="Foundation", only_payload=False):
+    """Moves object between folders.
+       
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    source_location : str
+        Source folder location.
+    source_name : str
+        Source object name.
+    public_type : str
+        Source object PublicType.
+    destination_location : str
+        Destination folder location.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').    
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    """
+
+
+    # When success response is None!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
+    return get_default_client(url).move_object(source_location, source_name, public_type, destination_location,
+                                               repository_name=repository_name, only_payload=only_payload)
+
+
+def delete_object(url, source_location, source_name, public_type, repository_name="Foundation", only_payload=False):
+    """Deletes object by its name and location.
+       
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    source_location : str
+        Folder location.
+    source_name : str
+        Object name.
+    public_type : str
+        Object PublicType.
+    repository_name : str, optional
+        Repository name (default is 'Foundation').    
+    only_payload : bool, optional
+        A flag used to determine the content of the response returned by the function (default is
+        True). If True - the function will return the truncated server response containing only
+        the payload. If False - the function will return the full response from the server.
+ 
+    Returns
+    -------
+    dict
+        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    """
+
+
+    return get_default_client(url).delete_object(source_location, source_name, public_type,
+                                                 repository_name=repository_name, only_payload=only_payload)
+
+
+# PAGING *********************************************************************************************************
+class AdaptivePageSize:
+    """A page size for 'iter_data' which adapts to the observed responses of 'retrieve_data'.
+
+    The initial page size is estimated from the column lengths reported by 'get_dataset_info'.
+    After every page the size is scaled towards 'target_bytes' per response and 'target_seconds'
+    per request, whichever is reached first, changing at most twofold per page. When a request
+    fails the size is halved and the request is retried after an exponentially growing delay.
+
+    Parameters
+    ----------
+    initial : int, optional
+        Page size used until it can be estimated (default is 1000).
+    minimum : int, optional
+        Minimum page size (default is 10).
+    maximum : int, optional
+        Maximum page size (default is 10000 - the maximum 'limit' of 'retrieve_data').
+    target_bytes : int, optional
+        Target size of a response body in bytes (default is 4 MiB).
+    target_seconds : float, optional
+        Target duration of a request in seconds (default is 2.0).
+    max_retries : int, optional
+        Number of consecutive failed requests retried before giving up (default is 5).
+    backoff_delay : float, optional
+        Delay before the first retry in seconds, doubled on every next retry (default is 1.0).
+
+    Example
+    -------
+        >>> for record in iter_data(url, "mylib", "wide", server_name="SASApp",
+        ...                         page_size=AdaptivePageSize(target_bytes=2 * 1024 * 1024)):
+        ...     process(record)
+    """
+
+
+    def __init__(self, initial=1000, minimum=10, maximum=10000, target_bytes=4 * 1024 * 1024,
+                 target_seconds=2.0, max_retries=5, backoff_delay=1.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_bytes = target_bytes
+        self.target_seconds = target_seconds
+        self.max_retries = max_retries
+        self.backoff_delay = backoff_delay
+        self.page_size = self._clamp(initial)
+        self._observed = False
+        self._failures = 0
+
+    def _clamp(self, page_size):
+        return int(min(max(page_size, self.minimum), self.maximum))
+
+    def estimate(self, columns):
+        """Estimates the page size from the dataset columns unless responses were already observed.
+
+        Parameters
+        ----------
+        columns : list
+            The 'columns' of the 'get_dataset_info' payload.
+        """
+
+
+        if self._observed:
+            return
+        # A JSON record repeats every column name; numbers take up to ~24 characters as text
+        row_bytes = sum(len(column["name"]) + 4 + (column["length"] + 2 if column["type"] == "char" else 24)
+                        for column in columns)
+        self.page_size = self._clamp(self.target_bytes // max(row_bytes, 1))
+
+    def observe(self, records, response_bytes, seconds):
+        """Adjusts the page size after a successful request.
+
+        Parameters
+        ----------
+        records : int
+            Number of records in the response.
+        response_bytes : int
+            Size of the response body in bytes or None if unknown.
+        seconds : float
+            Duration of the request in seconds.
+        """
+
+
+        self._observed = True
+        self._failures = 0
+        if records == 0:
+            return
+        ratios = []
+        if response_bytes:
+            ratios.append(self.target_bytes / response_bytes)
+        if seconds > 0 and self.target_seconds:
+            ratios.append(self.target_seconds / seconds)
+        if not ratios:
+            return
+        page_size = records * min(ratios)
+        page_size = min(max(page_size, self.page_size / 2), self.page_size * 2)
+        self.page_size = self._clamp(page_size)
+
+    def failed(self):
+        """Halves the page size after a failed request.
+
+        Returns
+        -------
+        float
+            Delay in seconds before the request should be retried or None if it should not be.
+        """
+
+
+        self._failures += 1
+        if self._failures > self.max_retries:
+            return None
+        self.page_size = self._clamp(self.page_size // 2)
+        return self.backoff_delay * 2 ** (self._failures - 1)
+
+
+def iter_data(url, library_name, dataset_name, server_name=None, repository_name="Foundation",
+              server_url=None, server_port=None, page_size=1000, offset=0, filter_=None, pages=False,
+              prefetch=0, row_format="dict", stream=False):
+    """Lazily iterates over the records of the dataset by a dataset name and a library name.
+       Pages of 'page_size' records are retrieved one at a time with 'retrieve_data' until the
+       dataset is exhausted, so memory use does not depend on the size of the dataset.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    page_size : int/AdaptivePageSize, optional
+        Number of records to retrieve per request (default is 1000, maximum value is 10000).
+        If an AdaptivePageSize is given, the page size is estimated from the column lengths and
+        then adjusted to the measured response sizes and latencies.
+    offset : int, optional
+        Dataset record offset to start from (default is 0).
+    filter_ : string/Predicate, optional
+        Dataset filter (JSON) or a Predicate built with 'col' (default is None).
+    pages : bool, optional
+        A flag used to determine what is yielded (default is False). If True - lists of records
+        (one per request) are yielded. If False - single records are yielded.
+    prefetch : int, optional
+        Number of pages retrieved ahead in background threads while the caller processes the
+        current page (default is 0 - no read-ahead). At most 'prefetch' pages are buffered.
+        Cannot be combined with an adaptive page size.
+    row_format : str, optional
+        Format of the records - 'dict', 'tuple' or 'slots' (default is 'dict'), see retrieve_data.
+        Pages in the 'tuple' and 'slots' formats are Rows lists with the column names.
+    stream : bool, optional
+        A flag which enables streamed responses (default is False). If True - the records are
+        decoded as the response body arrives, so the memory used per request depends on the size
+        of a record instead of the size of a page, and pages are yielded in chunks of at most
+        STREAM_CHUNK_ROWS records. The 'ijson' module is used for decoding if it is installed.
+        Cannot be combined with 'prefetch' or an adaptive page size.
+
+    The iteration stops after a page shorter than 'page_size' or, when no filter is given,
+    after 'objectsNumber' records reported by 'get_dataset_info'.
+
+    Yields
+    ------
+    dict/list
+        A record or a page of records as a list (depending on the 'pages' flag).
+
+    Raises
+    ------
+    RuntimeError
+        If a page could not be retrieved.
+
+    Example
+    -------
+        >>> for record in iter_data(url, "sashelp", "buy", server_name="SASApp", page_size=5000, prefetch=2):
+        ...     process(record)
+    """
+
+
+    return get_default_client(url).iter_data(library_name, dataset_name, server_name=server_name,
+                                             repository_name=repository_name, server_url=server_url,
+                                             server_port=server_port, page_size=page_size, offset=offset,
+                                             filter_=filter_, pages=pages, prefetch=prefetch, row_format=row_format,
+                                             stream=stream)
+
+
+def iter_data_parallel(url, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                       server_url=None, server_port=None, page_size=10000, max_workers=4, offset=0,
+                       filter_=None, ordered=True):
+    """Retrieves the dataset in pages fetched concurrently by a dataset name and a library name.
+       The number of records ('objectsNumber') is read with 'get_dataset_info' and the dataset is
+       split into offset ranges of 'page_size' records which are retrieved by 'max_workers' threads.
+       Only a bounded number of pages is held in memory while the consumer falls behind.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    page_size : int, optional
+        Number of records to retrieve per request (default is 10000, maximum value is 10000).
+    max_workers : int, optional
+        Number of concurrent requests (default is 4). Should not exceed 'pool_maxsize' of the
+        client, otherwise the extra connections are not kept alive.
+    offset : int, optional
+        Dataset record offset to start from (default is 0).
+    filter_ : string/Predicate, optional
+        Dataset filter (JSON) or a Predicate built with 'col' which the server supports entirely
+        (default is None). With a filter, the pages past the end of the filtered records are empty.
+    ordered : bool, optional
+        A flag which defines the order of the pages (default is True). If True - pages are yielded
+        in the order of their offsets. If False - pages are yielded as soon as they are retrieved.
+
+    Yields
+    ------
+    tuple
+        Pairs (offset, page) where page is a list of records.
+
+    Raises
+    ------
+    ValueError
+        If the server does not support the whole Predicate 'filter_'.
+    RuntimeError
+        If the number of records or a page could not be retrieved.
+
+    Example
+    -------
+        >>> for offset, page in iter_data_parallel(url, "mylib", "big", server_name="SASApp",
+        ...                                        max_workers=8, ordered=False):
+        ...     load(offset, page)
+    """
+
+
+    return get_default_client(url).iter_data_parallel(library_name, dataset_name, server_name=server_name,
+                                                      repository_name=repository_name, server_url=server_url,
+                                                      server_port=server_port, page_size=page_size,
+                                                      max_workers=max_workers, offset=offset, filter_=filter_,
+                                                      ordered=ordered)
+
+
+def retrieve_data_parallel(url, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                           server_url=None, server_port=None, page_size=10000, max_workers=4, offset=0,
+                           filter_=None):
+    """Retrieves all records of the dataset with concurrent requests by a dataset name and a library
+       name. The pages are retrieved with 'iter_data_parallel' and reassembled in order.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    page_size : int, optional
+        Number of records to retrieve per request (default is 10000, maximum value is 10000).
+    max_workers : int, optional
+        Number of concurrent requests (default is 4).
+    offset : int, optional
+        Dataset record offset to start from (default is 0).
+    filter_ : string, optional
+        Dataset filter (JSON). Default is None.
+
+    Returns
+    -------
+    list
+        The records of the dataset in their original order.
+
+    Raises
+    ------
+    RuntimeError
+        If the number of records or a page could not be retrieved.
+    """
+
+
+    return get_default_client(url).retrieve_data_parallel(library_name, dataset_name, server_name=server_name,
+                                                          repository_name=repository_name, server_url=server_url,
+                                                          server_port=server_port, page_size=page_size,
+                                                          max_workers=max_workers, offset=offset, filter_=filter_)
+
+
+def iter_data_keyset(url, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                     server_url=None, server_port=None, key=None, page_size=1000, filter_=None, pages=False):
+    """Iterates over the records of the dataset with keyset (seek) pagination by a dataset name and
+       a library name. Instead of a growing 'offset', every page is requested with a range condition
+       on the key column ('key >= last retrieved value') added to the filter, so the cost of a page
+       does not depend on how deep into the dataset it is.
+
+       The records must come back in ascending order of the key column, so the key must be the
+       column the dataset is physically sorted by in ascending order; an indexed column does not
+       define the order of the returned records, and records would be skipped or repeated. Records
+       with a repeated key value are skipped with a small offset, so the key does not have to be
+       unique.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
+    repository_name : str, optional
+        Repository name (default is 'Foundation').
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    key : str, optional
+        Key column name (default is None). If None - the column the dataset is sorted by first
+        ('sortedBy' in 'get_dataset_info') is used if the sort is ascending. A specified key must
+        be the column of the physical ascending sort order of the dataset.
+    page_size : int, optional
+        Number of records to retrieve per request (default is 1000, maximum value is 10000).
+    filter_ : string/Predicate, optional
+        Dataset filter (JSON) or a Predicate built with 'col' which the server supports entirely,
+        combined with the key condition (default is None).
+    pages : bool, optional
+        A flag used to determine what is yielded (default is False). If True - lists of records
+        (one per request) are yielded. If False - single records are yielded.
+
+    Yields
+    ------
+    dict/list
+        A record as a dictionary or a page of records as a list (depending on the 'pages' flag).
+
+    Raises
+    ------
+    ValueError
+        If 'key' is not specified and the dataset is not sorted in ascending order, or the
+        server does not support the whole Predicate 'filter_'.
+    RuntimeError
+        If the dataset information or a page could not be retrieved.
+
+    Example
+    -------
+        >>> for record in iter_data_keyset(url, "mylib", "big", server_name="SASApp", key="ID"):
+        ...     process(record)
+    """
+
+
+    return get_default_client(url).iter_data_keyset(library_name, dataset_name, server_name=server_name,
+                                                    repository_name=repository_name, server_url=server_url,
+                                                    server_port=server_port, key=key, page_size=page_size,
+                                                    filter_=filter_, pages=pages)
+
+
+# COLUMNS *********************************************************************************************************
+# SAS formats of the numeric columns whose values the server returns as ISO date strings
+_DATE_FORMAT = re.compile(r"(DATE|DATETIME|DDMMYY|MMDDYY|YYMMDD|YYMON|MONYY|WEEKDATE|WORDDATE|NLDAT|"
+                          r"[BE]8601D[ANTZ]|IS8601D[ANT]|DTDATE|DTMONYY|JULIAN)", re.IGNORECASE)
+
+
+def _is_date_column(column):
+    """This is an auxiliary function. It returns whether the values of a dataset column are
+       dates by its SAS format, or None if the column information has no format.
+    """
+
+
+    if column["type"] != "num":
+        return False
+    if "format" not in column:
+        return None
+    return bool(column["format"]) and _DATE_FORMAT.match(column["format"]) is not None
+
+
+def _column_dtype(column, fixed_width):
+    """This is an auxiliary function. It returns the NumPy dtype of a dataset column."""
+
+
+    if column["type"] == "num":
+        return np.dtype("datetime64[ms]" if _is_date_column(column) else "float64")
+    if fixed_width:
+        return np.dtype(f"U{max(column['length'], 1)}")
+    return np.dtype(object)
+
+
+def _page_to_columns(page, columns, fixed_width=True):
+    """This is an auxiliary function. It converts a page of records to columns.
+
+       Numeric columns become float64 arrays, or datetime64 arrays when the server formats their
+       values as ISO date strings. Dates are recognized by the column format, or by the first
+       value if the column information has no format. Character columns become fixed-width unicode arrays of the
+       column length, or object arrays if 'fixed_width' is False. Missing values (null and blank
+       strings) are marked in a boolean array.
+
+    Parameters
+    ----------
+    page : list
+        Records as dictionaries.
+    columns : list
+        The 'columns' of the 'get_dataset_info' payload.
+    fixed_width : bool, optional
+        A flag which defines the dtype of character columns (default is True).
+
+    Returns
+    -------
+    dict
+        Pairs (values, missing) of NumPy arrays by column name.
+    """
+
+
+    result = dict()
+    for column in columns:
+        name = column["name"]
+        values = list(map(operator.methodcaller("get", name), page))
+        if column["type"] == "num":
+            date = _is_date_column(column)
+            if date is None:
+                date = isinstance(next((value for value in values if value is not None), None), str)
+            if date:
+                array = np.array(values, dtype="datetime64[ms]")
+                missing = np.isnat(array)
+            else:
+                # None converts to NaN
+                array = np.array(values, dtype="float64")
+                missing = np.isnan(array)
+        else:
+            array = np.array(values, dtype=object)
+            missing = np.equal(array, None) | np.equal(array, "")
+            if fixed_width:
+                array[missing] = ""
+                array = array.astype(_column_dtype(column, fixed_width))
+        result[name] = (array, missing)
+    return result
+
+
+def _concatenate_columns(chunks, column, fixed_width=True):
+    """This is an auxiliary function. It concatenates the (values, missing) chunks of a column
+       into one masked array. Chunks with values are cast to their common dtype, e.g. the widest
+       string, and chunks without any value take it, since a date column cannot be recognized on
+       a page where all its values are missing.
+    """
+
+
+    dtypes = [values.dtype for values, missing in chunks if not missing.all()]
+    try:
+        dtype = np.result_type(*dtypes) if dtypes else _column_dtype(column, fixed_width)
+    except TypeError:
+        raise ValueError(f"The values of {column['name']} have the incompatible types "
+                         f"{', '.join(sorted(set(map(str, dtypes))))} on different pages.") from None
+    values = [np.zeros(len(chunk), dtype=dtype) if missing.all() else chunk.astype(dtype, copy=False)
+              for chunk, missing in chunks]
+    values = np.concatenate(values) if values else np.empty(0, dtype=dtype)
+    missing = np.concatenate([missing for _, missing in chunks]) if chunks else np.empty(0, dtype=bool)
+    return np.ma.MaskedArray(values, mask=missing)
+
+
+def _decode_columns(content, columns, fixed_width=True, residual=None):
+    """This is an auxiliary function run in worker processes. It decodes the response body of a
+       page, converts the records to columns and keeps the records matching the residual Predicate.
+    """
+
+
+    page = json.loads(content)["payload"]
+    result = _page_to_columns(page, columns, fixed_width)
+    if residual is not None:
+        mask = residual.evaluate(result)
+        result = {name: (values[mask], missing[mask]) for name, (values, missing) in result.items()}
+    return result
+
+
+def retrieve_columns(url, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                     server_url=None, server_port=None, page_size=10000, filter_=None, fixed_width=True,
+                     prefetch=0):
+    """Retrieves the dataset by a dataset name and a library name as one NumPy array per column.
+       The column types and lengths are read once with 'get_dataset_info' and every page is
+       converted column by column, so no list of records is kept for the whole dataset.
+       This function requires the `numpy` module.
+
+       Numeric columns become float64 arrays (or datetime64[ms] arrays for values the server
+       returns as ISO date strings). Character columns become fixed-width unicode arrays of the
+       column length or object arrays. The mask of every array marks missing values.
 
     Parameters
     ----------
     url : str
         The URL of the server with the installed SAS9API.
-    user_name : str
-        User name.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
     repository_name : str, optional
         Repository name (default is 'Foundation').
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    page_size : int, optional
+        Number of records to retrieve per request (default is 10000, maximum value is 10000).
+    filter_ : string/Predicate, optional
+        Dataset filter (JSON) or a Predicate built with 'col' (default is None).
+    fixed_width : bool, optional
+        A flag which defines the dtype of character columns (default is True). If True - fixed-width
+        unicode strings of the column length. If False - Python objects.
+    prefetch : int, optional
+        Number of pages retrieved ahead while the current page is converted (default is 0).
+
     Returns
     -------
     dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+        numpy.ma.MaskedArray by column name, in the order of the dataset columns.
+
+    Raises
+    ------
+    RuntimeError
+        If the dataset information or a page could not be retrieved.
+
+    Example
+    -------
+        >>> columns = retrieve_columns(url, "sashelp", "class", server_name="SASApp")
+        >>> columns["Height"].mean()
+        62.33684210526316
     """
 
-    
-    endpoint = f"sas/meta/users/{user_name}"
-    
-    initial_params = {"repositoryName": repository_name}
-    
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
-        
 
-def get_group_list(url, repository_name="Foundation", only_payload=False):
-    """Gets the list of groups and their associated groups and users.
+    return get_default_client(url).retrieve_columns(library_name, dataset_name, server_name=server_name,
+                                                    repository_name=repository_name, server_url=server_url,
+                                                    server_port=server_port, page_size=page_size,
+                                                    filter_=filter_, fixed_width=fixed_width,
+                                                    prefetch=prefetch)
+
+
+def retrieve_columns_parallel(url, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                              server_url=None, server_port=None, page_size=10000, filter_=None, fixed_width=True,
+                              max_workers=4, processes=None):
+    """Retrieves the dataset by a dataset name and a library name as one NumPy array per column,
+       like retrieve_columns, using all CPU cores. Pages are retrieved concurrently by
+       'max_workers' threads, and their undecoded response bodies are handed to a pool of
+       'processes' worker processes. The workers decode the JSON and convert the records to
+       column arrays, which come back pickled as array buffers. The main process only
+       concatenates them, so decoding no longer limits the throughput to one core. This function
+       requires the `numpy` module.
 
     Parameters
     ----------
     url : str
         The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
     repository_name : str, optional
         Repository name (default is 'Foundation').
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    page_size : int, optional
+        Number of records to retrieve per request (default is 10000, maximum value is 10000).
+    filter_ : string/Predicate, optional
+        Dataset filter (JSON) or a Predicate built with 'col' (default is None). The part of a
+        Predicate not supported by the server is evaluated in the worker processes.
+    fixed_width : bool, optional
+        A flag which defines the dtype of character columns (default is True), see retrieve_columns.
+    max_workers : int, optional
+        Number of concurrent requests (default is 4).
+    processes : int, optional
+        Number of decoding processes (default is None - the number of CPU cores).
+
     Returns
     -------
-    dict/list
-        The server response (either full or truncated depending on the 'only_payload' flag) 
-        as a dictionary (full) or a list (truncated).
+    dict
+        numpy.ma.MaskedArray by column name, in the order of the dataset columns.
+
+    Raises
+    ------
+    RuntimeError
+        If the dataset information or a page could not be retrieved.
+
+    Example
+    -------
+        Worker processes are started from a fresh interpreter and import the caller's main
+        module, so scripts must guard their entry point:
+
+        >>> if __name__ == "__main__":
+        ...     columns = retrieve_columns_parallel(url, "mylib", "big", server_name="SASApp",
+        ...                                         max_workers=8, processes=8)
     """
 
-    
-    endpoint = "sas/meta/groups"
-        
-    initial_params = {"repositoryName": repository_name}
-        
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    return get_default_client(url).retrieve_columns_parallel(library_name, dataset_name, server_name=server_name,
+                                                             repository_name=repository_name,
+                                                             server_url=server_url, server_port=server_port,
+                                                             page_size=page_size, filter_=filter_,
+                                                             fixed_width=fixed_width, max_workers=max_workers,
+                                                             processes=processes)
 
-def get_group_info(url, group_name, repository_name="Foundation", only_payload=False):
-    """Gets the group information and its associated groups and users by a group name.
+
+def to_dataframe(url, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                 server_url=None, server_port=None, page_size=10000, filter_=None, prefetch=0):
+    """Retrieves the dataset as a pandas DataFrame by a dataset name and a library name.
+       The columns are built with 'retrieve_columns', so the dtypes come from 'get_dataset_info':
+       numeric columns are float64 with NaN for missing values, ISO date strings are converted to
+       datetime64 in bulk and character columns are objects with None for missing values.
+       This function requires the `pandas` and `numpy` modules.
 
     Parameters
     ----------
     url : str
         The URL of the server with the installed SAS9API.
-    group_name : str
-        Group name.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
     repository_name : str, optional
         Repository name (default is 'Foundation').
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    page_size : int, optional
+        Number of records to retrieve per request (default is 10000, maximum value is 10000).
+    filter_ : string/Predicate, optional
+        Dataset filter (JSON) or a Predicate built with 'col' (default is None).
+    prefetch : int, optional
+        Number of pages retrieved ahead while the current page is converted (default is 0).
+
     Returns
     -------
-    dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+    pandas.DataFrame
+        The dataset with typed columns.
+
+    Raises
+    ------
+    RuntimeError
+        If the dataset information or a page could not be retrieved.
+
+    Example
+    -------
+        >>> to_dataframe(url, "sashelp", "buy", server_name="SASApp").dtypes
+        AMOUNT           float64
+        DATE       datetime64[ms]
+        dtype: object
     """
 
-    
-    endpoint = f"sas/meta/groups/{group_name}"
-        
-    initial_params = {"repositoryName": repository_name}
-    
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    return get_default_client(url).to_dataframe(library_name, dataset_name, server_name=server_name,
+                                                repository_name=repository_name, server_url=server_url,
+                                                server_port=server_port, page_size=page_size, filter_=filter_,
+                                                prefetch=prefetch)
 
-def get_role_list(url, repository_name="Foundation", only_payload=False):
-    """Gets the list of roles and their associated groups and users.
+
+def to_arrow(url, library_name, dataset_name, server_name=None, repository_name="Foundation",
+             server_url=None, server_port=None, page_size=10000, filter_=None, prefetch=0):
+    """Retrieves the dataset as a pyarrow Table by a dataset name and a library name.
+       Every page becomes one chunk of every column, so the chunks are not copied into one buffer.
+       Numeric columns are float64, ISO date strings become timestamp[ms] and character columns
+       are strings; missing values are nulls. This function requires the `pyarrow` and `numpy`
+       modules.
 
     Parameters
     ----------
     url : str
         The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
     repository_name : str, optional
         Repository name (default is 'Foundation').
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    page_size : int, optional
+        Number of records to retrieve per request (default is 10000, maximum value is 10000).
+    filter_ : string/Predicate, optional
+        Dataset filter (JSON) or a Predicate built with 'col' (default is None).
+    prefetch : int, optional
+        Number of pages retrieved ahead while the current page is converted (default is 0).
+
     Returns
     -------
-    dict/list
-        The server response (either full or truncated depending on the 'only_payload' flag) 
-        as a dictionary (full) or a list (truncated).
+    pyarrow.Table
+        The dataset with typed columns.
+
+    Raises
+    ------
+    RuntimeError
+        If the dataset information or a page could not be retrieved.
     """
 
-    
-    endpoint = "sas/meta/roles"
-        
-    initial_params = {"repositoryName":repository_name}
-    
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    return get_default_client(url).to_arrow(library_name, dataset_name, server_name=server_name,
+                                            repository_name=repository_name, server_url=server_url,
+                                            server_port=server_port, page_size=page_size, filter_=filter_,
+                                            prefetch=prefetch)
 
-def get_role_info(url, role_name, repository_name="Foundation", only_payload=False):
-    """Gets the role information and its associated groups and users by a role name.
+
+# LOADING *********************************************************************************************************
+def _chunk_records(records, chunk_rows=1000, chunk_bytes=None):
+    """This is an auxiliary function. It splits an iterable of records into lists of at most
+       'chunk_rows' records and, if 'chunk_bytes' is given, of at most about 'chunk_bytes' bytes
+       of JSON. A single record larger than 'chunk_bytes' makes a chunk of its own.
+    """
+
+
+    chunk = []
+    size = 0
+    for record in records:
+        record_size = len(json.dumps(record)) + 1 if chunk_bytes is not None else 0
+        if chunk and (len(chunk) >= chunk_rows or (chunk_bytes is not None and size + record_size > chunk_bytes)):
+            yield chunk
+            chunk = []
+            size = 0
+        chunk.append(record)
+        size += record_size
+    if chunk:
+        yield chunk
+
+
+def _normalize_value(value):
+    """This is an auxiliary function. It converts a value to the form compared by upsert_changes:
+       numbers to floats, strings without trailing blanks (SAS pads character values) and blank
+       strings to None.
+    """
+
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        return value.rstrip() or None
+    return value
+
+
+def _hash_records(records, columns):
+    """This is an auxiliary function. It returns a uint64 NumPy array of 64-bit hashes of the
+       normalized values of the columns of every record.
+    """
+
+
+    def hash_record(record):
+        data = json.dumps([_normalize_value(record.get(column)) for column in columns], separators=(",", ":"))
+        return int.from_bytes(hashlib.blake2b(data.encode("utf-8"), digest_size=8).digest(), "little")
+
+    return np.fromiter(map(hash_record, records), dtype=np.uint64, count=len(records))
+
+
+def _sas_literal(value, type_):
+    """This is an auxiliary function. It returns a SAS literal of a value of a 'num' or 'char' column.
+       Dates and datetimes of 'num' columns, or the ISO strings the server returns for them, become
+       SAS date and datetime constants.
+    """
+
+
+    if type_ == "num":
+        if isinstance(value, str):
+            value = datetime.datetime.fromisoformat(value) if "T" in value else datetime.date.fromisoformat(value)
+        if isinstance(value, datetime.datetime):
+            return f"'{value:%d%b%Y:%H:%M:%S}'dt".upper()
+        if isinstance(value, datetime.date):
+            return f"'{value:%d%b%Y}'d".upper()
+        return "." if value is None else repr(float(value))
+    return "'" + ("" if value is None else str(value)).replace("'", "''") + "'"
+
+
+def insert_data_bulk(url, library_name, dataset_name, records, server_name=None, repository_name="Foundation",
+                     server_url=None, server_port=None, by_key=None, chunk_rows=1000, chunk_bytes=None,
+                     max_workers=4, max_retries=3, backoff_delay=1.0, progress=None):
+    """Inserts records into the dataset or replaces them by a key in chunks uploaded concurrently.
+       The records are consumed lazily and split into chunks by the number of records and,
+       optionally, by the size of their JSON. Every chunk is sent with 'insert_data' over the pooled
+       connections, and only a bounded number of chunks is held in memory. A failed chunk is
+       retried on its own after an exponentially growing delay.
 
     Parameters
     ----------
     url : str
         The URL of the server with the installed SAS9API.
-    role_name : str
-        Role name.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    records : iterable
+        Records to insert as dictionaries (a list or any iterable, e.g. a generator).
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
     repository_name : str, optional
         Repository name (default is 'Foundation').
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    by_key : str, optional
+        Dataset key for record matching (default is None).
+    chunk_rows : int, optional
+        Maximum number of records per request (default is 1000).
+    chunk_bytes : int, optional
+        Maximum size of the JSON body per request in bytes (default is None - no limit).
+    max_workers : int, optional
+        Number of concurrent requests (default is 4).
+    max_retries : int, optional
+        Number of retries of a failed chunk (default is 3).
+    backoff_delay : float, optional
+        Delay before the first retry in seconds, doubled on every next retry (default is 1.0).
+    progress : callable, optional
+        A function called with the summary (see below) after every chunk (default is None).
+
+    Note: the chunks are uploaded concurrently, so their order in the dataset is not guaranteed.
+
     Returns
     -------
     dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+        The sums of 'itemsInserted', 'itemsUpdated' and 'itemsRemoved' of all chunks, the number of
+        'records' in the uploaded chunks, the number of 'chunks' and the list of chunks which
+        'failed' after all retries.
+
+    Example
+    -------
+        >>> insert_data_bulk(url, "mylib", "big", (make_record(row) for row in source),
+        ...                  server_name="SASApp", chunk_rows=5000, max_workers=8)
+        {'itemsInserted': 1000000, 'itemsUpdated': 0, 'itemsRemoved': 0, 'records': 1000000,
+         'chunks': 200, 'failed': []}
     """
- 
 
-    endpoint = f"sas/meta/roles/{role_name}"
-        
-    initial_params = {"repositoryName": repository_name}
-    
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    return get_default_client(url).insert_data_bulk(library_name, dataset_name, records, server_name=server_name,
+                                                    repository_name=repository_name, server_url=server_url,
+                                                    server_port=server_port, by_key=by_key, chunk_rows=chunk_rows,
+                                                    chunk_bytes=chunk_bytes, max_workers=max_workers,
+                                                    max_retries=max_retries, backoff_delay=backoff_delay,
+                                                    progress=progress)
+
+
+def _read_records(path, columns=None):
+    """This is an auxiliary function. It lazily reads records from a JSON Lines file (one object per
+       line) or, if the file name ends with '.csv', from a CSV file with a header. CSV values of
+       numeric 'columns' are converted to floats and empty values to None. Values of date columns
+       are kept as the ISO date strings the server accepts; of numeric columns without a format
+       in 'columns', values which are not numbers are kept as strings.
+    """
+
+
+    if str(path).lower().endswith(".csv"):
+        numeric = {column["name"].upper(): _is_date_column(column) for column in columns or []
+                   if column["type"] == "num" and _is_date_column(column) is not True}
+        with open(path, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                record = dict()
+                for name, value in row.items():
+                    if value == "":
+                        value = None
+                    elif name.upper() in numeric:
+                        try:
+                            value = float(value)
+                        except ValueError:
+                            # Without a format a date column is only recognized by its values
+                            if numeric[name.upper()] is not None:
+                                raise
+                    record[name] = value
+                yield record
+    else:
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
 
-# LIBRARIES *********************************************************************************************************
-def get_library_list(url, server_name=None, repository_name="Foundation", 
-                    server_url=None, server_port=None, only_payload=False):
-    """Gets the list of libraries for the workspace server.
+
+def replace_all_data_stream(url, library_name, dataset_name, source, server_name=None, repository_name="Foundation",
+                            server_url=None, server_port=None, chunk_rows=1000, chunk_bytes=None, max_workers=1,
+                            max_retries=3, backoff_delay=1.0, progress=True):
+    """Replaces all data in the dataset with records streamed from an iterable, a JSON Lines file or
+       a CSV file, without holding all of them in memory. The first chunk replaces the data through
+       'replace_all_data' and the remaining chunks are appended with 'insert_data_bulk'.
 
     Parameters
     ----------
     url : str
         The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    source : iterable/str/os.PathLike
+        Records as dictionaries (a list or any iterable, e.g. a generator) or a path to a file.
+        Files ending with '.csv' are read as CSV with a header; numeric columns of the dataset are
+        converted to numbers, except date columns, and empty values to missing. Other files are read as JSON Lines.
     server_name : str (optional, the default Server Name from the configuration file will be used 
                        if neither 'server_name nor ('server_url' and 'server_port') are specified)
         Workspace server name (default is None).
@@ -589,40 +4283,65 @@ def get_library_list(url, server_name=None, repository_name="Foundation",
     If 'server_name' and the pair ('server_url' and 'server_port') are both specified
     the request is made using 'server_name'.
     
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    chunk_rows : int, optional
+        Maximum number of records per request (default is 1000).
+    chunk_bytes : int, optional
+        Maximum size of the JSON body per request in bytes (default is None - no limit).
+    max_workers : int, optional
+        Number of concurrent requests appending the chunks (default is 1, which keeps the order
+        of the records).
+    max_retries : int, optional
+        Number of retries of a failed appended chunk (default is 3).
+    backoff_delay : float, optional
+        Delay before the first retry in seconds, doubled on every next retry (default is 1.0).
+    progress : bool/callable, optional
+        Progress reporting (default is True). If True - the number of sent records and the
+        throughput are printed after every chunk. If callable - it is called with the number of
+        sent records and the elapsed seconds instead. If False - nothing is reported.
+
     Returns
     -------
-    dict/list
-        The server response (either full or truncated depending on the 'only_payload' flag) 
-        as a dictionary (full) or a list (truncated).
+    dict
+        The summary in the format of 'insert_data_bulk' where 'itemsRemoved' is the number of
+        records removed by the replacement.
+
+    Raises
+    ------
+    RuntimeError
+        If the first chunk could not replace the data or an appended chunk failed after all retries,
+        in which case the dataset holds only part of the records.
+
+    Example
+    -------
+        >>> replace_all_data_stream(url, "mylib", "big", "big.csv", server_name="SASApp", chunk_rows=5000)
+        Sent 5000 records in 0.8 s (6250 records/s).
+        ...
     """
 
-    
-    initial_params = dict()
-    
-    endpoint = "sas/libraries"
-    
-    if server_name is not None:
-        endpoint = f"sas/servers/{server_name}/libraries"
-        initial_params["repositoryName"] = repository_name
-    elif server_url is not None and server_port is not None:
-        initial_params["serverUrl"] = server_url
-        initial_params["serverPort"] = server_port
-    else:
-        print("The default Server Name from the configuration file will be used "
-              "because neither 'server_name' nor ('server_url' and 'server_port') are specified!")
-    
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    return get_default_client(url).replace_all_data_stream(library_name, dataset_name, source,
+                                                           server_name=server_name,
+                                                           repository_name=repository_name,
+                                                           server_url=server_url, server_port=server_port,
+                                                           chunk_rows=chunk_rows, chunk_bytes=chunk_bytes,
+                                                           max_workers=max_workers, max_retries=max_retries,
+                                                           backoff_delay=backoff_delay, progress=progress)
 
-def get_library_info(url, library_name, server_name=None, repository_name="Foundation", 
-                    server_url=None, server_port=None, only_payload=False):
-    """Gets the library information for the workspace server by a library name.
+
+def upsert_changes(url, library_name, dataset_name, records, by_key, server_name=None, repository_name="Foundation",
+                   server_url=None, server_port=None, delete=False, page_size=10000, prefetch=0, chunk_rows=1000,
+                   chunk_bytes=None, max_workers=4, max_retries=3, backoff_delay=1.0, progress=None):
+    """Inserts only the records which are new or changed compared to the dataset, replacing the
+       changed ones by a key. The dataset is streamed first and every record is reduced to a 64-bit
+       hash of its key and a 64-bit hash of its values, so the index takes 16 bytes per record.
+       The input records are then compared with the index chunk by chunk and only the differing
+       ones are uploaded with insert_data_bulk. Records of the dataset whose keys are missing from
+       the input are counted and, if 'delete' is True, deleted with a PROC SQL command. This
+       function requires the `numpy` module.
+
+       Only the columns of the first input record are compared. Numbers are compared as floats and
+       strings without trailing blanks, so dates must be given in the format returned by the
+       server.
 
     Parameters
     ----------
@@ -630,6 +4349,12 @@ def get_library_info(url, library_name, server_name=None, repository_name="Found
         The URL of the server with the installed SAS9API.
     library_name : str
         Library name.
+    dataset_name : str
+        Dataset name.
+    records : iterable
+        Records as dictionaries; consumed lazily.
+    by_key : str
+        Dataset key for record matching.
     server_name : str (optional, the default Server Name from the configuration file will be used 
                        if neither 'server_name nor ('server_url' and 'server_port') are specified)
         Workspace server name (default is None).
@@ -643,137 +4368,663 @@ def get_library_info(url, library_name, server_name=None, repository_name="Found
     If 'server_name' and the pair ('server_url' and 'server_port') are both specified
     the request is made using 'server_name'.
     
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    delete : bool, optional
+        A flag which defines whether records with keys missing from the input are deleted (default
+        is False). Deleting reads the dataset a second time to collect their keys.
+    page_size : int, optional
+        Number of records to retrieve per request (default is 10000, maximum value is 10000).
+    prefetch : int, optional
+        Number of pages retrieved ahead while the current page is hashed (default is 0).
+    chunk_rows, chunk_bytes, max_workers, max_retries, backoff_delay, progress
+        Upload parameters, see insert_data_bulk.
+
     Returns
     -------
     dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
-        
+        The insert_data_bulk summary extended with the numbers of 'inserted', 'changed' and
+        'unchanged' input records and of 'deleted' keys - keys of the dataset missing from the input.
+
+    Raises
+    ------
+    ValueError
+        If the dataset has no 'by_key' column or no column of the input records, or its values of
+        'by_key' are not unique.
+    RuntimeError
+        If the dataset information or a page could not be retrieved or the records could not be deleted.
+
     Example
     -------
-        >>> get_library_info(url, "sashelp", server_name="SASApp")
-        {'status': 200,
-         'error': None,
-         'payload': {'id': None,
-         'libname': 'SASHELP',
-         'engine': 'V9',
-         'path': 'your_path',
-         'level': 1,
-         'readonly': False,
-         'sequential': False,
-         'temp': False}}
+        >>> upsert_changes(url, "mylib", "customers", records, "ID", server_name="SASApp")
+        {'itemsInserted': 12, 'itemsUpdated': 0, 'itemsRemoved': 40, 'records': 52, 'chunks': 1,
+         'failed': [], 'inserted': 12, 'changed': 40, 'unchanged': 9948, 'deleted': 3}
     """
 
-    
-    initial_params = dict()
-    
-    endpoint = f"sas/libraries/{library_name}"
-    
-    if server_name is not None:
-        endpoint = f"sas/servers/{server_name}/libraries/{library_name}"
-        initial_params["repositoryName"] = repository_name
-    elif server_url is not None and server_port is not None:
-        initial_params["serverUrl"] = server_url
-        initial_params["serverPort"] = server_port
-    else:
-        print("The default Server Name from the configuration file will be used "
-              "because neither 'server_name' nor ('server_url' and 'server_port') are specified!")
-    
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    return get_default_client(url).upsert_changes(library_name, dataset_name, records, by_key,
+                                                  server_name=server_name, repository_name=repository_name,
+                                                  server_url=server_url, server_port=server_port, delete=delete,
+                                                  page_size=page_size, prefetch=prefetch, chunk_rows=chunk_rows,
+                                                  chunk_bytes=chunk_bytes, max_workers=max_workers,
+                                                  max_retries=max_retries, backoff_delay=backoff_delay,
+                                                  progress=progress)
 
-def create_library(url, server_name, library_name, engine, display_name, path, location, 
-                   repository_name="Foundation", is_preassigned=False, only_payload=False):
-    """Creates a library at a given server with given library name and parameters.
+
+# CACHING *********************************************************************************************************
+class ResponseCache:
+    """An in-process cache of metadata responses with a time to live per endpoint and LRU eviction.
+
+    Only GET responses of the endpoints listed in 'ttls' are cached. Any other request made by
+    the client invalidates the cached responses it may change: modifying a library or a dataset
+    invalidates the cached responses of the library, its datasets and the lists containing them,
+    and executing SAS code or moving or deleting metadata objects clears the whole cache.
+    Library and dataset names are compared case-insensitively and the server of a request is
+    ignored, which may invalidate more than necessary but never less.
 
     Parameters
     ----------
-    url : str
-        The URL of the server with the installed SAS9API.
-    server_name : str
-        Workspace server name.
-    library_name : str
-        Created library name as will be used in a LIBNAME statement.
-    engine : str
-        LIBNAME engine.
-    display_name : str
-        Library display name.
-    path : str
-        Library data path.
-    location : str
-        Folder to place metadata object in.
-    repository_name : str, optional
-        Repository name (default is 'Foundation').
-    is_preassigned : bool
-        A flag whic defines whether the created library should be preassigned (default is False).  
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
-    Returns
+    maxsize : int, optional
+        Maximum number of cached responses; the least recently used one is evicted first
+        (default is 1024).
+    ttls : dict, optional
+        Time to live in seconds by function name (default is None - DEFAULT_TTLS). Functions
+        which can be cached: get_workspace_server_list, get_library_list, get_library_info,
+        get_dataset_list, get_dataset_info, get_user_list, get_group_list and get_role_list.
+
+    Example
     -------
-    dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+        >>> cache = ResponseCache(ttls={"get_library_list": 3600, "get_dataset_info": 300})
+        >>> client = SAS9APIClient(url, cache=cache)
+
+        The module-level functions use the default client of the url:
+
+        >>> get_default_client(url).cache = ResponseCache()
     """
 
-    
-    endpoint = f"sas/servers/{server_name}/libraries/{library_name}"
-    
-    initial_params = {"engine": engine, "displayName": display_name, "path": path, 
-                      "location": location, "repositoryName": repository_name}
-    if is_preassigned:
-        initial_params["isPreassigned"] = "true"
-    else:
-        initial_params["isPreassigned"] = "false"
-    
-    return make_request("POST", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    DEFAULT_TTLS = {"get_workspace_server_list": 3600, "get_library_list": 600, "get_dataset_info": 60,
+                    "get_user_list": 600, "get_group_list": 600, "get_role_list": 600}
 
-def delete_library(url, server_name, library_name, repository_name="Foundation", only_payload=False):
-    """Removes all libraries with matching library name.
+    ENDPOINTS = [("get_workspace_server_list", re.compile(r"sas/servers")),
+                 ("get_library_list", re.compile(r"sas/(servers/[^/]+/)?libraries")),
+                 ("get_library_info", re.compile(r"sas/(servers/[^/]+/)?libraries/[^/]+")),
+                 ("get_dataset_list", re.compile(r"sas/(servers/[^/]+/)?libraries/[^/]+/datasets")),
+                 ("get_dataset_info", re.compile(r"sas/(servers/[^/]+/)?libraries/[^/]+/datasets/[^/]+")),
+                 ("get_user_list", re.compile(r"sas/meta/users")),
+                 ("get_group_list", re.compile(r"sas/meta/groups")),
+                 ("get_role_list", re.compile(r"sas/meta/roles"))]
+
+    def __init__(self, maxsize=1024, ttls=None):
+        self.maxsize = maxsize
+        self.ttls = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _resource(endpoint):
+        """Returns the path of the resource of the endpoint, lower-cased and without the server name
+           and the '/data' suffix, as a tuple of segments.
+        """
+
+
+        path = endpoint.strip("/").lower()
+        path = re.sub(r"^sas/servers/[^/]+/(?=libraries)", "sas/", path)
+        path = re.sub(r"/data$", "", path)
+        return tuple(path.split("/"))
+
+    def make_key(self, endpoint, initial_params):
+        """Returns the cache key of a GET request or None if the request is not cached."""
+
+
+        endpoint = endpoint.strip("/")
+        for name, pattern in self.ENDPOINTS:
+            if pattern.fullmatch(endpoint) and self.ttls.get(name):
+                return (name, endpoint, tuple(sorted((key, str(value)) for key, value in initial_params.items())))
+        return None
+
+    def get(self, key):
+        """Returns a copy of the cached response or None if it is missing or expired."""
+
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, _, response = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(response)
+
+    def put(self, key, response):
+        """Caches a copy of the response for the time to live of its endpoint."""
+
+
+        name, endpoint, _ = key
+        entry = (time.monotonic() + self.ttls[name], self._resource(endpoint), copy.deepcopy(response))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint):
+        """Removes the cached responses which a non-GET request to the endpoint may change."""
+
+
+        resource = self._resource(endpoint)
+        if resource[-1] == "cmd" or resource[:3] == ("sas", "meta", "objects"):
+            self.clear()
+            return
+        with self._lock:
+            for key, (_, cached, _) in list(self._entries.items()):
+                # Lists containing the resource and responses about the resource or its children
+                if resource[:len(cached)] == cached or cached[:len(resource)] == resource:
+                    del self._entries[key]
+
+    def clear(self):
+        """Removes all cached responses."""
+
+
+        with self._lock:
+            self._entries.clear()
+
+
+class DatasetCache:
+    """A two-tier cache of retrieved datasets validated by their modification date.
+
+    A cached copy is only served while the 'modificationDate' and 'objectsNumber' reported by
+    'get_dataset_info' are the same as when it was retrieved. The memory tier keeps the most
+    recently used datasets while their number and total size, measured as the size of the
+    pickled records, are within 'max_memory_items' and 'max_memory_bytes'; the optional disk tier
+    keeps pickled datasets in a directory and removes the least recently used files when their
+    total size exceeds 'max_disk_bytes'. Every call of 'get' returns a new copy of the records,
+    so changing them does not change the cache.
+
+    Parameters
+    ----------
+    max_memory_items : int, optional
+        Number of datasets kept in memory (default is 8; 0 disables the memory tier).
+    directory : str/os.PathLike, optional
+        Directory of the disk tier (default is None - no disk tier). It is created if missing.
+    max_disk_bytes : int, optional
+        Maximum total size of the files of the disk tier in bytes (default is 1 GiB).
+    max_memory_bytes : int, optional
+        Maximum total size of the datasets of the memory tier in bytes (default is 256 MiB).
+
+    Example
+    -------
+        >>> cache = DatasetCache(directory="/var/cache/sas9api")
+        >>> records = retrieve_data_cached(url, "mylib", "reference", cache, server_name="SASApp")
+    """
+
+
+    def __init__(self, max_memory_items=8, directory=None, max_disk_bytes=1024 ** 3,
+                 max_memory_bytes=256 * 1024 ** 2):
+        self.max_memory_items = max_memory_items
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self._memory = collections.OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.pickle")
+
+    def get(self, key, version):
+        """Returns a copy of the cached records of the key if they were cached for the version,
+           else None.
+        """
+
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] == version:
+                self._memory.move_to_end(key)
+                return [dict(record) for record in entry[1]]
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                cached_key, cached_version, records = pickle.load(file)
+                size = file.tell()
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if cached_key != key or cached_version != version:
+            return None
+        # The modification time orders the files for eviction
+        os.utime(path)
+        self._remember(key, version, records, size)
+        return [dict(record) for record in records]
+
+    def put(self, key, version, records):
+        """Caches a copy of the records of the key for the version in both tiers."""
+
+
+        data = pickle.dumps((key, version, records), protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, version, [dict(record) for record in records], len(data))
+        if self.directory is None:
+            return
+        path = self._path(key)
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+        os.replace(temporary_path, path)
+        self._evict_files()
+
+    def _remember(self, key, version, records, size):
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous[2]
+            if self.max_memory_items <= 0 or size > self.max_memory_bytes:
+                return
+            self._memory[key] = (version, records, size)
+            self._memory_bytes += size
+            while len(self._memory) > self.max_memory_items or self._memory_bytes > self.max_memory_bytes:
+                _, (_, _, evicted_size) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted_size
+
+    def _evict_files(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pickle"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Removes all cached datasets from both tiers."""
+
+
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.directory is not None:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".pickle"):
+                    os.remove(entry.path)
+
+
+def retrieve_data_cached(url, library_name, dataset_name, cache, server_name=None, repository_name="Foundation",
+                         server_url=None, server_port=None, filter_=None, page_size=10000, prefetch=0):
+    """Retrieves all records of the dataset by a dataset name and a library name unless an unchanged
+       copy is cached. The 'modificationDate' and 'objectsNumber' of the dataset are checked with one
+       'get_dataset_info' request; if they did not change since the copy was cached, the copy is
+       returned, otherwise the dataset is retrieved with 'iter_data' and cached.
 
     Parameters
     ----------
     url : str
         The URL of the server with the installed SAS9API.
-    server_name : str
-        Workspace server name.
     library_name : str
         Library name.
+    dataset_name : str
+        Dataset name.
+    cache : DatasetCache
+        Cache of datasets.
+    server_name : str (optional, the default Server Name from the configuration file will be used 
+                       if neither 'server_name nor ('server_url' and 'server_port') are specified)
+        Workspace server name (default is None).
     repository_name : str, optional
         Repository name (default is 'Foundation').
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    server_url : str (optional; must come in pair with 'server_port' if specified)
+        Workspace server URL (default is None).
+    server_port : int/str (optional; must come in pair with 'server_url' if specified)
+        Workspace server port (default is None).
+        
+    If 'server_name' and the pair ('server_url' and 'server_port') are both specified
+    the request is made using 'server_name'.
+    
+    filter_ : string/Predicate, optional
+        Dataset filter (JSON) or a Predicate built with 'col' (default is None). Copies are cached
+        separately for every filter.
+    page_size : int, optional
+        Number of records to retrieve per request (default is 10000, maximum value is 10000).
+    prefetch : int, optional
+        Number of pages retrieved ahead (default is 0).
+
     Returns
     -------
-    dict/bool
-        The server response (either full or truncated depending on the 'only_payload' flag) 
-        as a dictionary (full) or a boolean (truncated).
+    list
+        The records of the dataset. The cached list is returned as is and must not be modified.
+
+    Raises
+    ------
+    RuntimeError
+        If the dataset information or a page could not be retrieved.
+    """
+
+
+    return get_default_client(url).retrieve_data_cached(library_name, dataset_name, cache, server_name=server_name,
+                                                        repository_name=repository_name, server_url=server_url,
+                                                        server_port=server_port, filter_=filter_,
+                                                        page_size=page_size, prefetch=prefetch)
+
+
+# STORE *********************************************************************************************************
+class StoredDataset:
+    """A version of a dataset in a ColumnStore with memory-mapped columns.
+
+    Every column is kept in two files - the values and the missing value flags - which are mapped
+    read-only, so processes reading the same dataset share the pages of the operating system cache
+    instead of holding their own copies. All files are mapped when the dataset is opened, so the
+    dataset stays readable while the store publishes a new version.
+
+    Parameters
+    ----------
+    path : str
+        Directory of the version of the dataset in the store.
+
+    Example
+    -------
+        >>> dataset = store.open(ColumnStore.make_key(url, "mylib", "big", server_name="SASApp"))
+        >>> dataset["AMOUNT"].sum()
+    """
+
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as file:
+            self.meta = json.load(file)
+        self._indexes = {column["name"]: index for index, column in enumerate(self.meta["columns"])}
+        self._values = {column["name"]: self._map(column["name"], "values", np.dtype(column["dtype"]))
+                        for column in self.meta["columns"]}
+        self._missing = {column["name"]: self._map(column["name"], "missing", np.dtype(bool))
+                         for column in self.meta["columns"]}
+
+    @property
+    def columns(self):
+        """Column names in the order of the dataset."""
+
+
+        return [column["name"] for column in self.meta["columns"]]
+
+    @property
+    def info(self):
+        """The 'get_dataset_info' payload of the dataset at the time it was stored."""
+
+
+        return self.meta["info"]
+
+    @property
+    def watermark(self):
+        """The high-water mark of the last sync as a dictionary with 'column' and 'value' or None."""
+
+
+        return self.meta.get("watermark")
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def _map(self, name, suffix, dtype):
+        if self.meta["rows"] == 0:
+            return np.empty(0, dtype=dtype)
+        path = os.path.join(self.path, f"{self._indexes[name]}.{suffix}")
+        return np.memmap(path, dtype=dtype, mode="r", shape=(self.meta["rows"],))
+
+    def values(self, name):
+        """Returns the memory-mapped values of a column; missing values are undefined."""
+
+
+        return self._values[name]
+
+    def missing(self, name):
+        """Returns the memory-mapped flags of the missing values of a column."""
+
+
+        return self._missing[name]
+
+    def __getitem__(self, name):
+        return np.ma.MaskedArray(self.values(name), mask=self.missing(name))
+
+
+class ColumnStore:
+    """A directory of datasets stored column by column for memory-mapped access.
+
+    Datasets are written page by page, so the writer never holds a whole dataset in memory. Each
+    dataset is stored under a key identifying the server, the library, the dataset and the filter,
+    in a directory holding its versions and a pointer to the current one. A new version is written
+    to its own directory and published by replacing the pointer atomically, so readers see either
+    the previous or the new version, and datasets opened before keep reading their version.
+
+    Numeric columns are stored as float64 or, for values returned as ISO date strings, as
+    datetime64[ms]; character columns as fixed-width unicode strings of the column length.
+
+    Parameters
+    ----------
+    directory : str/os.PathLike
+        Directory of the store. It is created if missing.
+    """
+
+
+    CURRENT = "current.json"
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(url, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                 server_url=None, server_port=None, filter_=None):
+        """Returns the key of a dataset retrieved with the given parameters (see spool_columns)."""
+
+
+        server = {"server_name": server_name, "repository_name": repository_name,
+                  "server_url": server_url, "server_port": server_port}
+        return _dataset_key(url, library_name, dataset_name, server, filter_)
+
+    def path(self, key):
+        """Returns the directory of the dataset with the key, holding its versions."""
+
+
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode("utf-8")).hexdigest())
+
+    def _current(self, key):
+        """Returns the directory of the current version of the dataset or None if it is not stored."""
+
+
+        try:
+            with open(os.path.join(self.path(key), self.CURRENT), encoding="utf-8") as file:
+                return os.path.join(self.path(key), json.load(file)["version"])
+        except FileNotFoundError:
+            return None
+
+    def open(self, key):
+        """Returns the current version of the dataset with the key or None if it is not stored."""
+
+
+        for attempt in range(3):
+            version_path = self._current(key)
+            if version_path is None:
+                return None
+            try:
+                return StoredDataset(version_path)
+            except FileNotFoundError:
+                # The version was replaced and removed while it was being opened
+                if attempt == 2:
+                    raise
+
+    def write(self, key, info, chunks, watermark=None):
+        """Writes a dataset and publishes it under the key, replacing the previous version.
+           Writes of the same dataset must not run concurrently.
+
+        Parameters
+        ----------
+        key : tuple
+            Key of the dataset.
+        info : dict
+            The 'get_dataset_info' payload of the dataset.
+        chunks : iterable
+            Dictionaries of (values, missing) pairs of NumPy arrays by column name, one per page,
+            as returned by '_page_to_columns'.
+        watermark : dict, optional
+            High-water mark to store with the dataset (default is None). It is stored after the
+            chunks are written, so it may be updated while they are consumed.
+
+        Returns
+        -------
+        StoredDataset
+            The stored dataset.
+        """
+
+
+        path = self.path(key)
+        version = f"{time.time_ns()}.{os.getpid()}.{threading.get_ident()}"
+        version_path = os.path.join(path, version)
+        os.makedirs(version_path)
+        try:
+            # A Predicate filter is a tuple which may hold dates
+            meta = {"key": json.loads(json.dumps(key, default=str)), "info": info, "rows": 0,
+                    "columns": [{"name": column["name"], "type": column["type"], "length": column["length"],
+                                 "dtype": None} for column in info["columns"]]}
+            self._append_chunks(version_path, meta, chunks)
+            meta["watermark"] = watermark
+            _write_json(os.path.join(version_path, "meta.json"), meta)
+            _write_json(os.path.join(path, self.CURRENT), {"version": version})
+        except BaseException:
+            shutil.rmtree(version_path, ignore_errors=True)
+            raise
+        dataset = StoredDataset(version_path)
+        # Readers of the previous versions keep their mapped files; on systems which do not remove
+        # mapped files the versions are removed by a later write
+        for name in os.listdir(path):
+            if name != version and os.path.isdir(os.path.join(path, name)):
+                shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+        return dataset
+
+    def append(self, key, info, chunks, watermark=None):
+        """Appends rows to the current version of a stored dataset in place.
+
+        The column files only grow and meta.json, which holds the number of rows, is replaced
+        atomically after the rows are written, so readers see either the previous or the new
+        rows, and opened datasets keep their mapped rows. Rows left behind by an interrupted
+        append are discarded by the next one. Appends to the same dataset must not run
+        concurrently.
+
+        Parameters
+        ----------
+        key : tuple
+            Key of the dataset.
+        info : dict
+            The current 'get_dataset_info' payload of the dataset.
+        chunks : iterable
+            Dictionaries of (values, missing) pairs of NumPy arrays by column name, one per page.
+        watermark : dict, optional
+            High-water mark to store with the dataset (default is None), see 'write'.
+
+        Returns
+        -------
+        StoredDataset
+            The stored dataset.
+
+        Raises
+        ------
+        ValueError
+            If the dataset is not stored or a column changed its type.
+        """
+
+
+        dataset = self.open(key)
+        if dataset is None:
+            raise ValueError(f"Dataset {key} is not stored.")
+        meta = copy.deepcopy(dataset.meta)
+        for index, column in enumerate(meta["columns"]):
+            itemsize = np.dtype(column["dtype"]).itemsize
+            for suffix, size in (("values", itemsize), ("missing", 1)):
+                file_path = os.path.join(dataset.path, f"{index}.{suffix}")
+                if os.path.exists(file_path):
+                    os.truncate(file_path, meta["rows"] * size)
+        self._append_chunks(dataset.path, meta, chunks)
+        meta["info"] = info
+        meta["watermark"] = watermark
+        _write_json(os.path.join(dataset.path, "meta.json"), meta)
+        return StoredDataset(dataset.path)
+
+    @staticmethod
+    def _append_chunks(path, meta, chunks):
+        """Appends chunks to the column files in the directory and updates 'rows' and 'dtype' in meta."""
+
+
+        files = dict()
+        try:
+            for index, column in enumerate(meta["columns"]):
+                files[column["name"]] = (open(os.path.join(path, f"{index}.values"), "ab"),
+                                         open(os.path.join(path, f"{index}.missing"), "ab"))
+            for chunk in chunks:
+                rows = None
+                for column in meta["columns"]:
+                    values, missing = chunk[column["name"]]
+                    if missing.all() and column["type"] == "num":
+                        # A page without values cannot tell a date column from a number column;
+                        # both are stored in 8 bytes, so zeros are valid for either
+                        values = np.zeros(len(values), dtype=column["dtype"] or "float64")
+                    elif column["dtype"] is None:
+                        column["dtype"] = values.dtype.str
+                    elif values.dtype.str != column["dtype"]:
+                        raise ValueError(f"Column {column['name']} changed its type from "
+                                         f"{column['dtype']} to {values.dtype.str}.")
+                    values_file, missing_file = files[column["name"]]
+                    values_file.write(values.tobytes())
+                    missing_file.write(missing.tobytes())
+                    rows = len(values)
+                meta["rows"] += rows or 0
+        finally:
+            for values_file, missing_file in files.values():
+                values_file.close()
+                missing_file.close()
+        for column in meta["columns"]:
+            if column["dtype"] is None:
+                column["dtype"] = _column_dtype(column, True).str
+
+
+def _write_json(path, data):
+    """This is an auxiliary function. It writes JSON to a file atomically."""
+
+
+    temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    os.replace(temporary_path, path)
+
+
+def _track_watermark(pages, mark):
+    """This is an auxiliary function. It yields the pages and raises mark["value"] to the greatest
+       value of the mark["column"] in them. Missing values are ignored.
     """
 
-    
-    endpoint = f"sas/servers/{server_name}/libraries/{library_name}"
-    
-    initial_params = {"repositoryName": repository_name}
-    
-    return make_request("DELETE", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    column = mark["column"]
+    for page in pages:
+        values = [value for value in map(operator.methodcaller("get", column), page)
+                  if value is not None and value != ""]
+        if values:
+            greatest = max(values)
+            if mark["value"] is None or greatest > mark["value"]:
+                mark["value"] = greatest
+        yield page
 
-# DATASETS *********************************************************************************************************
-def get_dataset_list(url, library_name, server_name=None, repository_name="Foundation", 
-                    server_url=None, server_port=None, only_payload=False):
-    """Gets the list of datasets for the specific library by a library name.
+
+def spool_columns(url, library_name, dataset_name, store, server_name=None, repository_name="Foundation",
+                  server_url=None, server_port=None, filter_=None, page_size=10000, prefetch=0):
+    """Retrieves the dataset by a dataset name and a library name into a ColumnStore.
+       Every page is converted to columns and appended to one file per column, so memory use does
+       not depend on the size of the dataset. Other processes can then open the dataset from the
+       store and memory-map its columns without copying them. This function requires the `numpy`
+       module.
 
     Parameters
     ----------
@@ -781,6 +5032,10 @@ def get_dataset_list(url, library_name, server_name=None, repository_name="Found
         The URL of the server with the installed SAS9API.
     library_name : str
         Library name.
+    dataset_name : str
+        Dataset name.
+    store : ColumnStore
+        Store to write the dataset to.
     server_name : str (optional, the default Server Name from the configuration file will be used 
                        if neither 'server_name nor ('server_url' and 'server_port') are specified)
         Workspace server name (default is None).
@@ -794,66 +5049,57 @@ def get_dataset_list(url, library_name, server_name=None, repository_name="Found
     If 'server_name' and the pair ('server_url' and 'server_port') are both specified
     the request is made using 'server_name'.
     
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    filter_ : string/Predicate, optional
+        Dataset filter (JSON) or a Predicate built with 'col' (default is None). Datasets are
+        stored separately for every filter.
+    page_size : int, optional
+        Number of records to retrieve per request (default is 10000, maximum value is 10000).
+    prefetch : int, optional
+        Number of pages retrieved ahead while the current page is written (default is 0).
+
     Returns
     -------
-    dict/list
-        The server response (either full or truncated depending on the 'only_payload' flag) 
-        as a dictionary (full) or a list (truncated).
-        
+    StoredDataset
+        The stored dataset.
+
+    Raises
+    ------
+    RuntimeError
+        If the dataset information or a page could not be retrieved.
+
     Example
     -------
-        >>> get_dataset_list(url, "sashelp", server_name="SASApp", only_payload=True)
-        [{'name': 'AACOMP',
-          'type': 'DATA',
-          'label': '',
-          'creationDate': '2018-11-01T01:15:06.18',
-          'modificationDate': '2018-11-01T01:15:06.18',
-          'objectsNumber': 2020,
-          'columns': None},
-         {'name': 'AARFM',
-          'type': 'DATA',
-          'label': '',
-          'creationDate': '2018-10-25T02:06:00.634',
-          'modificationDate': '2018-10-25T02:06:00.634',
-          'objectsNumber': 130,
-          'columns': None},
-         {'name': 'ADSMSG',
-          'type': 'MSGFILE',
-          'label': '',
-          'creationDate': '2018-10-25T02:13:18.751',
-          'modificationDate': '2018-10-25T02:13:18.751',
-          'objectsNumber': 426,
-          'columns': None},
-          ...]
+        >>> store = ColumnStore("/data/sas9api")
+        >>> spool_columns(url, "mylib", "big", store, server_name="SASApp")
+
+        In any other process on the host:
+
+        >>> dataset = ColumnStore("/data/sas9api").open(ColumnStore.make_key(url, "mylib", "big",
+        ...                                                                   server_name="SASApp"))
+        >>> dataset["AMOUNT"][:10]
     """
 
-    
-    initial_params = dict()
-    
-    endpoint = f"sas/libraries/{library_name}/datasets"
-    
-    if server_name is not None:
-        endpoint = f"sas/servers/{server_name}/libraries/{library_name}/datasets"
-        initial_params = {"repositoryName": repository_name}
-    elif server_url is not None and server_port is not None:
-        initial_params["serverUrl"] = server_url
-        initial_params["serverPort"] = server_port
-    else:
-        print("The default Server Name from the configuration file will be used "
-              "because neither 'server_name' nor ('server_url' and 'server_port') are specified!")
-    
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    return get_default_client(url).spool_columns(library_name, dataset_name, store, server_name=server_name,
+                                                 repository_name=repository_name, server_url=server_url,
+                                                 server_port=server_port, filter_=filter_, page_size=page_size,
+                                                 prefetch=prefetch)
 
-def get_dataset_info(url, library_name, dataset_name, server_name=None, repository_name="Foundation", 
-                    server_url=None, server_port=None, only_payload=False):
-    """Gets the dataset information by a dataset name and a library name.
+
+def sync_columns(url, library_name, dataset_name, store, watermark, server_name=None, repository_name="Foundation",
+                 server_url=None, server_port=None, filter_=None, page_size=10000, prefetch=0, full=False):
+    """Incrementally synchronizes the dataset by a dataset name and a library name into a
+       ColumnStore using a high-water mark. The first run retrieves the whole dataset like
+       spool_columns and remembers the greatest value of the 'watermark' column. Every next run
+       retrieves only the records above the mark, appends them to the stored dataset and advances
+       the mark atomically. If the number of records of the dataset decreased, its columns changed
+       or the stored mark is for another column, the dataset is reloaded in full. This function
+       requires the `numpy` module.
+
+       The 'watermark' column must grow with every appended record, e.g. a load timestamp or an
+       increasing key. Records updated in place, records with a missing mark and records appended
+       with a mark equal to the current one are not picked up by incremental runs; use 'full' to
+       reload such datasets.
 
     Parameters
     ----------
@@ -863,6 +5109,10 @@ def get_dataset_info(url, library_name, dataset_name, server_name=None, reposito
         Library name.
     dataset_name : str
         Dataset name.
+    store : ColumnStore
+        Store to keep the dataset in.
+    watermark : str
+        Name of the column holding the high-water mark.
     server_name : str (optional, the default Server Name from the configuration file will be used 
                        if neither 'server_name nor ('server_url' and 'server_port') are specified)
         Workspace server name (default is None).
@@ -876,195 +5126,359 @@ def get_dataset_info(url, library_name, dataset_name, server_name=None, reposito
     If 'server_name' and the pair ('server_url' and 'server_port') are both specified
     the request is made using 'server_name'.
     
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    filter_ : string/Predicate, optional
+        Dataset filter (JSON) or a Predicate built with 'col' which the server supports entirely
+        (default is None). Datasets are stored separately for every filter.
+    page_size : int, optional
+        Number of records to retrieve per request (default is 10000, maximum value is 10000).
+    prefetch : int, optional
+        Number of pages retrieved ahead while the current page is written (default is 0).
+    full : bool, optional
+        A flag which forces a full reload (default is False).
+
     Returns
     -------
-    dict/list
-        The server response (either full or truncated depending on the 'only_payload' flag) 
-        as a dictionary (full) or a list (truncated).
-        
+    StoredDataset
+        The stored dataset; its 'watermark' property holds the new mark.
+
+    Raises
+    ------
+    ValueError
+        If the dataset has no 'watermark' column or the server does not support the whole
+        Predicate 'filter_'.
+    RuntimeError
+        If the dataset information or a page could not be retrieved.
+
     Example
     -------
-        >>> get_dataset_info(url, "sashelp", "class", server_name="SASApp", only_payload=True)
-        {'name': 'CLASS',
-         'type': 'DATA',
-         'label': 'Student Data',
-         'creationDate': '2018-10-25T02:06:04.07',
-         'modificationDate': '2018-10-25T02:06:04.07',
-         'objectsNumber': 19,
-         'columns': [{'name': 'Name',
-           'type': 'char',
-           'extendedType': 'char',
-           'length': 8,
-           'notNull': False,
-           'indexType': '',
-           'sortedBy': 0,
-           'columnNumber': 1,
-           'label': ''},
-          {'name': 'Sex',
-           'type': 'char',
-           'extendedType': 'char',
-           'length': 1,
-           'notNull': False,
-           'indexType': '',
-           'sortedBy': 0,
-           'columnNumber': 2,
-           'label': ''},
-          {'name': 'Age',
-           'type': 'num',
-           'extendedType': 'num',
-           'length': 8,
-           'notNull': False,
-           'indexType': '',
-           'sortedBy': 0,
-           'columnNumber': 3,
-           'label': ''},
-          {'name': 'Height',
-           'type': 'num',
-           'extendedType': 'num',
-           'length': 8,
-           'notNull': False,
-           'indexType': '',
-           'sortedBy': 0,
-           'columnNumber': 4,
-           'label': ''},
-          {'name': 'Weight',
-           'type': 'num',
-           'extendedType': 'num',
-           'length': 8,
-           'notNull': False,
-           'indexType': '',
-           'sortedBy': 0,
-           'columnNumber': 5,
-           'label': ''}]}
+        >>> store = ColumnStore("/data/sas9api")
+        >>> dataset = sync_columns(url, "mylib", "facts", store, "LOAD_TS", server_name="SASApp")
+        >>> len(dataset), dataset.watermark["value"]
     """
 
-    
-    initial_params = dict()
-    
-    endpoint = f"sas/libraries/{library_name}/datasets/{dataset_name}"
-    
-    if server_name is not None:
-        endpoint = f"sas/servers/{server_name}/libraries/{library_name}/datasets/{dataset_name}"
-        initial_params = {"repositoryName": repository_name}
-    elif server_url is not None and server_port is not None:
-        initial_params["serverUrl"] = server_url
-        initial_params["serverPort"] = server_port
-    else:
-        print("The default Server Name from the configuration file will be used "
-              "because neither 'server_name' nor ('server_url' and 'server_port') are specified!")
-    
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
-        
-def retrieve_data(url, library_name, dataset_name, server_name=None, repository_name="Foundation", 
-                    server_url=None, server_port=None, limit=100, offset=0, filter_=None, only_payload=False):
-    """Retrieves data from the dataset by a dataset name and a library name.
+    return get_default_client(url).sync_columns(library_name, dataset_name, store, watermark,
+                                                server_name=server_name, repository_name=repository_name,
+                                                server_url=server_url, server_port=server_port, filter_=filter_,
+                                                page_size=page_size, prefetch=prefetch, full=full)
+
+
+# RECONCILIATION *********************************************************************************************************
+def _scratch_name():
+    """This is an auxiliary function. It returns a random name for a scratch table."""
+
+
+    return "_SAS9API_" + os.urandom(6).hex().upper()
+
+
+def _sas_value_expression(column):
+    """This is an auxiliary function. It returns a SAS expression of the column value as a string."""
+
+
+    if column["type"] == "num":
+        return f"strip(put({column['name']}, best32.))"
+    return f"trim({column['name']})"
+
+
+def _sas_row_expression(columns):
+    """This is an auxiliary function. It returns a SAS expression of the values of the columns as
+       one string, the values separated with the unit separator character.
+    """
+
+
+    return " || '1F'x || ".join(map(_sas_value_expression, columns))
+
+
+def _sas_block_expression(key, blocks):
+    """This is an auxiliary function. It returns a SAS expression of the block number of a record
+       - the first 32 bits of the MD5 hash of the key value modulo the number of blocks.
+    """
+
+
+    return f"mod(input(put(md5({_sas_value_expression(key)}), $hex8.), hex8.), {blocks})"
+
+
+def reconcile_datasets(url, library_name, dataset_name, by_key, scratch_library, server_name=None,
+                       repository_name="Foundation", server_url=None, server_port=None, target_library_name=None,
+                       target_dataset_name=None, target_server_name=None, target_repository_name=None,
+                       target_server_url=None, target_server_port=None, blocks=1024, fetch_records=True):
+    """Compares a dataset with its copy, possibly on another workspace server, without retrieving
+       them. Generated DATA step and PROC SQL code is run on each server with execute_command: it
+       assigns every record to a block by the MD5 hash of its key and sums the record MD5 hashes
+       of every block into a small checksum table in the scratch library. Only the checksum tables
+       are retrieved, and then, if 'fetch_records' is True, only the records of the blocks whose
+       checksums differ. Scratch tables are deleted afterwards.
 
     Parameters
     ----------
     url : str
         The URL of the server with the installed SAS9API.
     library_name : str
-        Library name.
+        Library name of the source dataset.
     dataset_name : str
-        Dataset name.
+        Source dataset name.
+    by_key : str
+        Name of the key column used to assign records to blocks and to match them.
+    scratch_library : str
+        Library for the scratch tables. It must keep tables between requests, so the WORK library
+        of a pooled workspace server usually cannot be used.
     server_name : str (optional, the default Server Name from the configuration file will be used 
                        if neither 'server_name nor ('server_url' and 'server_port') are specified)
-        Workspace server name (default is None).
+        Workspace server name of the source dataset (default is None).
     repository_name : str, optional
         Repository name (default is 'Foundation').
     server_url : str (optional; must come in pair with 'server_port' if specified)
-        Workspace server URL (default is None).
+        Workspace server URL of the source dataset (default is None).
     server_port : int/str (optional; must come in pair with 'server_url' if specified)
-        Workspace server port (default is None).
+        Workspace server port of the source dataset (default is None).
         
     If 'server_name' and the pair ('server_url' and 'server_port') are both specified
     the request is made using 'server_name'.
     
-    limit : int
-        Number of records to retrieve (default is 100, maximum value is 10000).
-    offset : int
-        Dataset record offset (default is 0).
-    filter_ : string    
-        Dataset filter (JSON). Default is None.
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    target_library_name : str, optional
+        Library name of the copy (default is None - 'library_name').
+    target_dataset_name : str, optional
+        Dataset name of the copy (default is None - 'dataset_name').
+    target_server_name, target_server_url, target_server_port : optional
+        Workspace server of the copy, specified like the source server (default is None - the
+        source server).
+    target_repository_name : str, optional
+        Repository name of the copy (default is None - 'repository_name').
+    blocks : int, optional
+        Number of blocks (default is 1024). More blocks make the checksum tables larger and the
+        records retrieved for a difference fewer.
+    fetch_records : bool, optional
+        A flag which defines whether the records of the differing blocks are retrieved and compared
+        (default is True).
+
     Returns
     -------
-    dict/list
-        The server response (either full or truncated depending on the 'only_payload' flag) 
-        as a dictionary (full) or a list of records (truncated).
-        
-    Examples
+    dict
+        'blocks', 'differing_blocks' (block numbers), 'source_records' and 'target_records'
+        (numbers of records); if 'fetch_records' is True also 'missing' (source records missing
+        from the copy), 'extra' (records of the copy missing from the source) and 'changed' (pairs
+        of a source record and a list of records of the copy with the same key and other values).
+
+    Raises
+    ------
+    ValueError
+        If the datasets have different columns or no 'by_key' column.
+    RuntimeError
+        If the dataset information could not be retrieved or the SAS code failed.
+
+    Example
     -------
-        >>> retrieve_data(url, "sashelp", "buy", server_name="SASApp", only_payload=True)
-        [{'AMOUNT': -110000.0, 'DATE': '1996-01-01'},
-         {'AMOUNT': -1000.0, 'DATE': '1997-01-01'},
-         {'AMOUNT': -1000.0, 'DATE': '1998-01-01'},
-         {'AMOUNT': -51000.0, 'DATE': '1999-01-01'},
-         {'AMOUNT': -2000.0, 'DATE': '2000-01-01'},
-         {'AMOUNT': -2000.0, 'DATE': '2001-01-01'},
-         {'AMOUNT': -2000.0, 'DATE': '2002-01-01'},
-         {'AMOUNT': -2000.0, 'DATE': '2003-01-01'},
-         {'AMOUNT': -2000.0, 'DATE': '2004-01-01'},
-         {'AMOUNT': -2000.0, 'DATE': '2005-01-01'},
-         {'AMOUNT': 48000.0, 'DATE': '2006-01-01'}]
-         
-        >>> retrieve_data(url, "sashelp", "buy", server_name="SASApp", filter_='{"AMOUNT":-2000}', only_payload=True)
-        [{'AMOUNT': -2000.0, 'DATE': '2000-01-01'},
-         {'AMOUNT': -2000.0, 'DATE': '2001-01-01'},
-         {'AMOUNT': -2000.0, 'DATE': '2002-01-01'},
-         {'AMOUNT': -2000.0, 'DATE': '2003-01-01'},
-         {'AMOUNT': -2000.0, 'DATE': '2004-01-01'},
-         {'AMOUNT': -2000.0, 'DATE': '2005-01-01'}]
+        >>> result = reconcile_datasets(url, "mylib", "facts", "ID", "SCRATCH", server_name="SASApp",
+        ...                             target_server_name="SASAppDR")
+        >>> result["differing_blocks"], len(result["missing"])
+        ([17, 803], 2)
+    """
+
+
+    return get_default_client(url).reconcile_datasets(library_name, dataset_name, by_key, scratch_library,
+                                                      server_name=server_name, repository_name=repository_name,
+                                                      server_url=server_url, server_port=server_port,
+                                                      target_library_name=target_library_name,
+                                                      target_dataset_name=target_dataset_name,
+                                                      target_server_name=target_server_name,
+                                                      target_repository_name=target_repository_name,
+                                                      target_server_url=target_server_url,
+                                                      target_server_port=target_server_port, blocks=blocks,
+                                                      fetch_records=fetch_records)
+
+
+# QUERIES *********************************************************************************************************
+class Query:
+    """An aggregation query compiled to PROC SQL and run on the workspace server by 'run_query'.
+
+    The methods add clauses and return the query, so they can be chained. Column names are
+    checked against the dataset columns and values are converted to SAS literals when the query
+    is compiled, so no SAS code is taken from the caller.
+
+    Parameters
+    ----------
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+
+    Example
+    -------
+        >>> query = (Query("mylib", "sales")
+        ...          .where("YEAR", ">=", 2020)
+        ...          .where("REGION", "in", ["North", "South"])
+        ...          .group_by("REGION", "PRODUCT")
+        ...          .aggregate("TOTAL", "sum", "AMOUNT")
+        ...          .aggregate("N", "count")
+        ...          .order_by("TOTAL", descending=True))
+        >>> result = run_query(url, query, "SCRATCH", server_name="SASApp")
+        >>> result["TOTAL"][:3]
     """
 
-    
-    initial_params = {"limit": limit, "offset": offset}
-    
-    endpoint = f"sas/libraries/{library_name}/datasets/{dataset_name}/data"
-    
-    if filter_ is not None:
-        initial_params["filter"] = filter_
-    
-    if server_name is not None:
-        endpoint = f"sas/servers/{server_name}/libraries/{library_name}/datasets/{dataset_name}/data"
-        initial_params["repositoryName"] = repository_name
-    elif server_url is not None and server_port is not None:
-        initial_params["serverUrl"] = server_url
-        initial_params["serverPort"] = server_port
-    else:
-        print("The default Server Name from the configuration file will be used "
-              "because neither 'server_name' nor ('server_url' and 'server_port') are specified!")
-        
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
-    
-        
-def insert_data(url, library_name, dataset_name, json_data, server_name=None, repository_name="Foundation", 
-                    server_url=None, server_port=None, by_key=None, only_payload=False):
-    """Inserts data into the dataset or replaces data by a key.
-       The dataset column name ('by_key') is used to update all records with the 'by_key' value in this column.
+
+    # Aggregate functions and whether they need a numeric column
+    FUNCTIONS = {"count": False, "count_distinct": False, "n": False, "nmiss": False, "min": False,
+                 "max": False, "sum": True, "mean": True, "std": True, "var": True}
+    OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "in", "not in")
+
+    def __init__(self, library_name, dataset_name):
+        self.library_name = library_name
+        self.dataset_name = dataset_name
+        self.columns = []
+        self.conditions = []
+        self.groups = []
+        self.aggregates = []
+        self.order = []
+
+    def select(self, *columns):
+        """Adds columns to the result. With aggregates they must also be grouped by."""
+
+
+        self.columns.extend(columns)
+        return self
+
+    def where(self, column, operator_, value):
+        """Adds a condition; conditions are combined with AND. 'operator_' is one of OPERATORS;
+           'value' is a list for 'in' and 'not in', and None with '=' and '!=' matches missing values.
+        """
+
+
+        if operator_ not in self.OPERATORS:
+            raise ValueError(f"Unknown operator {operator_}, expected one of {', '.join(self.OPERATORS)}.")
+        self.conditions.append((column, operator_, value))
+        return self
+
+    def group_by(self, *columns):
+        """Adds columns to group by; they are also added to the result."""
+
+
+        self.groups.extend(columns)
+        return self
+
+    def aggregate(self, name, function, column=None):
+        """Adds an aggregate 'function' (one of FUNCTIONS) of 'column' to the result as 'name'.
+           'column' may be omitted for 'count' to count records.
+        """
+
+
+        if function not in self.FUNCTIONS:
+            raise ValueError(f"Unknown function {function}, expected one of {', '.join(self.FUNCTIONS)}.")
+        if column is None and function != "count":
+            raise ValueError(f"Function {function} requires a column.")
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]{0,31}", name):
+            raise ValueError(f"{name} is not a valid SAS column name.")
+        self.aggregates.append((name, function, column))
+        return self
+
+    def order_by(self, *columns, descending=False):
+        """Orders the result by columns or aggregate names."""
+
+
+        self.order.extend((column, descending) for column in columns)
+        return self
+
+    def compile(self, columns, table):
+        """Returns the PROC SQL code creating 'table' with the result of the query.
+
+        Parameters
+        ----------
+        columns : list
+            The 'columns' of the 'get_dataset_info' payload of the dataset.
+        table : str
+            Name of the result table including the library.
+
+        Returns
+        -------
+        str
+            SAS code.
+
+        Raises
+        ------
+        ValueError
+            If the query refers to unknown columns, aggregates character columns with a numeric
+            function, selects columns which are not grouped by or selects nothing.
+        """
+
+
+        known = {column["name"].upper(): column for column in columns}
+
+        def resolve(name):
+            if name.upper() not in known:
+                raise ValueError(f"{self.library_name}.{self.dataset_name} has no column {name}.")
+            return known[name.upper()]
+
+        groups = [resolve(name)["name"] for name in self.groups]
+        selected = groups + [resolve(name)["name"] for name in self.columns
+                             if name.upper() not in map(str.upper, groups)]
+        if self.aggregates and len(selected) > len(groups):
+            # SAS would remerge the aggregates with every record instead of failing
+            raise ValueError("Selected columns must be grouped by in a query with aggregates.")
+        items = list(selected)
+        for name, function, column in self.aggregates:
+            if column is None:
+                items.append(f"count(*) as {name}")
+                continue
+            column = resolve(column)
+            if self.FUNCTIONS[function] and column["type"] != "num":
+                raise ValueError(f"Function {function} requires a numeric column, {column['name']} is not.")
+            if function == "count_distinct":
+                items.append(f"count(distinct {column['name']}) as {name}")
+            else:
+                items.append(f"{function}({column['name']}) as {name}")
+        if not items:
+            raise ValueError("The query selects nothing.")
+
+        conditions = []
+        for name, operator_, value in self.conditions:
+            column = resolve(name)
+            if operator_ in ("in", "not in"):
+                values = list(value)
+                if not values:
+                    raise ValueError(f"The values of {name} {operator_} are empty.")
+                literals = ", ".join(_sas_literal(item, column["type"]) for item in values)
+                conditions.append(f"{column['name']} {operator_} ({literals})")
+            elif value is None and operator_ in ("=", "!="):
+                conditions.append(f"{column['name']} is {'not ' if operator_ == '!=' else ''}missing")
+            else:
+                sas_operator = "ne" if operator_ == "!=" else operator_
+                conditions.append(f"{column['name']} {sas_operator} {_sas_literal(value, column['type'])}")
+
+        names = {name.upper() for name in selected} | {name.upper() for name, _, _ in self.aggregates}
+        order = []
+        for name, descending in self.order:
+            if name.upper() not in names:
+                raise ValueError(f"Cannot order by {name}, it is not in the result.")
+            order.append(f"{name}{' desc' if descending else ''}")
+
+        lines = ["proc sql;", f"  create table {table} as", f"  select {', '.join(items)}",
+                 f"  from {self.library_name}.{self.dataset_name}"]
+        if conditions:
+            lines.append(f"  where {' and '.join(conditions)}")
+        if groups:
+            lines.append(f"  group by {', '.join(groups)}")
+        if order:
+            lines.append(f"  order by {', '.join(order)}")
+        lines[-1] += ";"
+        lines.append("quit;")
+        return "\n".join(lines) + "\n"
+
+
+def run_query(url, query, scratch_library, server_name=None, repository_name="Foundation", server_url=None,
+              server_port=None, as_columns=True):
+    """Runs an aggregation query on the workspace server and retrieves only its result. The query
+       is compiled to PROC SQL, executed with execute_command into a table in the scratch library,
+       and the table is retrieved and deleted. This function requires the `numpy` module unless
+       'as_columns' is False.
 
     Parameters
     ----------
     url : str
         The URL of the server with the installed SAS9API.
-    library_name : str
-        Library name.
-    dataset_name : str
-        Dataset name.
-    json_data : list
-        Data to insert (see an example below).
+    query : Query
+        The query.
+    scratch_library : str
+        Library for the result table. It must keep tables between requests, so the WORK library of
+        a pooled workspace server usually cannot be used.
     server_name : str (optional, the default Server Name from the configuration file will be used 
                        if neither 'server_name nor ('server_url' and 'server_port') are specified)
         Workspace server name (default is None).
@@ -1078,53 +5492,456 @@ def insert_data(url, library_name, dataset_name, json_data, server_name=None, re
     If 'server_name' and the pair ('server_url' and 'server_port') are both specified
     the request is made using 'server_name'.
     
-    by_key : str
-        Dataset key for record matching (default is None).
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    as_columns : bool, optional
+        A flag which defines the result format (default is True). If True - the result is returned
+        as one masked NumPy array per column, typed like in retrieve_columns. If False - as records.
+
     Returns
     -------
-    dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
-        
+    dict/list
+        Masked arrays by column name or a list of records.
+
+    Raises
+    ------
+    ValueError
+        If the query is invalid for the dataset columns.
+    RuntimeError
+        If the dataset information could not be retrieved or the SAS code failed.
+
     Example
     -------
-        >>> insert_data(url, "mylib", "class", [{"Name": "Bill", "Sex": "M"}, {"Name":"John", "Sex": "M"}], 
-                        server_name="SASApp", only_payload=True)
-        {'status': 200,
-         'error': None,
-         'payload': {'itemsInserted': 2, 'itemsRemoved': 0, 'itemsUpdated': None}}
+        >>> query = Query("mylib", "sales").group_by("REGION").aggregate("TOTAL", "sum", "AMOUNT")
+        >>> run_query(url, query, "SCRATCH", server_name="SASApp", as_columns=False)
+        [{'REGION': 'North', 'TOTAL': 1520.5}, {'REGION': 'South', 'TOTAL': 980.0}]
     """
 
-    
-    initial_params = dict()
-    if by_key is not None:
-        initial_params["byKey"] = by_key
-        
-    endpoint = f"sas/libraries/{library_name}/datasets/{dataset_name}/data"
-    
-    if server_name is not None:
-        endpoint = f"sas/servers/{server_name}/libraries/{library_name}/datasets/{dataset_name}/data"
-        initial_params["repositoryName"] = repository_name
-    elif server_url is not None and server_port is not None:
-        initial_params["serverUrl"] = server_url
-        initial_params["serverPort"] = server_port
-    else:
-        print("The default Server Name from the configuration file will be used "
-              "because neither 'server_name' nor ('server_url' and 'server_port') are specified!")
-    
-    return make_request("PUT", assemble_url(url, endpoint),
-                       initial_params=initial_params, 
-                       json_data=json_data, only_payload=only_payload)
 
-        
-def replace_all_data(url, library_name, dataset_name, json_data, server_name=None, repository_name="Foundation", 
-                    server_url=None, server_port=None, only_payload=False):
-    """Replaces all data in the dataset with input data.
-       
+    return get_default_client(url).run_query(query, scratch_library, server_name=server_name,
+                                             repository_name=repository_name, server_url=server_url,
+                                             server_port=server_port, as_columns=as_columns)
+
+
+# FILTERS *********************************************************************************************************
+class Predicate:
+    """A condition on the records of a dataset, built with 'col' and combined with '&', '|' and '~'.
+
+    A Predicate can be passed as 'filter_' to iter_data and the functions based on it. The column
+    names and the types of the values are checked against the 'get_dataset_info' columns. The
+    conditions in SERVER_OPERATORS, combined with AND and OR, are compiled to the server filter
+    so that fewer records are transferred. The rest - string matching, negation, date values and
+    OR with such conditions - is evaluated on every retrieved page with NumPy arrays.
+
+    Like in SAS, a missing value is smaller than any other value, and 'col(name) == None' matches
+    missing values.
+
+    Example
+    -------
+        >>> predicate = (col("AMOUNT") >= 1000) & col("REGION").isin(["North", "South"]) \\
+        ...             & ~col("NAME").startswith("TEST")
+        >>> records = list(iter_data(url, "mylib", "sales", server_name="SASApp", filter_=predicate))
+    """
+
+
+    # Operators of the server filter, as used in the filter JSON
+    SERVER_OPERATORS = {"=": None, "!=": "$ne", "<": "$lt", "<=": "$lte", ">": "$gt", ">=": "$gte",
+                        "in": "$in", "and": "$and", "or": "$or"}
+    COMPARISONS = {"=": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le,
+                   ">": operator.gt, ">=": operator.ge}
+
+    def __init__(self, operator_, column=None, value=None, children=()):
+        self.operator = operator_
+        self.column = column
+        self.value = value
+        self.children = tuple(children)
+
+    def _combine(self, operator_, other):
+        if not isinstance(other, Predicate):
+            return NotImplemented
+        children = []
+        for predicate in (self, other):
+            children.extend(predicate.children if predicate.operator == operator_ else [predicate])
+        return Predicate(operator_, children=children)
+
+    def __and__(self, other):
+        return self._combine("and", other)
+
+    def __or__(self, other):
+        return self._combine("or", other)
+
+    def __invert__(self):
+        return Predicate("not", children=[self])
+
+    def __bool__(self):
+        raise TypeError("Combine predicates with '&', '|' and '~' instead of 'and', 'or' and 'not', "
+                        "and compare a column with one value at a time.")
+
+    def __repr__(self):
+        if self.operator in ("and", "or"):
+            return "(" + f" {'&' if self.operator == 'and' else '|'} ".join(map(repr, self.children)) + ")"
+        if self.operator == "not":
+            return f"~{self.children[0]!r}"
+        if self.operator in self.COMPARISONS:
+            return f"(col({self.column!r}) {'==' if self.operator == '=' else self.operator} {self.value!r})"
+        return f"col({self.column!r}).{'isin' if self.operator == 'in' else self.operator}({self.value!r})"
+
+    def _columns(self):
+        """Returns the set of the column names the predicate refers to."""
+
+
+        if self.children:
+            return set().union(*(child._columns() for child in self.children))
+        return {self.column}
+
+    def _key(self):
+        """Returns a hashable tuple of the structure of the predicate, equal for equal predicates."""
+
+
+        value = tuple(self.value) if self.operator == "in" else self.value
+        return self.operator, self.column, value, tuple(child._key() for child in self.children)
+
+    def bind(self, columns):
+        """Returns the predicate with the column names of the dataset after checking that the
+           columns exist and the values have their types.
+
+        Parameters
+        ----------
+        columns : list
+            The 'columns' of the 'get_dataset_info' payload.
+
+        Returns
+        -------
+        Predicate
+            The checked predicate.
+
+        Raises
+        ------
+        ValueError
+            If a column does not exist or a value does not match the column type.
+        """
+
+
+        if self.children:
+            return Predicate(self.operator, children=[child.bind(columns) for child in self.children])
+        column = next((column for column in columns if column["name"].upper() == self.column.upper()), None)
+        if column is None:
+            raise ValueError(f"The dataset has no column {self.column}.")
+        values = self.value if self.operator == "in" else [self.value]
+        if self.operator in ("startswith", "contains") and column["type"] != "char":
+            raise ValueError(f"{self!r} requires a character column, {column['name']} is numeric.")
+        for value in values:
+            if value is None:
+                if self.operator not in ("=", "!=", "in"):
+                    raise ValueError(f"{self!r} cannot compare with a missing value.")
+            elif column["type"] == "num":
+                if isinstance(value, bool) or not isinstance(value, (int, float, datetime.date)):
+                    raise ValueError(f"{self!r} compares the numeric column {column['name']} with {value!r}.")
+            elif not isinstance(value, str):
+                raise ValueError(f"{self!r} compares the character column {column['name']} with {value!r}.")
+        return Predicate(self.operator, column["name"], self.value)
+
+    def _pushable(self):
+        if self.children:
+            return self.operator in self.SERVER_OPERATORS and all(child._pushable() for child in self.children)
+        values = self.value if self.operator == "in" else [self.value]
+        # Dates are formatted by the server and missing values are not supported by the filter, so
+        # both are compared with the retrieved values
+        return (self.operator in self.SERVER_OPERATORS
+                and not any(value is None or isinstance(value, datetime.date) for value in values))
+
+    def _to_filter(self):
+        if self.children:
+            return {self.SERVER_OPERATORS[self.operator]: [child._to_filter() for child in self.children]}
+        if self.operator == "=":
+            return {self.column: self.value}
+        if self.operator == "in":
+            return {self.column: {"$in": list(self.value)}}
+        return {self.column: {self.SERVER_OPERATORS[self.operator]: self.value}}
+
+    def split(self):
+        """Splits a bound predicate into the server filter and the residual predicate.
+
+        Returns
+        -------
+        tuple
+            The filter as a dictionary (None if no condition is supported by the server) and the
+            Predicate to evaluate on the client (None if the server evaluates everything).
+        """
+
+
+        conditions = self.children if self.operator == "and" else (self,)
+        server = [condition._to_filter() for condition in conditions if condition._pushable()]
+        residual = [condition for condition in conditions if not condition._pushable()]
+        if not residual:
+            residual = None
+        elif len(residual) == 1:
+            residual = residual[0]
+        else:
+            residual = Predicate("and", children=residual)
+        return _and_filters(*server), residual
+
+    def evaluate(self, columns):
+        """Evaluates a bound predicate over columns.
+
+        Parameters
+        ----------
+        columns : dict
+            Pairs (values, missing) of NumPy arrays by column name, as returned by '_page_to_columns'.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array, True for the matching records.
+        """
+
+
+        if self.operator == "and":
+            return np.logical_and.reduce([child.evaluate(columns) for child in self.children])
+        if self.operator == "or":
+            return np.logical_or.reduce([child.evaluate(columns) for child in self.children])
+        if self.operator == "not":
+            return ~self.children[0].evaluate(columns)
+
+        values, missing = columns[self.column]
+        if values.dtype.kind == "f":
+            comparable = np.where(missing, -np.inf, values)
+        elif values.dtype.kind == "M":
+            comparable = np.where(missing, np.iinfo(np.int64).min, values.astype("int64"))
+        else:
+            comparable = np.where(missing, "", values).astype(str)
+
+        def convert(value):
+            if values.dtype.kind == "M":
+                if not isinstance(value, datetime.date):
+                    raise ValueError(f"{self!r} compares the date column {self.column} with a number.")
+                return np.datetime64(value, "ms").astype("int64")
+            if values.dtype.kind == "f" and isinstance(value, datetime.date):
+                if missing.all():
+                    # Without a format a column of missing values cannot be told from a date
+                    # column, and missing values are smaller than any date
+                    return 0.0
+                raise ValueError(f"{self!r} compares the numeric column {self.column} with a date.")
+            return value
+
+        if self.operator == "startswith":
+            return np.char.startswith(comparable, self.value)
+        if self.operator == "contains":
+            return np.char.find(comparable, self.value) >= 0
+        if self.operator == "in":
+            present = [convert(value) for value in self.value if value is not None]
+            result = np.isin(comparable, present) & ~missing
+            return result | missing if None in self.value else result
+        if self.value is None:
+            return missing.copy() if self.operator == "=" else ~missing
+        return self.COMPARISONS[self.operator](comparable, convert(self.value))
+
+
+class _Column:
+    """A column reference which builds predicates with comparison operators. See 'col'."""
+
+
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, value):
+        return Predicate("=", self.name, value)
+
+    def __ne__(self, value):
+        return Predicate("!=", self.name, value)
+
+    def __lt__(self, value):
+        return Predicate("<", self.name, value)
+
+    def __le__(self, value):
+        return Predicate("<=", self.name, value)
+
+    def __gt__(self, value):
+        return Predicate(">", self.name, value)
+
+    def __ge__(self, value):
+        return Predicate(">=", self.name, value)
+
+    __hash__ = None
+
+    def isin(self, values):
+        """Matches values in a list; None in the list matches missing values."""
+
+
+        return Predicate("in", self.name, list(values))
+
+    def between(self, lower, upper):
+        """Matches values from 'lower' to 'upper' inclusive."""
+
+
+        return (self >= lower) & (self <= upper)
+
+    def is_missing(self):
+        """Matches missing values."""
+
+
+        return Predicate("=", self.name, None)
+
+    def startswith(self, prefix):
+        """Matches character values starting with the prefix; evaluated on the client."""
+
+
+        return Predicate("startswith", self.name, prefix)
+
+    def contains(self, text):
+        """Matches character values containing the text; evaluated on the client."""
+
+
+        return Predicate("contains", self.name, text)
+
+
+def col(name):
+    """Returns a reference to a dataset column for building a Predicate for 'filter_'.
+
+    Parameters
+    ----------
+    name : str
+        Column name (case-insensitive).
+
+    Returns
+    -------
+    _Column
+        Column reference supporting ==, !=, <, <=, >, >= and the methods isin, between,
+        is_missing, startswith and contains.
+
+    Example
+    -------
+        >>> predicate = (col("AGE").between(12, 14) | (col("SEX") == "F")) \\
+        ...             & (col("BIRTH") >= datetime.date(2000, 1, 1))
+        >>> retrieve_columns(url, "mylib", "class", server_name="SASApp", filter_=predicate)
+    """
+
+
+    return _Column(name)
+
+
+# SPOOLING *********************************************************************************************************
+class SpooledPages:
+    """Undecoded pages of a dataset written by spool_pages, read through memory maps.
+
+    The directory holds one file per page with the response body as received - numbered JSON
+    files that can also be shipped or parsed elsewhere - and a manifest.json describing the
+    extract: the dataset, the filter, the 'get_dataset_info' payload at the time of the download
+    and the offset and size of every page.
+
+    Parameters
+    ----------
+    directory : str
+        Directory written by spool_pages.
+
+    Raises
+    ------
+    ValueError
+        If the directory holds no complete extract.
+
+    Example
+    -------
+        >>> pages = SpooledPages("/data/extracts/big")
+        >>> for record in pages.records(row_format="tuple"):
+        ...     process(record)
+    """
+
+
+    MANIFEST = "manifest.json"
+    PAGE_FILE = re.compile(r"page-\d{6,}\.json")
+
+    def __init__(self, directory):
+        self.directory = directory
+        path = os.path.join(directory, self.MANIFEST)
+        if not os.path.exists(path):
+            raise ValueError(f"{directory} holds no complete extract.")
+        with open(path, encoding="utf-8") as file:
+            self.manifest = json.load(file)
+
+    @staticmethod
+    def page_file(index):
+        """Returns the name of the file of the page with the index."""
+
+
+        return f"page-{index:06d}.json"
+
+    @classmethod
+    def write_manifest(cls, directory, identity, pages):
+        """Removes the page files which are not listed in 'pages', writes the manifest of the
+           dataset 'identity' and the pages, and returns the reader of the directory.
+        """
+
+
+        names = {page["file"] for page in pages}
+        for name in os.listdir(directory):
+            if cls.PAGE_FILE.fullmatch(name) and name not in names:
+                os.remove(os.path.join(directory, name))
+        _write_json(os.path.join(directory, cls.MANIFEST), dict(identity, pages=pages))
+        return cls(directory)
+
+    @property
+    def info(self):
+        """The 'get_dataset_info' payload of the dataset at the time of the download."""
+
+
+        return self.manifest["info"]
+
+    def __len__(self):
+        return len(self.manifest["pages"])
+
+    def _columns(self, row_format):
+        """Returns the column names of the records in the row format, from the dataset information."""
+
+
+        if row_format == "dict":
+            return None
+        return _column_names(self.info, self.manifest["library_name"], self.manifest["dataset_name"])
+
+    def map(self, index):
+        """Returns a read-only memory map of the response body of the page with the index.
+           Pages are written whole, so an empty body is never mapped (mmap cannot map empty files).
+        """
+
+
+        with open(os.path.join(self.directory, self.manifest["pages"][index]["file"]), "rb") as file:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def records(self, row_format="dict", chunk_size=1024 * 1024):
+        """Yields the records of all pages, decoding every memory-mapped page incrementally, so
+           the memory used does not depend on the page size. 'row_format' is 'dict', 'tuple' or
+           'slots', see retrieve_data.
+        """
+
+
+        columns = self._columns(row_format)
+        for index in range(len(self)):
+            decoder = _RowDecoder(row_format, columns)
+            hook = None if row_format == "dict" else decoder
+            with self.map(index) as mapped:
+                chunks = (mapped[start:start + chunk_size] for start in range(0, len(mapped), chunk_size))
+                yield from _iter_json_array(chunks, "payload", hook)
+
+    def pages(self, row_format="dict"):
+        """Yields the records of every page as a list (a Rows list for the 'tuple' and 'slots' formats)."""
+
+
+        columns = self._columns(row_format)
+        for index in range(len(self)):
+            decoder = _RowDecoder(row_format, columns)
+            with self.map(index) as mapped:
+                yield decoder.decode(mapped[:])["payload"]
+
+
+def spool_pages(url, library_name, dataset_name, directory, server_name=None, repository_name="Foundation",
+                server_url=None, server_port=None, page_size=10000, filter_=None, max_workers=1,
+                chunk_size=1024 * 1024):
+    """Downloads the dataset by a dataset name and a library name to a directory without decoding
+       it. The response body of every page is streamed to a numbered file in chunks of
+       'chunk_size' bytes, and a manifest is written when all pages are complete, so the download
+       is bound by the network and the disk only. The pages can be read later with SpooledPages or
+       shipped elsewhere as they are.
+
+       The pages cover the 'objectsNumber' records reported by 'get_dataset_info'; with a filter
+       the trailing pages may be empty.
+
     Parameters
     ----------
     url : str
@@ -1133,8 +5950,9 @@ def replace_all_data(url, library_name, dataset_name, json_data, server_name=Non
         Library name.
     dataset_name : str
         Dataset name.
-    json_data : list
-        Data to replace (see an example below).
+    directory : str
+        Directory for the page files and the manifest. It is created if missing; page files of a
+        previous download are replaced.
     server_name : str (optional, the default Server Name from the configuration file will be used 
                        if neither 'server_name nor ('server_url' and 'server_port') are specified)
         Workspace server name (default is None).
@@ -1148,49 +5966,539 @@ def replace_all_data(url, library_name, dataset_name, json_data, server_name=Non
     If 'server_name' and the pair ('server_url' and 'server_port') are both specified
     the request is made using 'server_name'.
     
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
+    page_size : int, optional
+        Number of records to retrieve per request (default is 10000, maximum value is 10000).
+    filter_ : string/Predicate, optional
+        Dataset filter (JSON) or a Predicate built with 'col' which the server supports entirely
+        (default is None).
+    max_workers : int, optional
+        Number of pages downloaded concurrently (default is 1).
+    chunk_size : int, optional
+        Size of the chunks written to the files in bytes (default is 1 MiB).
+
     Returns
     -------
-    dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
-        
+    SpooledPages
+        The reader of the downloaded pages.
+
+    Raises
+    ------
+    ValueError
+        If the server does not support the whole Predicate 'filter_'.
+    RuntimeError
+        If the dataset information or a page could not be retrieved.
+
+    Example
+    -------
+        >>> pages = spool_pages(url, "mylib", "big", "/data/extracts/big", server_name="SASApp", max_workers=4)
+        >>> len(pages), pages.manifest["pages"][0]
+        (120, {'file': 'page-000000.json', 'offset': 0, 'limit': 10000, 'bytes': 2315876})
+    """
+
+
+    return get_default_client(url).spool_pages(library_name, dataset_name, directory, server_name=server_name,
+                                               repository_name=repository_name, server_url=server_url,
+                                               server_port=server_port, page_size=page_size, filter_=filter_,
+                                               max_workers=max_workers, chunk_size=chunk_size)
+
+
+class ExtractionJob:
+    """A resumable download of the undecoded pages of a dataset into a directory, like spool_pages.
+
+    The job keeps a checkpoint file in the directory with the identity of the dataset, its
+    'modificationDate' and number of records, and the offset ranges of the pages already written.
+    The checkpoint is updated after every page, so a job run again after a failure or a restart
+    downloads only the missing pages. A job refuses to resume, and a running job stops, when the
+    dataset was modified, since pages of two versions cannot be combined; run it with 'restart'
+    to start over.
+
+    Parameters
+    ----------
+    directory : str
+        Directory for the page files, the checkpoint and the manifest.
+    url : str
+        The URL of the server with the installed SAS9API.
+    library_name : str
+        Library name.
+    dataset_name : str
+        Dataset name.
+    server_name, repository_name, server_url, server_port : optional
+        Workspace server, see spool_pages.
+    filter_ : string, optional
+        Dataset filter (JSON). Default is None. A Predicate raises TypeError.
+    page_size : int, optional
+        Number of records to retrieve per request (default is 10000, maximum value is 10000).
+    max_workers : int, optional
+        Number of pages downloaded concurrently (default is 1).
+    chunk_size : int, optional
+        Size of the chunks written to the files in bytes (default is 1 MiB).
+    start : int, optional
+        Offset of the first record to download (default is 0).
+    stop : int, optional
+        Offset after the last record to download (default is None - the end of the dataset).
+    client : SAS9APIClient, optional
+        Client making the requests (default is None - the default client of 'url').
+
+    Example
+    -------
+        >>> job = ExtractionJob("/data/extracts/big", url, "mylib", "big", server_name="SASApp", max_workers=4)
+        >>> pages = job.run(progress=lambda job: print(job.completed_records, "of", job.total_records))
+    """
+
+
+    CHECKPOINT = "checkpoint.json"
+
+    def __init__(self, directory, url, library_name, dataset_name, server_name=None, repository_name="Foundation",
+                 server_url=None, server_port=None, filter_=None, page_size=10000, max_workers=1,
+                 chunk_size=1024 * 1024, start=0, stop=None, client=None):
+        if isinstance(filter_, Predicate):
+            raise TypeError("The filter of an ExtractionJob is kept in its checkpoint, so it must be JSON; "
+                            "use plan_extraction or spool_pages for a Predicate.")
+        self.directory = directory
+        self.url = url
+        self.client = client
+        self.server = {"server_name": server_name, "repository_name": repository_name,
+                       "server_url": server_url, "server_port": server_port}
+        self.identity = {"url": url, "library_name": library_name, "dataset_name": dataset_name,
+                         "server": self.server, "filter": filter_, "page_size": page_size,
+                         "start": start, "stop": stop}
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.checkpoint = self._load()
+
+    @property
+    def _checkpoint_path(self):
+        return os.path.join(self.directory, self.CHECKPOINT)
+
+    def _load(self):
+        if not os.path.exists(self._checkpoint_path):
+            return None
+        with open(self._checkpoint_path, encoding="utf-8") as file:
+            checkpoint = json.load(file)
+        if checkpoint["identity"] != self.identity:
+            raise ValueError(f"{self.directory} holds a job for another dataset, filter or page size.")
+        return checkpoint
+
+    def _stop(self, info):
+        stop = self.identity["stop"]
+        return info["objectsNumber"] if stop is None else min(stop, info["objectsNumber"])
+
+    @property
+    def total_records(self):
+        """Number of records to download, as of the start of the job (None before the first run)."""
+
+
+        if self.checkpoint is None:
+            return None
+        return max(self._stop(self.checkpoint["info"]) - self.identity["start"], 0)
+
+    @property
+    def completed_records(self):
+        """Number of records in the offset ranges of the written pages."""
+
+
+        if self.checkpoint is None:
+            return 0
+        stop = self._stop(self.checkpoint["info"])
+        return sum(min(end, stop) - start for start, end in self.checkpoint["completed"])
+
+    @property
+    def complete(self):
+        """A flag which defines whether all pages are written."""
+
+
+        return self.checkpoint is not None and self.checkpoint.get("complete", False)
+
+    def _changed(self, info, checkpoint):
+        return (info.get("modificationDate") != checkpoint["info"].get("modificationDate")
+                or info.get("objectsNumber") != checkpoint["info"].get("objectsNumber"))
+
+    def run(self, restart=False, progress=None, cancel=None):
+        """Downloads the missing pages and writes the manifest when all pages are written.
+
+        Parameters
+        ----------
+        restart : bool, optional
+            A flag which discards the checkpoint and the written pages (default is False).
+        progress : callable, optional
+            A function called with the job after every written page (default is None).
+        cancel : threading.Event, optional
+            An event which, once set, stops the downloads in progress and the job with
+            RuntimeError without writing the checkpoint again (default is None).
+
+        Returns
+        -------
+        SpooledPages
+            The reader of the downloaded pages.
+
+        Raises
+        ------
+        RuntimeError
+            If the dataset was modified since the job started, the dataset information or a page
+            could not be retrieved, or the job was cancelled. The pages written so far are kept
+            unless the dataset changed.
+        """
+
+
+        def check_cancelled():
+            if cancel is not None and cancel.is_set():
+                raise RuntimeError(f"The extraction job in {self.directory} was cancelled.")
+
+        client = self.client or get_default_client(self.url)
+        library_name = self.identity["library_name"]
+        dataset_name = self.identity["dataset_name"]
+        page_size = self.identity["page_size"]
+        info = client._fresh_dataset_info(library_name, dataset_name, self.server)
+        if info is None or info.get("objectsNumber") is None:
+            raise RuntimeError(f"Failed to get the number of records of {library_name}.{dataset_name}.")
+
+        os.makedirs(self.directory, exist_ok=True)
+        if restart:
+            self.checkpoint = None
+            for name in os.listdir(self.directory):
+                if SpooledPages.PAGE_FILE.fullmatch(name) or name in (self.CHECKPOINT, SpooledPages.MANIFEST):
+                    os.remove(os.path.join(self.directory, name))
+        if self.checkpoint is not None and self._changed(info, self.checkpoint):
+            raise RuntimeError(f"{library_name}.{dataset_name} was modified since the job started "
+                               f"({self.checkpoint['info'].get('modificationDate')} -> "
+                               f"{info.get('modificationDate')}); run the job with 'restart' to start over.")
+        if self.checkpoint is None:
+            self.checkpoint = {"identity": self.identity, "info": info, "completed": [], "complete": False}
+            check_cancelled()
+            _write_json(self._checkpoint_path, self.checkpoint)
+        # Leftovers of interrupted downloads of this process; other processes may still be writing theirs
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp") and (restart or f".{_worker_name()}." in name):
+                os.remove(os.path.join(self.directory, name))
+
+        stop = self._stop(info)
+        offsets = range(self.identity["start"], stop, page_size)
+        done = self.checkpoint["completed"]
+        pending = (item for item in enumerate(offsets)
+                   if not any(start <= item[1] < end for start, end in done))
+
+        def download(indexed_offset):
+            index, page_offset = indexed_offset
+            check_cancelled()
+            client._download_page(library_name, dataset_name, self.server, page_offset,
+                                  min(page_size, stop - page_offset), self.identity["filter"],
+                                  os.path.join(self.directory, SpooledPages.page_file(index)), self.chunk_size,
+                                  cancel)
+
+        for (_, page_offset), _ in _iter_concurrently(download, pending, self.max_workers, ordered=False):
+            check_cancelled()
+            self.checkpoint["completed"] = _add_range(self.checkpoint["completed"], page_offset,
+                                                      min(page_offset + page_size, stop))
+            _write_json(self._checkpoint_path, self.checkpoint)
+            if progress is not None:
+                progress(self)
+
+        # Pages retrieved while the dataset was being modified may mix two versions
+        info = client._fresh_dataset_info(library_name, dataset_name, self.server)
+        if info is None or self._changed(info, self.checkpoint):
+            raise RuntimeError(f"{library_name}.{dataset_name} was modified while the job was running; "
+                               f"run the job with 'restart' to start over.")
+        pages = []
+        for index, page_offset in enumerate(offsets):
+            name = SpooledPages.page_file(index)
+            pages.append({"file": name, "offset": page_offset, "limit": min(page_size, stop - page_offset),
+                          "bytes": os.path.getsize(os.path.join(self.directory, name))})
+        check_cancelled()
+        spooled = SpooledPages.write_manifest(self.directory, dict(self.identity, info=self.checkpoint["info"]),
+                                              pages)
+        self.checkpoint["complete"] = True
+        _write_json(self._checkpoint_path, self.checkpoint)
+        return spooled
+
+
+def _add_range(ranges, start, end):
+    """This is an auxiliary function. It adds the range [start, end) to a sorted list of disjoint
+       ranges, merging adjacent and overlapping ones, and returns the new list.
+    """
+
+
+    result = []
+    for range_start, range_end in sorted(ranges + [[start, end]]):
+        if result and range_start <= result[-1][1]:
+            result[-1][1] = max(result[-1][1], range_end)
+        else:
+            result.append([range_start, range_end])
+    return result
+
+
+# SHARDING *************************************************************************************************************
+
+
+def _worker_name():
+    """This is an auxiliary function. It returns the default name of an extraction worker."""
+
+
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class ExtractionPlan:
+    """A dataset split into shards of record offsets, extracted by independent workers.
+
+    The plan is a directory on storage shared by the workers (e.g. a network file system),
+    written by plan_extraction. A worker claims a shard by creating its lock file exclusively, so
+    every shard is downloaded by one worker at a time without a coordinator, and downloads it as
+    an ExtractionJob in the shard directory; a failed shard can be claimed again and resumes from
+    its checkpoint. When all shards are complete, merge combines their pages into one extract
+    readable with SpooledPages. Shards refuse to download once the dataset differs from the
+    planned version; such a dataset needs a new plan.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the plan.
+    client : SAS9APIClient, optional
+        Client making the requests of the worker (default is None - the default client of the url
+        of the plan).
+
+    Raises
+    ------
+    ValueError
+        If the directory holds no plan.
+
     Example
     -------
-        >>> replace_all_data(url, "mylib", "class", [{"Name":"A"},{"Age":45}], server_name="SASApp", only_payload=False)
-        
-        {'status': 200,
-         'error': None,
-         'payload': {'itemsInserted': 2, 'itemsRemoved': 21, 'itemsUpdated': None}}
+        On every worker host:
+
+        >>> plan = ExtractionPlan("/shared/extracts/big")
+        >>> plan.work(max_workers=4)
+        ['shard-000002', 'shard-000005']
+
+        On any host when the work is done:
+
+        >>> pages = plan.merge()
     """
 
-    
-    initial_params = dict()
-    
-    endpoint = f"sas/libraries/{library_name}/datasets/{dataset_name}/data"
-    
-    if server_name is not None:
-        endpoint = f"sas/servers/{server_name}/libraries/{library_name}/datasets/{dataset_name}/data"
-        initial_params["repositoryName"] = repository_name
-    elif server_url is not None and server_port is not None:
-        initial_params["serverUrl"] = server_url
-        initial_params["serverPort"] = server_port
-    else:
-        print("The default Server Name from the configuration file will be used "
-              "because neither 'server_name' nor ('server_url' and 'server_port') are specified!")
-        
-    return make_request("POST", assemble_url(url, endpoint),
-                       initial_params=initial_params,  
-                       json_data=json_data, only_payload=only_payload)
 
+    PLAN = "plan.json"
+
+    def __init__(self, directory, client=None):
+        self.directory = directory
+        self.client = client
+        path = os.path.join(directory, self.PLAN)
+        if not os.path.exists(path):
+            raise ValueError(f"{directory} holds no extraction plan.")
+        with open(path, encoding="utf-8") as file:
+            self.plan = json.load(file)
+
+    @property
+    def shards(self):
+        """The shards of the plan: dictionaries with the keys 'id', 'offset' and 'limit'."""
+
+
+        return self.plan["shards"]
+
+    def _lock_path(self, shard):
+        return os.path.join(self.directory, "claims", f"{shard['id']}.lock")
+
+    def _job(self, shard, max_workers=1):
+        identity = self.plan["identity"]
+        server = identity["server"]
+        return ExtractionJob(os.path.join(self.directory, "shards", shard["id"]), identity["url"],
+                             identity["library_name"], identity["dataset_name"], server_name=server["server_name"],
+                             repository_name=server["repository_name"], server_url=server["server_url"],
+                             server_port=server["server_port"], filter_=identity["filter"],
+                             page_size=identity["page_size"], max_workers=max_workers,
+                             start=shard["offset"], stop=shard["offset"] + shard["limit"], client=self.client)
+
+    def _owner(self, shard):
+        """Returns the name of the worker which claimed the shard or None if it is not claimed."""
+
+
+        try:
+            with open(self._lock_path(shard), encoding="utf-8") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def status(self):
+        """Returns a dictionary with the state of every shard: 'complete', 'claimed by <worker>' or 'pending'."""
+
+
+        result = {}
+        for shard in self.shards:
+            owner = self._owner(shard)
+            if self._job(shard).complete:
+                result[shard["id"]] = "complete"
+            elif owner is not None:
+                result[shard["id"]] = f"claimed by {owner}"
+            else:
+                result[shard["id"]] = "pending"
+        return result
+
+    def claim(self, worker=None):
+        """Claims the first shard which is neither complete nor claimed, and returns it, or None
+           if there is no such shard. The claim is the lock file of the shard created exclusively,
+           which is atomic on local and network file systems, holding the worker name.
+        """
+
+
+        worker = worker or _worker_name()
+        os.makedirs(os.path.join(self.directory, "claims"), exist_ok=True)
+        for shard in self.shards:
+            if self._job(shard).complete:
+                continue
+            try:
+                descriptor = os.open(self._lock_path(shard), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                continue
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                file.write(worker)
+            # The previous owner may have completed the shard and released it after the check
+            if not self._job(shard).complete:
+                return shard
+            self.release(shard, worker)
+        return None
+
+    def release(self, shard, worker=None):
+        """Removes the claim of a shard, so that it can be claimed again. If 'worker' is specified,
+           the claim is only removed while it is held by that worker, so a worker never removes a
+           claim taken over by another one.
+        """
+
+
+        if worker is not None and self._owner(shard) != worker:
+            return
+        try:
+            os.remove(self._lock_path(shard))
+        except FileNotFoundError:
+            pass
+
+    def release_stale(self, lease):
+        """Releases the claims of incomplete shards which made no progress for 'lease' seconds,
+           e.g. of crashed workers, and returns their ids. Workers refresh their claims every
+           'heartbeat' seconds of work, so 'lease' must be several times longer. Call it from one
+           host at a time.
+        """
+
+
+        released = []
+        for shard in self.shards:
+            owner = self._owner(shard)
+            try:
+                age = time.time() - os.path.getmtime(self._lock_path(shard))
+            except FileNotFoundError:
+                continue
+            if owner is not None and age > lease and not self._job(shard).complete:
+                self.release(shard, owner)
+                released.append(shard["id"])
+        return released
+
+    def work(self, worker=None, max_workers=1, max_shards=None, heartbeat=10):
+        """Claims and downloads shards until there are none left (or 'max_shards' shards are
+           downloaded), and returns the ids of the downloaded shards. While a shard is downloaded,
+           a background thread refreshes its claim; the claim is released when the shard is
+           complete or failed. A worker whose claim was released, e.g. by release_stale, cancels
+           its downloads before writing the checkpoint again, stops with RuntimeError and leaves
+           the claim alone.
+
+        Parameters
+        ----------
+        worker : str, optional
+            Name of the worker written into the claims (default is None - the host name and the
+            process id).
+        max_workers : int, optional
+            Number of pages downloaded concurrently (default is 1).
+        max_shards : int, optional
+            Maximum number of shards to download (default is None - all available).
+        heartbeat : float, optional
+            Seconds between the refreshes of the claim (default is 10).
+
+        Returns
+        -------
+        list
+            Ids of the downloaded shards.
+
+        Raises
+        ------
+        RuntimeError
+            If the dataset was modified since it was planned, a page could not be retrieved or
+            the claim of the shard was lost.
+        """
+
+
+        worker = worker or _worker_name()
+        done = []
+        while max_shards is None or len(done) < max_shards:
+            shard = self.claim(worker)
+            if shard is None:
+                break
+            cancel = threading.Event()
+            finished = threading.Event()
+
+            def refresh(shard=shard, cancel=cancel, finished=finished):
+                while not finished.wait(heartbeat):
+                    try:
+                        if self._owner(shard) != worker:
+                            raise FileNotFoundError
+                        os.utime(self._lock_path(shard))
+                    except FileNotFoundError:
+                        cancel.set()
+                        return
+
+            refresher = threading.Thread(target=refresh, daemon=True)
+            refresher.start()
+            job = self._job(shard, max_workers)
+            try:
+                if job.checkpoint is None:
+                    # A shard job starts from the dataset version of the plan, so a modification
+                    # made after planning is detected like one made during the download
+                    job.checkpoint = {"identity": job.identity, "info": self.plan["info"], "completed": [],
+                                      "complete": False}
+                job.run(cancel=cancel)
+            except BaseException as error:
+                if cancel.is_set():
+                    raise RuntimeError(f"The claim of {shard['id']} by {worker} was released.") from error
+                raise
+            finally:
+                finished.set()
+                refresher.join()
+                self.release(shard, worker)
+            done.append(shard["id"])
+        return done
+
+    def merge(self, directory=None):
+        """Moves the pages of all shards into one extract and returns its reader. 'directory' is
+           the directory of the extract (default is None - the directory of the plan). An
+           interrupted merge can be run again.
+
+        Raises
+        ------
+        RuntimeError
+            If a shard is not complete or a page of a shard is missing.
+        """
+
+
+        directory = directory or self.directory
+        os.makedirs(directory, exist_ok=True)
+        pages = []
+        for shard in self.shards:
+            job = self._job(shard)
+            if not job.complete:
+                raise RuntimeError(f"Shard {shard['id']} is not complete.")
+            for page in SpooledPages(job.directory).manifest["pages"]:
+                name = SpooledPages.page_file(len(pages))
+                source = os.path.join(job.directory, page["file"])
+                if os.path.exists(source):
+                    os.replace(source, os.path.join(directory, name))
+                elif not os.path.exists(os.path.join(directory, name)):
+                    # Neither moved by an interrupted merge nor left in the shard
+                    raise RuntimeError(f"Page {page['file']} of shard {shard['id']} is missing.")
+                pages.append(dict(page, file=name))
+        return SpooledPages.write_manifest(directory, dict(self.plan["identity"], info=self.plan["info"]), pages)
+
+
+def plan_extraction(url, library_name, dataset_name, directory, server_name=None, repository_name="Foundation",
+                    server_url=None, server_port=None, shards=None, shard_size=None, page_size=10000,
+                    filter_=None, client=None):
+    """Splits the dataset by a dataset name and a library name into shards of record offsets for
+       extraction by independent workers, see ExtractionPlan. The shards are aligned to pages, so
+       every request but the last one retrieves a full page.
 
-def delete_dataset(url, library_name, dataset_name, server_name=None, repository_name="Foundation", 
-                    server_url=None, server_port=None, only_payload=False):
-    """Deletes dataset from a library.
-       
     Parameters
     ----------
     url : str
@@ -1199,6 +6507,9 @@ def delete_dataset(url, library_name, dataset_name, server_name=None, repository
         Library name.
     dataset_name : str
         Dataset name.
+    directory : str
+        Directory of the plan on storage shared by the workers. It is created if missing and must
+        hold no other plan.
     server_name : str (optional, the default Server Name from the configuration file will be used 
                        if neither 'server_name nor ('server_url' and 'server_port') are specified)
         Workspace server name (default is None).
@@ -1212,212 +6523,66 @@ def delete_dataset(url, library_name, dataset_name, server_name=None, repository
     If 'server_name' and the pair ('server_url' and 'server_port') are both specified
     the request is made using 'server_name'.
     
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
-    Returns
-    -------
-    dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
-    """
-
-    
-    initial_params = dict()
-    
-    endpoint = f"sas/libraries/{library_name}/datasets/{dataset_name}/data"
-    
-    if server_name is not None:
-        endpoint = f"sas/servers/{server_name}/libraries/{library_name}/datasets/{dataset_name}/data"
-        initial_params["repositoryName"] = repository_name
-    elif server_url is not None and server_port is not None:
-        initial_params["serverUrl"] = server_url
-        initial_params["serverPort"] = server_port
-    else:
-        print("The default Server Name from the configuration file will be used "
-              "because neither 'server_name' nor ('server_url' and 'server_port') are specified!")
-        
-    return make_request("DELETE", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
-
+    shards : int, optional
+        Number of shards (default is None).
+    shard_size : int, optional
+        Number of records per shard, rounded up to whole pages (default is None - 100 pages if
+        'shards' is not specified either).
+    page_size : int, optional
+        Number of records to retrieve per request (default is 10000, maximum value is 10000).
+    filter_ : string/Predicate, optional
+        Dataset filter (JSON) or a Predicate built with 'col' which the server supports entirely
+        (default is None).
+    client : SAS9APIClient, optional
+        Client making the request and used by the returned plan (default is None - the default
+        client of 'url').
 
-# OBJECTS *********************************************************************************************************
-def find_object(url, repository_name="Foundation", location=None, location_recursive=True, object_id=None,
-                object_type=None, public_type=None, name_equals=None, name_starts=None, name_contains=None,
-                name_regex=None, description_contains=None, description_regex=None, created_gt=None,
-                created_lt=None, modified_gt=None, modified_lt=None, table_libref=None, table_dbms=None,
-                include_associations=False, include_permissions=False, only_payload=False):
-    """Finds objects.
-       
-    Parameters
-    ----------
-    url : str
-        The URL of the server with the installed SAS9API.
-    location : str, optional
-        Folder location to search in (default is None).
-    location_recursive : bool, optional
-        A flag defining whether to search in subfolders or not (default is True).
-    object_id : str, optional
-        SAS Metadata object ID (default is None).
-    object_type : str, optional
-        SAS Metadata object type (default is None). Omit for any object types
-    public_type : str, optional
-        Comma-separated list of target PublicType attributes.
-    name_equals : str, optional (if at least one other search criteria is specified)
-        Search criteria: name matches (case-insensitive). Default is None.
-    name_starts : str, optional (if at least one other search criteria is specified)
-        Search criteria: name starts with (case-insensitive). Default is None.
-    name_contains : str, optional (if at least one other search criteria is specified)
-        Search criteria: name contains (case-insensitive). Default is None.
-    name_regex : str, optional (if at least one other search criteria is specified)
-        Search criteria: name matches regex. Default is None.
-    description_contains : str, optional (if at least one other search criteria is specified)
-        Search criteria: description contains (case-insensitive). Default is None.
-    description_regex : str, optional (if at least one other search criteria is specified)
-        Search criteria: description matches regex. Default is None.
-    created_gt : str, optional (if at least one other search criteria is specified)
-        Search criteria: MetadataCreated greater than (ISO datatime format). Default is None.
-    created_lt : str, optional (if at least one other search criteria is specified)
-        Search criteria: MetadataCreated lower than (ISO datatime format). Default is None.
-    modified_gt : str, optional (if at least one other search criteria is specified)
-        Search criteria: MetadataModified greater than (ISO datatime format). Default is None.
-    modified_lt : str, optional (if at least one other search criteria is specified)
-        Search criteria: MetadataModified lower than (ISO datatime format). Default is None.
-    table_libref : str, optional (if at least one other search criteria is specified)
-        Search criteria: libref name for associated library object for a table. For table types only. Default is None.
-    table_dbms : str, optional (if at least one other search criteria is specified)
-        Search criteria: DBMS engine name for associated library object for a table. For table types only. Default is None.
-        
-    Note: at least one search criteria must be specified.
-    
-    include_associations : bool, optional
-        A flag defining whether to include object associations in the search. Default is False.
-    include_permissions : bool, optional
-        A flag defining whether to include metadata object permissions in the search. Default is False.
-    repository_name : str, optional
-        Repository name (default is 'Foundation').
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
     Returns
     -------
-    dict/list
-        The server response (either full or truncated depending on the 'only_payload' flag) 
-        as a dictionary (full) or a list (truncated).
-    """
+    ExtractionPlan
+        The plan.
 
-    
-    endpoint = "sas/meta/search"
-    
-    initial_params = {"repositoryName": repository_name, "location": location, 
-                      "locationRecursive": location_recursive, "objectID": object_id, 
-                      "objectType": object_type, "publicType": public_type,
-                      "nameEquals": name_equals, "nameStarts": name_starts, 
-                      "nameContains": name_contains, "nameRegex": name_regex, 
-                      "descriptionContains": description_contains, "descriptionRegex": description_regex,
-                      "createdGt": created_gt, "createdLt": created_lt, "modifiedGt": modified_gt, 
-                      "modifiedLt": modified_lt, "tableLibref": table_libref, "tableDBMS": table_dbms, 
-                      "includeAssociations": include_associations, "includePermissions": include_permissions}
-    
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
-    
-"""
-def copy(url, sourceLocation, sourceName, destinationLocation, publicType="", **kwargs):
-    #
-    #    This method will copy object to folder.
-    #    This method will return a response as a dictionary.
-    #
-    endpoint = f"sas/meta/objects/copy"
-    
-    initial_params = {"sourceLocation":sourceLocation, "sourceName":sourceName, "destinationLocation":destinationLocation, 
-              "publicType":publicType}
-    valid_params = ["repositoryName"]
-    
-    return make_request("GET", assemble_url(url, endpoint),
-                       initial_params=initial_params, valid_params=valid_params, kwargs=kwargs, onlyPayload=onlyPayload)
-"""
-    
+    Raises
+    ------
+    ValueError
+        If both 'shards' and 'shard_size' are specified, the directory holds a plan or the
+        server does not support the whole Predicate 'filter_'.
+    RuntimeError
+        If the dataset information could not be retrieved.
 
-def move_object(url, source_location, source_name, public_type, destination_location,  
-                repository_name="Foundation", only_payload=False):
-    """Moves object between folders.
-       
-    Parameters
-    ----------
-    url : str
-        The URL of the server with the installed SAS9API.
-    source_location : str
-        Source folder location.
-    source_name : str
-        Source object name.
-    public_type : str
-        Source object PublicType.
-    destination_location : str
-        Destination folder location.
-    repository_name : str, optional
-        Repository name (default is 'Foundation').    
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
-    Returns
+    Example
     -------
-    dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
+        >>> plan = plan_extraction(url, "mylib", "big", "/shared/extracts/big", server_name="SASApp", shards=16)
+        >>> plan.shards[1]
+        {'id': 'shard-000001', 'offset': 750000, 'limit': 750000}
     """
 
-    # When success response is None!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
-    
-    endpoint = "sas/meta/objects/move"
-    
-    # Error in the source code!!! Correcting it here, but when it is corrected in Java code,
-    # will have to flip destinationLocation and PublicType !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
-    
-    initial_params = {"sourceLocation": source_location, "sourceName": source_name, 
-                      "destinationLocation": public_type, "publicType": destination_location,
-                      "repositoryName": repository_name}
-    
-    return make_request("POST", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
 
+    if shards is not None and shard_size is not None:
+        raise ValueError("Only one of 'shards' and 'shard_size' can be specified.")
+    if os.path.exists(os.path.join(directory, ExtractionPlan.PLAN)):
+        raise ValueError(f"{directory} already holds an extraction plan.")
+    server = {"server_name": server_name, "repository_name": repository_name,
+              "server_url": server_url, "server_port": server_port}
+    info = (client or get_default_client(url))._fresh_dataset_info(library_name, dataset_name, server)
+    if info is None or info.get("objectsNumber") is None:
+        raise RuntimeError(f"Failed to get the number of records of {library_name}.{dataset_name}.")
+    filter_ = _server_filter(filter_, info.get("columns") or [])
 
-def delete_object(url, source_location, source_name, public_type, repository_name="Foundation", only_payload=False):
-    """Deletes object by its name and location.
-       
-    Parameters
-    ----------
-    url : str
-        The URL of the server with the installed SAS9API.
-    source_location : str
-        Folder location.
-    source_name : str
-        Object name.
-    public_type : str
-        Object PublicType.
-    repository_name : str, optional
-        Repository name (default is 'Foundation').    
-    only_payload : bool, optional
-        A flag used to determine the content of the response returned by the function (default is
-        True). If True - the function will return the truncated server response containing only
-        the payload. If False - the function will return the full response from the server.
- 
-    Returns
-    -------
-    dict
-        The server response (either full or truncated depending on the 'only_payload' flag) as a dictionary.
-    """
-    
-    # When success response is None!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
-    
-    endpoint = "sas/meta/objects/delete"
-        
-    initial_params = {"sourceLocation": source_location, "sourceName": source_name,  
-                      "publicType": public_type, "repositoryName": repository_name}
-    
-    return make_request("POST", assemble_url(url, endpoint),
-                       initial_params=initial_params, only_payload=only_payload)
\ No newline at end of file
+    total_pages = -(-info["objectsNumber"] // page_size)
+    if shards is not None:
+        shard_pages = -(-total_pages // max(shards, 1))
+    elif shard_size is not None:
+        shard_pages = -(-shard_size // page_size)
+    else:
+        shard_pages = 100
+    shard_pages = max(shard_pages, 1)
+    shard_list = [{"id": f"shard-{index:06d}", "offset": offset,
+                   "limit": min(shard_pages * page_size, info["objectsNumber"] - offset)}
+                  for index, offset in enumerate(range(0, info["objectsNumber"], shard_pages * page_size))]
+    os.makedirs(directory, exist_ok=True)
+    _write_json(os.path.join(directory, ExtractionPlan.PLAN),
+                {"identity": {"url": url, "library_name": library_name, "dataset_name": dataset_name,
+                              "server": server, "filter": filter_, "page_size": page_size},
+                 "info": info, "shards": shard_list})
+    return ExtractionPlan(directory, client)
@@ -0,0 +1,187 @@
+import os
+import re
+import sys
+import threading
+from json import dumps, loads
+from urllib.parse import urlparse
+
+import pytest
+import requests
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sas9api import SAS9APIClient  # noqa: E402
+
+
+DATASET_PATH = re.compile(r"/sas/(?:servers/[^/]+/)?libraries/([^/]+)/datasets/([^/]+)(/data)?")
+
+OPERATORS = {"$eq": lambda a, b: a == b, "$ne": lambda a, b: a != b, "$in": lambda a, b: a in b,
+             "$gt": lambda a, b: a is not None and a > b, "$gte": lambda a, b: a is not None and a >= b,
+             "$lt": lambda a, b: a is not None and a < b, "$lte": lambda a, b: a is not None and a <= b}
+
+
+def column(name, type_="num", **information):
+    return dict({"name": name, "type": type_, "extendedType": type_, "length": 8, "indexType": "",
+                 "sortedBy": 0}, **information)
+
+
+def matches(record, filter_):
+    for name, condition in filter_.items():
+        if name == "$and":
+            if not all(matches(record, item) for item in condition):
+                return False
+        elif name == "$or":
+            if not any(matches(record, item) for item in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not all(OPERATORS[operator](record.get(name), value) for operator, value in condition.items()):
+                return False
+        elif record.get(name) != condition:
+            return False
+    return True
+
+
+class StubSession(requests.Session):
+    """A requests.Session answering the SAS9API dataset endpoints from memory.
+
+    'datasets' maps the upper-cased (library, dataset) to the columns, the records and the modification date,
+    'log' holds the (method, path, params) of every request and 'fail' is the number of the next
+    requests answered with HTTP 500. SAS code is collected in 'commands' and passed with the
+    request parameters to 'on_command', which can create the datasets the code would create.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.datasets = {}
+        self.log = []
+        self.commands = []
+        self.fail = 0
+        self.on_command = None
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def add_dataset(self, library, dataset, columns, records):
+        self.datasets[library.upper(), dataset.upper()] = {"columns": columns, "records": [dict(record) for record in records],
+                                           "modificationDate": self._modification_date()}
+
+    def records(self, library, dataset):
+        return self.datasets[library, dataset]["records"]
+
+    def requests(self, method=None, path=""):
+        return [entry for entry in self.log if method in (None, entry[0]) and entry[1].endswith(path)]
+
+    def _modification_date(self):
+        self.version += 1
+        return f"2020-01-01T00:00:{self.version:02d}"
+
+    def request(self, method, url, params=None, data=None, json=None, timeout=None, stream=False, **kwargs):
+        with self._lock:
+            return self._answer(method, url, params, data, json)
+
+    def _answer(self, method, url, params, data, json):
+        path = urlparse(url).path
+        params = {name: str(value) for name, value in (params or {}).items()}
+        self.log.append((method, path, params))
+        if self.fail > 0:
+            self.fail -= 1
+            return self._response({"status": 500, "error": "Internal error", "payload": None}, 500)
+        match = DATASET_PATH.fullmatch(path)
+        if path.endswith("/cmd"):
+            self.commands.append(data)
+            if self.on_command is not None:
+                self.on_command(data, params)
+            return self._response({"status": 200, "error": None, "payload": {"log": ""}})
+        if match is None:
+            return self._response({"status": 404, "error": "Not found", "payload": None}, 404)
+        key = match.group(1).upper(), match.group(2).upper()
+        if key not in self.datasets and not (method in ("PUT", "POST") and match.group(3)):
+            return self._response({"status": 404, "error": f"{key[0]}.{key[1]} not found", "payload": None}, 404)
+        dataset = self.datasets.setdefault(key, {"columns": [], "records": [], "modificationDate": None})
+        records = dataset["records"]
+        if not match.group(3):
+            return self._response({"status": 200, "error": None,
+                                   "payload": {"name": key[1], "modificationDate": dataset["modificationDate"],
+                                               "objectsNumber": len(records), "columns": dataset["columns"]}})
+        if method == "GET":
+            if "filter" in params:
+                records = [record for record in records if matches(record, loads(params["filter"]))]
+            offset, limit = int(params.get("offset", 0)), int(params.get("limit", 100))
+            return self._response({"status": 200, "error": None, "payload": records[offset:offset + limit]})
+        if method == "DELETE":
+            del self.datasets[key]
+            return self._response({"status": 200, "error": None, "payload": True})
+        dataset["modificationDate"] = self._modification_date()
+        if method == "POST":
+            removed = len(records)
+            records[:] = [dict(record) for record in json]
+            return self._response({"status": 200, "error": None,
+                                   "payload": {"itemsInserted": len(json), "itemsRemoved": removed,
+                                               "itemsUpdated": None}})
+        by_key = params.get("byKey")
+        removed = 0
+        if by_key is not None:
+            keys = {record.get(by_key) for record in json}
+            removed = sum(record.get(by_key) in keys for record in records)
+            records[:] = [record for record in records if record.get(by_key) not in keys]
+        records.extend(dict(record) for record in json)
+        return self._response({"status": 200, "error": None,
+                               "payload": {"itemsInserted": len(json), "itemsRemoved": removed,
+                                           "itemsUpdated": 0}})
+
+    def _response(self, body, status=200):
+        response = requests.Response()
+        response.status_code = status
+        response._content = dumps(body).encode("utf-8")
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        return response
+
+
+@pytest.fixture
+def stub():
+    return StubSession()
+
+
+@pytest.fixture
+def client(stub):
+    return SAS9APIClient("http://sas", session=stub)
+
+
+class AsyncStubResponse:
+    def __init__(self, method, url, response):
+        self.method = method
+        self.url = url
+        self.response = response
+        self.status = response.status_code
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return False
+
+    async def read(self):
+        return self.response.content
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            request_info = aiohttp.RequestInfo(self.url, self.method, {}, self.url)
+            raise aiohttp.ClientResponseError(request_info, (), status=self.status)
+
+
+class AsyncStubSession:
+    """An aiohttp.ClientSession answering the requests with a StubSession."""
+
+    def __init__(self, stub):
+        self.stub = stub
+
+    def request(self, method, url, params=None, data=None, json=None):
+        return AsyncStubResponse(method, url, self.stub.request(method, url, params=params, data=data, json=json))
+
+    async def close(self):
+        pass
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from conftest import AsyncStubSession, column
+
+from sas9api import AsyncSAS9APIClient
+
+
+pytest.importorskip("aiohttp")
+
+
+def run(stub, coroutine_function, max_concurrency=10):
+    async def main():
+        client = AsyncSAS9APIClient("http://sas", max_concurrency=max_concurrency)
+        client.session = AsyncStubSession(stub)
+        client._semaphore = asyncio.Semaphore(max_concurrency)
+        async with client:
+            return await coroutine_function(client)
+
+    return asyncio.run(main())
+
+
+def test_methods_are_coroutines(stub):
+    stub.add_dataset("LIB", "DATA", [column("ID"), column("NAME", "char")],
+                     [{"ID": index, "NAME": f"n{index}"} for index in range(5)])
+
+    async def calls(client):
+        return await asyncio.gather(client.get_dataset_info("LIB", "DATA", server_name="SASApp", only_payload=True),
+                                    client.retrieve_data("LIB", "DATA", server_name="SASApp", limit=2, offset=1,
+                                                         only_payload=True),
+                                    client.insert_data("LIB", "DATA", [{"ID": 9, "NAME": "x"}], server_name="SASApp",
+                                                       only_payload=True))
+
+    info, page, inserted = run(stub, calls)
+    assert info["name"] == "DATA"
+    assert page == [{"ID": 1, "NAME": "n1"}, {"ID": 2, "NAME": "n2"}]
+    assert inserted["itemsInserted"] == 1
+    assert stub.requests("GET", "/data")[0][2] == {"limit": "2", "offset": "1", "repositoryName": "Foundation"}
+
+
+def test_compact_rows_take_the_dataset_columns(stub):
+    stub.add_dataset("LIB", "DATA", [column("ID"), column("NAME", "char")], [{"ID": 1}, {"ID": 2, "NAME": "b"}])
+
+    async def calls(client):
+        return await client.retrieve_data("LIB", "DATA", server_name="SASApp", only_payload=True, row_format="tuple")
+
+    rows = run(stub, calls)
+    assert rows.columns == ["ID", "NAME"]
+    assert list(rows) == [(1, None), (2, "b")]
+
+
+def test_failed_request_returns_none(stub):
+    async def calls(client):
+        return await client.get_dataset_info("LIB", "MISSING", server_name="SASApp")
+
+    assert run(stub, calls) is None
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from conftest import column
+
+from sas9api import _chunk_records, _read_records
+
+
+def test_chunk_records_by_rows():
+    chunks = list(_chunk_records(({"ID": i} for i in range(7)), chunk_rows=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert [record["ID"] for chunk in chunks for record in chunk] == list(range(7))
+
+
+def test_chunk_records_by_bytes():
+    records = [{"NAME": "x" * 10} for _ in range(10)]
+    size = len(json.dumps(records[0])) + 1
+    chunks = list(_chunk_records(records, chunk_rows=100, chunk_bytes=3 * size))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+
+
+def test_chunk_records_oversized_record_makes_its_own_chunk():
+    records = [{"A": 1}, {"A": "y" * 100}, {"A": 2}]
+    assert [len(chunk) for chunk in _chunk_records(records, chunk_bytes=20)] == [1, 1, 1]
+
+
+def test_chunk_records_empty():
+    assert list(_chunk_records([])) == []
+
+
+def test_read_records_csv(tmp_path):
+    path = tmp_path / "records.csv"
+    path.write_text("ID,D,X,NAME\n1,1996-01-01,,a\n2,,2.5,\n")
+    columns = [{"name": "ID", "type": "num"}, {"name": "D", "type": "num", "format": "DATE9."},
+               {"name": "X", "type": "num"}, {"name": "NAME", "type": "char"}]
+    assert list(_read_records(str(path), columns)) == [{"ID": 1.0, "D": "1996-01-01", "X": None, "NAME": "a"},
+                                                       {"ID": 2.0, "D": None, "X": 2.5, "NAME": None}]
+
+
+def test_insert_data_bulk_retries_failed_chunks(stub, client):
+    stub.add_dataset("LIB", "DATA", [column("ID")], [])
+    stub.fail = 2
+    summary = client.insert_data_bulk("LIB", "DATA", ({"ID": index} for index in range(25)), server_name="SASApp",
+                                      chunk_rows=10, max_workers=1, backoff_delay=0)
+    assert (summary["records"], summary["chunks"], summary["itemsInserted"], summary["failed"]) == (25, 3, 25, [])
+    assert len(stub.requests("PUT", "/data")) == 5
+    assert sorted(record["ID"] for record in stub.records("LIB", "DATA")) == list(range(25))
+
+
+def test_insert_data_bulk_reports_chunks_failing_every_retry(stub, client):
+    stub.add_dataset("LIB", "DATA", [column("ID")], [])
+    stub.fail = 3
+    summary = client.insert_data_bulk("LIB", "DATA", [{"ID": index} for index in range(15)], server_name="SASApp",
+                                      by_key="ID", chunk_rows=10, max_workers=1, max_retries=2, backoff_delay=0)
+    assert summary["failed"] == [[{"ID": index} for index in range(10)]]
+    assert summary["records"] == 5
+    assert stub.requests("PUT", "/data")[-1][2]["byKey"] == "ID"
+
+
+def test_replace_all_data_stream_replaces_then_appends(stub, client):
+    stub.add_dataset("LIB", "DATA", [column("ID")], [{"ID": -1}])
+    reported = []
+    summary = client.replace_all_data_stream("LIB", "DATA", ({"ID": index} for index in range(25)),
+                                             server_name="SASApp", chunk_rows=10,
+                                             progress=lambda records, seconds: reported.append(records))
+    assert [method for method, _, _ in stub.requests(path="/data")] == ["POST", "PUT", "PUT"]
+    assert [record["ID"] for record in stub.records("LIB", "DATA")] == list(range(25))
+    assert (summary["records"], summary["chunks"]) == (25, 3)
+    assert reported[-1] == 25
+
+
+def test_replace_all_data_stream_from_a_csv_file(stub, client, tmp_path):
+    stub.add_dataset("LIB", "DATA", [column("ID"), column("NAME", "char")], [])
+    path = tmp_path / "records.csv"
+    path.write_text("ID,NAME\n1,a\n2,\n")
+    client.replace_all_data_stream("LIB", "DATA", str(path), server_name="SASApp", progress=False)
+    assert stub.records("LIB", "DATA") == [{"ID": 1.0, "NAME": "a"}, {"ID": 2.0, "NAME": None}]
+
+
+def test_replace_all_data_stream_raises_when_appending_fails(stub, client):
+    stub.add_dataset("LIB", "DATA", [column("ID")], [])
+
+    def fail_after_replacing(records, seconds):
+        stub.fail = 10
+
+    with pytest.raises(RuntimeError, match="only partly replaced"):
+        client.replace_all_data_stream("LIB", "DATA", [{"ID": 1}, {"ID": 2}], server_name="SASApp", chunk_rows=1,
+                                       max_retries=1, backoff_delay=0, progress=fail_after_replacing)
+    assert stub.records("LIB", "DATA") == [{"ID": 1}]
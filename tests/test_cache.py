@@ -0,0 +1,75 @@
+from conftest import column
+
+from sas9api import DatasetCache, ResponseCache
+
+
+KEY = ("http://sas", "SASApp", "Foundation", None, None, "LIB", "DATA", None)
+RECORDS = [{"ID": index, "NAME": f"n{index}"} for index in range(100)]
+
+
+def test_dataset_cache_returns_copies(tmp_path):
+    for cache in (DatasetCache(), DatasetCache(max_memory_items=0, directory=tmp_path)):
+        records = [dict(record) for record in RECORDS]
+        cache.put(KEY, "v1", records)
+        records[0]["NAME"] = "put"
+        cached = cache.get(KEY, "v1")
+        cached[0]["NAME"] = "get"
+        cached.append({})
+        assert cache.get(KEY, "v1") == RECORDS
+        assert cache.get(KEY, "v2") is None
+
+
+def test_dataset_cache_bounds_memory_by_size():
+    cache = DatasetCache(max_memory_bytes=3000)
+    cache.put(KEY, "v1", RECORDS)
+    assert cache._memory_bytes > 1000
+    cache.put(KEY[:-1] + ("other",), "v1", RECORDS)
+    assert cache.get(KEY, "v1") is None
+    assert cache.get(KEY[:-1] + ("other",), "v1") == RECORDS
+    cache.put(KEY, "v1", RECORDS * 10)
+    assert cache.get(KEY, "v1") is None
+    assert cache._memory_bytes <= 3000
+
+
+def test_retrieve_data_cached_refreshes_modified_datasets(stub, client):
+    stub.add_dataset("LIB", "DATA", [column("ID"), column("NAME", "char")], RECORDS)
+    cache = DatasetCache()
+    for _ in range(2):
+        assert client.retrieve_data_cached("LIB", "DATA", cache, server_name="SASApp", page_size=60) == RECORDS
+    assert len(stub.requests("GET", "/data")) == 2
+    client.insert_data("LIB", "DATA", [{"ID": 100, "NAME": "new"}], server_name="SASApp")
+    assert len(client.retrieve_data_cached("LIB", "DATA", cache, server_name="SASApp", page_size=60)) == 101
+    assert len(stub.requests("GET", "/data")) == 4
+
+
+def test_response_cache_serves_metadata_until_a_write(stub, client):
+    stub.add_dataset("LIB", "DATA", [column("ID")], [])
+    stub.add_dataset("LIB", "OTHER", [column("ID")], [])
+    client.cache = ResponseCache()
+
+    def info(dataset):
+        return client.get_dataset_info("LIB", dataset, server_name="SASApp", only_payload=True)
+
+    assert info("DATA")["objectsNumber"] == 0
+    info("DATA")["objectsNumber"] = 99
+    info("OTHER")
+    assert len(stub.requests("GET", "/DATA")) == 1
+    assert info("DATA")["objectsNumber"] == 0
+    client.insert_data("LIB", "data", [{"ID": 1}], server_name="SASApp")
+    assert info("DATA")["objectsNumber"] == 1
+    info("OTHER")
+    assert len(stub.requests("GET", "/DATA")) == 2
+    assert len(stub.requests("GET", "/OTHER")) == 1
+    client.execute_command("data _null_; run;", server_name="SASApp")
+    info("OTHER")
+    assert len(stub.requests("GET", "/OTHER")) == 2
+
+
+def test_response_cache_does_not_cache_data_or_failures(stub, client):
+    stub.add_dataset("LIB", "DATA", [column("ID")], [{"ID": 1}])
+    client.cache = ResponseCache()
+    for _ in range(2):
+        client.retrieve_data("LIB", "DATA", server_name="SASApp")
+        client.get_dataset_info("LIB", "MISSING", server_name="SASApp")
+    assert len(stub.requests("GET", "/data")) == 2
+    assert len(stub.requests("GET", "/MISSING")) == 2
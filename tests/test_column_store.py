@@ -0,0 +1,105 @@
+import json
+
+import pytest
+from conftest import column
+
+from sas9api import ColumnStore, _page_to_columns
+
+
+np = pytest.importorskip("numpy")
+
+INFO = {"objectsNumber": 0, "columns": [{"name": "ID", "type": "num", "length": 8},
+                                        {"name": "NAME", "type": "char", "length": 4},
+                                        {"name": "D", "type": "num", "length": 8, "format": "YYMMDD10."}]}
+KEY = ("http://server", "SASApp", "Foundation", None, None, "LIB", "DATA", None)
+
+
+def pages(start, stop, page_size=3):
+    for offset in range(start, stop, page_size):
+        page = [{"ID": i, "NAME": f"n{i}" if i % 4 else None, "D": None if i % 3 else "2020-01-02"}
+                for i in range(offset, min(offset + page_size, stop))]
+        yield _page_to_columns(page, INFO["columns"])
+
+
+def test_write_and_read(tmp_path):
+    store = ColumnStore(tmp_path)
+    dataset = store.write(KEY, INFO, pages(0, 10), watermark={"column": "ID", "value": 9})
+    assert len(dataset) == 10
+    assert dataset.columns == ["ID", "NAME", "D"]
+    assert dataset["ID"].tolist() == list(range(10))
+    assert dataset["NAME"].mask.tolist() == [i % 4 == 0 for i in range(10)]
+    assert dataset["D"].dtype == np.dtype("datetime64[ms]")
+    assert dataset["D"][0] == np.datetime64("2020-01-02")
+    assert dataset.watermark == {"column": "ID", "value": 9}
+    assert store.open(KEY).meta == dataset.meta
+
+
+def test_open_missing_dataset(tmp_path):
+    assert ColumnStore(tmp_path).open(KEY) is None
+
+
+def test_refresh_keeps_opened_readers(tmp_path):
+    store = ColumnStore(tmp_path)
+    old = store.write(KEY, INFO, pages(0, 10))
+    new = store.write(KEY, INFO, pages(100, 103))
+    assert old["ID"].tolist() == list(range(10))
+    assert store.open(KEY)["ID"].tolist() == [100, 101, 102]
+    assert len(new) == 3
+    assert len([path for path in (tmp_path / store.path(KEY)).iterdir() if path.is_dir()]) == 1
+
+
+def test_failed_write_keeps_previous_version(tmp_path):
+    store = ColumnStore(tmp_path)
+    store.write(KEY, INFO, pages(0, 5))
+
+    def failing():
+        yield from pages(0, 3)
+        raise RuntimeError("page failed")
+
+    with pytest.raises(RuntimeError):
+        store.write(KEY, INFO, failing())
+    assert store.open(KEY)["ID"].tolist() == list(range(5))
+
+
+def test_append(tmp_path):
+    store = ColumnStore(tmp_path)
+    before = store.write(KEY, INFO, pages(0, 4))
+    after = store.append(KEY, INFO, pages(4, 9), watermark={"column": "ID", "value": 8})
+    assert after["ID"].tolist() == list(range(9))
+    assert after.watermark["value"] == 8
+    assert len(before) == 4 and before["ID"].tolist() == list(range(4))
+
+
+def test_append_rejects_changed_type(tmp_path):
+    store = ColumnStore(tmp_path)
+    store.write(KEY, INFO, pages(0, 4))
+    changed = {"ID": (np.array(["2020-01-01"], dtype="datetime64[ms]"), np.array([False])),
+               "NAME": (np.array(["x"], dtype="U4"), np.array([False])),
+               "D": (np.array(["2020-01-01"], dtype="datetime64[ms]"), np.array([False]))}
+    with pytest.raises(ValueError):
+        store.append(KEY, INFO, [changed])
+    with pytest.raises(ValueError):
+        store.append(("other",), INFO, [])
+
+
+def test_sync_columns_appends_records_above_the_mark(stub, client, tmp_path):
+    stub.add_dataset("LIB", "DATA", [column("ID"), column("NAME", "char")],
+                     [{"ID": index, "NAME": f"n{index}"} for index in range(5)])
+    store = ColumnStore(tmp_path)
+    assert client.sync_columns("LIB", "DATA", store, "ID", server_name="SASApp")["ID"].tolist() == list(range(5))
+    stub.records("LIB", "DATA").extend({"ID": index, "NAME": None} for index in range(5, 8))
+    dataset = client.sync_columns("LIB", "DATA", store, "ID", server_name="SASApp")
+    assert dataset["ID"].tolist() == list(range(8))
+    assert dataset["NAME"].mask.tolist() == [False] * 5 + [True] * 3
+    assert dataset.watermark == {"column": "ID", "value": 7}
+    assert json.loads(stub.requests("GET", "/data")[-1][2]["filter"]) == {"ID": {"$gt": 4}}
+
+
+def test_sync_columns_reloads_a_smaller_dataset(stub, client, tmp_path):
+    stub.add_dataset("LIB", "DATA", [column("ID")], [{"ID": index} for index in range(5)])
+    store = ColumnStore(tmp_path)
+    client.sync_columns("LIB", "DATA", store, "ID", server_name="SASApp")
+    del stub.records("LIB", "DATA")[:3]
+    dataset = client.sync_columns("LIB", "DATA", store, "ID", server_name="SASApp")
+    assert dataset["ID"].tolist() == [3, 4]
+    assert "filter" not in stub.requests("GET", "/data")[-1][2]
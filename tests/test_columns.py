@@ -0,0 +1,36 @@
+import pytest
+from conftest import column
+
+from sas9api import _concatenate_columns
+
+
+np = pytest.importorskip("numpy")
+
+
+def chunk(values, dtype=None):
+    values = np.array(values, dtype=dtype)
+    return values, np.zeros(len(values), dtype=bool)
+
+
+def test_concatenate_casts_to_the_common_dtype():
+    array = _concatenate_columns([chunk(["ab"]), chunk(["abcde"]), (np.zeros(2, dtype="<U1"), np.ones(2, bool))],
+                                 column("NAME", "char"))
+    assert array.dtype == np.dtype("<U5")
+    assert array.compressed().tolist() == ["ab", "abcde"]
+    assert array.mask.tolist() == [False, False, True, True]
+
+
+def test_concatenate_rejects_incompatible_dtypes():
+    with pytest.raises(ValueError, match="incompatible types"):
+        _concatenate_columns([chunk(["2020-01-01"], "datetime64[ms]"), chunk([1.5])], column("D"))
+
+
+def test_retrieve_columns(stub, client):
+    stub.add_dataset("LIB", "DATA", [column("ID"), column("NAME", "char"), column("D", format="DATE9.")],
+                     [{"ID": index, "NAME": None if index % 2 else f"n{index}", "D": "2020-01-02"}
+                      for index in range(5)])
+    arrays = client.retrieve_columns("LIB", "DATA", server_name="SASApp", page_size=2)
+    assert arrays["ID"].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert arrays["NAME"].tolist() == ["n0", None, "n2", None, "n4"]
+    assert arrays["D"].dtype == np.dtype("datetime64[ms]")
+    assert len(stub.requests("GET", "/data")) == 3
@@ -0,0 +1,8 @@
+from sas9api import _add_range
+
+
+def test_add_range_merges_adjacent_and_overlapping():
+    ranges = []
+    for start, end in [(20, 30), (0, 10), (10, 20), (40, 50), (45, 60)]:
+        ranges = _add_range(ranges, start, end)
+    assert ranges == [[0, 30], [40, 60]]
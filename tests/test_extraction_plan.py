@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from sas9api import ExtractionPlan, _worker_name
+
+
+def make_plan(directory, shards=3):
+    plan = {"identity": {"url": "http://server", "library_name": "LIB", "dataset_name": "DATA",
+                         "server": {"server_name": "SASApp", "repository_name": "Foundation",
+                                    "server_url": None, "server_port": None},
+                         "filter": None, "page_size": 10},
+            "info": {"objectsNumber": 10 * shards, "modificationDate": "2020-01-01T00:00:00"},
+            "shards": [{"id": f"shard-{index:06d}", "offset": 10 * index, "limit": 10} for index in range(shards)]}
+    (directory / ExtractionPlan.PLAN).write_text(json.dumps(plan))
+    return ExtractionPlan(str(directory))
+
+
+def test_claims_are_exclusive(tmp_path):
+    plan = make_plan(tmp_path)
+    claimed = [plan.claim(f"w{index}") for index in range(4)]
+    assert [shard["id"] for shard in claimed[:3]] == ["shard-000000", "shard-000001", "shard-000002"]
+    assert claimed[3] is None
+    assert plan.status() == {"shard-000000": "claimed by w0", "shard-000001": "claimed by w1",
+                             "shard-000002": "claimed by w2"}
+
+
+def test_release_only_removes_own_claim(tmp_path):
+    plan = make_plan(tmp_path, shards=1)
+    shard = plan.claim("a")
+    plan.release(shard, "b")
+    assert plan.status()["shard-000000"] == "claimed by a"
+    plan.release(shard, "a")
+    assert plan.status()["shard-000000"] == "pending"
+    assert plan.claim("b") == shard
+
+
+def test_release_stale(tmp_path):
+    plan = make_plan(tmp_path, shards=2)
+    plan.claim("a")
+    plan.claim("b")
+    assert plan.release_stale(3600) == []
+    assert plan.release_stale(-1) == ["shard-000000", "shard-000001"]
+    assert set(plan.status().values()) == {"pending"}
+
+
+class FakeClient:
+    def __init__(self, shards=3, download=None):
+        self.shards = shards
+        self.download = download
+
+    def _fresh_dataset_info(self, library_name, dataset_name, server):
+        return {"objectsNumber": 10 * self.shards, "modificationDate": "2020-01-01T00:00:00"}
+
+    def _download_page(self, library_name, dataset_name, server, offset, limit, filter_, path, chunk_size,
+                       cancel=None):
+        if self.download is not None:
+            self.download(offset, cancel)
+        with open(path, "w") as file:
+            file.write(f"[{offset}, {limit}]")
+        return 8
+
+
+def test_work_releases_claims_of_complete_shards(tmp_path):
+    make_plan(tmp_path)
+    plan = ExtractionPlan(str(tmp_path), FakeClient())
+    assert plan.work("a") == ["shard-000000", "shard-000001", "shard-000002"]
+    assert set(plan.status().values()) == {"complete"}
+    assert plan.claim("b") is None
+    assert list((tmp_path / "claims").iterdir()) == []
+    assert len(plan.merge().manifest["pages"]) == 3
+
+
+def test_stolen_claim_cancels_downloads(tmp_path):
+    make_plan(tmp_path, shards=1)
+
+    def steal(offset, cancel):
+        plan.release(plan.shards[0])
+        plan.claim("b")
+        assert cancel.wait(5)
+        raise RuntimeError("cancelled")
+
+    plan = ExtractionPlan(str(tmp_path), FakeClient(1, steal))
+    with pytest.raises(RuntimeError, match="was released"):
+        plan.work("a", heartbeat=0.01)
+    assert plan.status() == {"shard-000000": "claimed by b"}
+    assert not (tmp_path / "shards" / "shard-000000" / "checkpoint.json").exists()
+
+
+def test_run_keeps_temporary_files_of_other_workers(tmp_path):
+    make_plan(tmp_path, shards=1)
+    directory = tmp_path / "shards" / "shard-000000"
+    directory.mkdir(parents=True)
+    own = directory / f"page-000000.json.{_worker_name()}.1.tmp"
+    other = directory / "page-000000.json.otherhost-1.1.tmp"
+    own.write_text("")
+    other.write_text("")
+    ExtractionPlan(str(tmp_path), FakeClient(1)).work("a")
+    assert not own.exists()
+    assert other.exists()
+
+
+def test_merge_raises_for_missing_pages(tmp_path):
+    make_plan(tmp_path, shards=2)
+    plan = ExtractionPlan(str(tmp_path), FakeClient(2))
+    plan.work("a")
+    (tmp_path / "shards" / "shard-000001" / "page-000000.json").unlink()
+    with pytest.raises(RuntimeError, match="page-000000.json of shard shard-000001"):
+        plan.merge()
@@ -0,0 +1,85 @@
+import json
+import random
+
+import pytest
+from conftest import column
+
+from sas9api import _RowDecoder, _iter_json_array
+
+
+RECORDS = [{"ID": 1, "NAME": "Ann", "X": 1.5e-3}, {"ID": 2, "NAME": "Łukasz \"Q\"", "X": None},
+           {"ID": 12345678, "NAME": "", "X": -7}]
+BODY = json.dumps({"status": 200, "error": None, "payload": RECORDS, "count": 3}, ensure_ascii=False,
+                  indent=1).encode("utf-8")
+
+
+def split(data, positions):
+    positions = [0, *sorted(positions), len(data)]
+    return [data[start:end] for start, end in zip(positions, positions[1:])]
+
+
+@pytest.mark.parametrize("position", range(1, len(BODY)))
+def test_every_split_point(position):
+    assert list(_iter_json_array(split(BODY, [position]), "payload")) == RECORDS
+
+
+def test_single_byte_chunks():
+    assert list(_iter_json_array(split(BODY, range(1, len(BODY))), "payload")) == RECORDS
+
+
+def test_random_chunks():
+    generator = random.Random(0)
+    for _ in range(200):
+        positions = generator.sample(range(1, len(BODY)), generator.randint(1, 20))
+        assert list(_iter_json_array(split(BODY, positions), "payload")) == RECORDS
+
+
+def test_number_at_chunk_end_is_not_truncated():
+    body = b'{"payload": [12345]}'
+    assert list(_iter_json_array([body[:14], body[14:]], "payload")) == [12345]
+
+
+@pytest.mark.parametrize("body", [b'{}', b'{"payload": []}', b'{"status": 200, "payload": null}',
+                                  b' { "payload" : [ ] , "x" : [1, {"a": 2}] } '])
+def test_empty_or_missing_array(body):
+    assert list(_iter_json_array([body], "payload")) == []
+
+
+def test_truncated_body_raises():
+    with pytest.raises(ValueError):
+        list(_iter_json_array([BODY[:-10]], "payload"))
+
+
+def test_object_pairs_hook():
+    decoder = _RowDecoder("tuple")
+    rows = list(_iter_json_array(split(BODY, [7, 50]), "payload", decoder))
+    assert rows == [tuple(record.values()) for record in RECORDS]
+    assert list(decoder.columns) == ["ID", "NAME", "X"]
+
+
+def test_columns_missing_from_the_first_record():
+    body = json.dumps({"payload": [{"ID": 1}, {"ID": 2, "NAME": "Bob"}]}).encode("utf-8")
+    rows = _RowDecoder("slots", ["ID", "NAME"]).decode(body)["payload"]
+    assert rows.columns == ["ID", "NAME"]
+    assert [row._asdict() for row in rows] == [{"ID": 1, "NAME": None}, {"ID": 2, "NAME": "Bob"}]
+    assert _RowDecoder("tuple", ["ID", "NAME"]).decode(b'{"payload": []}')["payload"].columns == ["ID", "NAME"]
+
+
+def test_columns_colliding_with_row_members_are_rejected():
+    with pytest.raises(ValueError, match="get"):
+        _RowDecoder("slots", ["ID", "get"])
+
+
+def test_payload_which_is_not_an_array_raises():
+    with pytest.raises(ValueError):
+        list(_iter_json_array([b'{"payload": 5}'], "payload"))
+
+
+def test_iter_data_stream(stub, client):
+    stub.add_dataset("LIB", "DATA", [column("ID"), column("NAME", "char"), column("X")], RECORDS * 5)
+    records = list(client.iter_data("LIB", "DATA", server_name="SASApp", page_size=4, stream=True))
+    assert records == RECORDS * 5
+    rows = list(client.iter_data("LIB", "DATA", server_name="SASApp", page_size=4, stream=True, pages=True,
+                                 row_format="tuple"))
+    assert [len(chunk) for chunk in rows] == [4, 4, 4, 3]
+    assert rows[0].columns == ["ID", "NAME", "X"]
@@ -0,0 +1,14 @@
+import pytest
+
+from sas9api import _choose_key
+
+
+@pytest.mark.parametrize("columns, expected", [
+    ([{"name": "A", "sortedBy": 0}, {"name": "B", "sortedBy": 1}], "B"),
+    ([{"name": "A", "sortedBy": 2}, {"name": "B", "sortedBy": 1}], "B"),
+    ([{"name": "A", "sortedBy": -1}, {"name": "B", "sortedBy": 2}], None),
+    ([{"name": "A", "sortedBy": 0, "indexType": "SIMPLE"}], None),
+    ([], None),
+])
+def test_choose_key(columns, expected):
+    assert _choose_key(columns) == expected
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from conftest import column
+
+
+COLUMNS = [column("ID"), column("NAME", "char")]
+RECORDS = [{"ID": index, "NAME": f"n{index}"} for index in range(25)]
+
+
+@pytest.fixture
+def dataset(stub):
+    stub.add_dataset("LIB", "DATA", COLUMNS, RECORDS)
+    return stub
+
+
+def offsets(stub):
+    return [int(params["offset"]) for _, _, params in stub.requests("GET", "/data")]
+
+
+def test_iter_data_pages_by_the_number_of_records(dataset, client):
+    assert list(client.iter_data("LIB", "DATA", server_name="SASApp", page_size=10)) == RECORDS
+    assert offsets(dataset) == [0, 10, 20]
+    pages = list(client.iter_data("LIB", "DATA", server_name="SASApp", page_size=10, offset=5, pages=True))
+    assert [len(page) for page in pages] == [10, 10]
+
+
+def test_iter_data_with_a_filter_stops_at_a_short_page(dataset, client):
+    records = client.iter_data("LIB", "DATA", server_name="SASApp", page_size=4,
+                               filter_=json.dumps({"ID": {"$lt": 8}}))
+    assert [record["ID"] for record in records] == list(range(8))
+    assert offsets(dataset) == [0, 4, 8]
+
+
+def test_iter_data_is_lazy(dataset, client):
+    records = client.iter_data("LIB", "DATA", server_name="SASApp", page_size=10)
+    assert next(records) == RECORDS[0]
+    assert offsets(dataset) == [0]
+
+
+def test_iter_data_raises_for_a_failed_page(dataset, client):
+    records = client.iter_data("LIB", "DATA", server_name="SASApp", page_size=10)
+    next(records)
+    dataset.fail = 1
+    with pytest.raises(RuntimeError, match="at offset 10"):
+        list(records)
+
+
+def test_prefetch_returns_the_pages_in_order(dataset, client):
+    records = list(client.iter_data("LIB", "DATA", server_name="SASApp", page_size=3, prefetch=4))
+    assert records == RECORDS
+    assert sorted(offsets(dataset)) == list(range(0, 25, 3))
+
+
+def test_prefetch_stops_requesting_when_the_consumer_stops(dataset, client):
+    records = client.iter_data("LIB", "DATA", server_name="SASApp", page_size=1, prefetch=2)
+    assert next(records) == RECORDS[0]
+    records.close()
+    assert len(offsets(dataset)) <= 4
+
+
+def test_prefetch_raises_for_a_failed_page(dataset, client):
+    records = client.iter_data("LIB", "DATA", server_name="SASApp", page_size=2, prefetch=2)
+    next(records)
+    dataset.fail = 100
+    with pytest.raises(RuntimeError, match="Failed to retrieve data"):
+        list(records)
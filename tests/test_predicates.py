@@ -0,0 +1,123 @@
+import datetime
+import json
+
+import pytest
+from conftest import column
+
+from sas9api import ExtractionJob, _dataset_key, _page_to_columns, col
+
+
+np = pytest.importorskip("numpy")
+
+COLUMNS = [{"name": "ID", "type": "num", "length": 8},
+           {"name": "NAME", "type": "char", "length": 6},
+           {"name": "D", "type": "num", "length": 8, "format": "DATE9."},
+           {"name": "X", "type": "num", "length": 8}]
+PAGE = [{"ID": 1, "NAME": "apple", "D": "2020-01-01", "X": 1.5},
+        {"ID": 2, "NAME": "", "D": None, "X": None},
+        {"ID": 3, "NAME": "banana", "D": "2021-06-30", "X": -2.0},
+        {"ID": 4, "NAME": "avocado", "D": "2019-12-31", "X": 0.0}]
+SERVER = {"server_name": "SASApp", "repository_name": "Foundation", "server_url": None, "server_port": None}
+
+
+def matching(predicate, page=PAGE):
+    mask = predicate.bind(COLUMNS).evaluate(_page_to_columns(page, COLUMNS))
+    return [record["ID"] for record, selected in zip(page, mask) if selected]
+
+
+def test_bind_checks_columns_and_types():
+    assert (col("id") > 1).bind(COLUMNS).column == "ID"
+    with pytest.raises(ValueError):
+        (col("MISSING") > 1).bind(COLUMNS)
+    with pytest.raises(ValueError):
+        (col("NAME") > 1).bind(COLUMNS)
+    with pytest.raises(ValueError):
+        (col("ID") == "1").bind(COLUMNS)
+    with pytest.raises(ValueError):
+        col("ID").startswith("1").bind(COLUMNS)
+    with pytest.raises(ValueError):
+        (col("ID") > None).bind(COLUMNS)
+
+
+def test_bool_raises():
+    with pytest.raises(TypeError):
+        bool(col("ID") > 1)
+
+
+def test_split_pushes_supported_conditions():
+    predicate = ((col("ID") > 1) & col("NAME").isin(["apple", "banana"])).bind(COLUMNS)
+    assert predicate.split() == ({"$and": [{"ID": {"$gt": 1}}, {"NAME": {"$in": ["apple", "banana"]}}]}, None)
+    predicate = ((col("ID") == 1) | (col("ID") == 3)).bind(COLUMNS)
+    assert predicate.split() == ({"$or": [{"ID": 1}, {"ID": 3}]}, None)
+
+
+def test_split_keeps_strings_dates_and_missing_values_on_the_client():
+    predicate = ((col("ID") >= 2) & col("NAME").startswith("a")
+                 & (col("D") > datetime.date(2020, 1, 1))).bind(COLUMNS)
+    server, residual = predicate.split()
+    assert server == {"ID": {"$gte": 2}}
+    assert residual._columns() == {"NAME", "D"}
+    server, residual = ((col("ID") == 1) | col("X").is_missing()).bind(COLUMNS).split()
+    assert server is None and residual.operator == "or"
+
+
+def test_evaluate_comparisons_and_strings():
+    assert matching(col("X") > 0) == [1]
+    assert matching(col("NAME").startswith("a")) == [1, 4]
+    assert matching(col("NAME").contains("an")) == [3]
+    assert matching(~col("NAME").startswith("a")) == [2, 3]
+    assert matching(col("ID").isin([2, 4]) | (col("X") < -1)) == [2, 3, 4]
+    assert matching(col("ID").between(2, 3)) == [2, 3]
+
+
+def test_evaluate_missing_values_sort_first():
+    assert matching(col("X").is_missing()) == [2]
+    assert matching(col("X") != None) == [1, 3, 4]
+    assert matching(col("X") < 0) == [2, 3]
+    assert matching(col("X").isin([None, 1.5])) == [1, 2]
+    assert matching(col("NAME") == None) == [2]
+
+
+def test_evaluate_dates():
+    assert matching(col("D") >= datetime.date(2020, 1, 1)) == [1, 3]
+    assert matching(col("D") < datetime.date(2020, 1, 1)) == [2, 4]
+    with pytest.raises(ValueError):
+        matching(col("X") > datetime.date(2020, 1, 1))
+
+
+def test_date_column_without_values():
+    page = [dict(record, D=None) for record in PAGE]
+    assert matching(col("D") >= datetime.date(2020, 1, 1), page) == []
+    unformatted = [dict(column) for column in COLUMNS]
+    del unformatted[2]["format"]
+    predicate = (col("D") >= datetime.date(2020, 1, 1)).bind(unformatted)
+    assert not predicate.evaluate(_page_to_columns(page, unformatted)).any()
+
+
+def test_key_is_structural():
+    first = (col("ID") > 1) & col("NAME").isin(["a", "b"])
+    second = (col("ID") > 1) & col("NAME").isin(["a", "b"])
+    assert first._key() == second._key()
+    assert hash(first._key()) == hash(second._key())
+    assert first._key() != ((col("ID") > 2) & col("NAME").isin(["a", "b"]))._key()
+    assert _dataset_key("http://h/", "l", "d", SERVER, first) == _dataset_key("http://h", "L", "D", SERVER, second)
+
+
+def test_iter_data_parallel_and_keyset_send_predicates_as_filters(stub, client):
+    stub.add_dataset("LIB", "DATA", [column("ID", sortedBy=1), column("NAME", "char")],
+                     [{"ID": index, "NAME": f"n{index}"} for index in range(30)])
+    predicate = col("id") >= 25
+    pages = list(client.iter_data_parallel("LIB", "DATA", server_name="SASApp", page_size=10, filter_=predicate))
+    assert [record["ID"] for _, page in pages for record in page] == [25, 26, 27, 28, 29]
+    records = list(client.iter_data_keyset("LIB", "DATA", server_name="SASApp", page_size=2, filter_=predicate))
+    assert [record["ID"] for record in records] == [25, 26, 27, 28, 29]
+    filters = [json.loads(params["filter"]) for _, _, params in stub.requests("GET", "/data") if "filter" in params]
+    assert filters[0] == {"ID": {"$gte": 25}}
+
+
+def test_predicates_evaluated_on_the_client_are_rejected_by_raw_downloads(stub, client, tmp_path):
+    stub.add_dataset("LIB", "DATA", [column("ID"), column("NAME", "char")], [{"ID": 1, "NAME": None}])
+    with pytest.raises(ValueError, match="not supported by the server"):
+        client.spool_pages("LIB", "DATA", str(tmp_path), server_name="SASApp", filter_=col("NAME") == None)  # noqa: E711
+    with pytest.raises(TypeError):
+        ExtractionJob(str(tmp_path), "http://sas", "LIB", "DATA", server_name="SASApp", filter_=col("ID") > 0)
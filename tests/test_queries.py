@@ -0,0 +1,38 @@
+import datetime
+
+import pytest
+
+from sas9api import Query
+
+
+COLUMNS = [{"name": "ID", "type": "num", "length": 8},
+           {"name": "NAME", "type": "char", "length": 6},
+           {"name": "D", "type": "num", "length": 8, "format": "DATE9."},
+           {"name": "X", "type": "num", "length": 8}]
+
+
+def test_query_compile():
+    query = (Query("lib", "t").select("name").where("ID", ">", 3).where("NAME", "in", ["a'b", "c"])
+             .where("D", ">=", datetime.date(2020, 1, 2)).where("X", "=", None)
+             .group_by("NAME").aggregate("N", "count").aggregate("TOTAL", "sum", "X")
+             .order_by("N", descending=True))
+    sql = query.compile(COLUMNS, "WORK.R")
+    assert "create table WORK.R as" in sql
+    assert "select NAME, count(*) as N, sum(X) as TOTAL" in sql
+    assert "from lib.t" in sql
+    assert "ID > 3" in sql
+    assert "NAME in ('a''b', 'c')" in sql
+    assert "D >= '02JAN2020'D" in sql
+    assert "group by NAME" in sql
+    assert "order by N desc" in sql
+
+
+def test_query_compile_rejects_invalid_queries():
+    with pytest.raises(ValueError):
+        Query("lib", "t").where("ID", "like", 1)
+    with pytest.raises(ValueError):
+        Query("lib", "t").aggregate("S", "sum", "NAME").compile(COLUMNS, "WORK.R")
+    with pytest.raises(ValueError):
+        Query("lib", "t").select("UNKNOWN").compile(COLUMNS, "WORK.R")
+    with pytest.raises(ValueError):
+        Query("lib", "t").select("ID").aggregate("N", "count").compile(COLUMNS, "WORK.R")
@@ -0,0 +1,40 @@
+import re
+
+from conftest import column
+
+
+COLUMNS = [column("ID"), column("NAME", "char")]
+CHECKSUMS = [column("_block"), column("_rows"), column("_h1"), column("_h2")]
+
+
+def run_sas(stub, checksums, blocks):
+    """Creates the tables of the checksum and block commands from the given results by dataset."""
+
+    def on_command(command, params):
+        dataset = re.search(r"set (\w+\.\w+)", command).group(1)
+        table = re.search(r"create table (\w+)\.(\w+)|data (\w+)\.(\w+)\(", command).groups()
+        library, name = table[:2] if table[0] else table[2:]
+        if "create table" in command:
+            stub.add_dataset(library, name, CHECKSUMS, checksums[dataset, params["repositoryName"]])
+        else:
+            stub.add_dataset(library, name, COLUMNS, blocks[dataset])
+
+    stub.on_command = on_command
+
+
+def test_reconcile_datasets_in_another_repository(stub, client):
+    stub.add_dataset("LIB", "DATA", COLUMNS, [])
+    stub.add_dataset("LIB", "COPY", COLUMNS, [])
+    run_sas(stub, {("LIB.DATA", "Foundation"): [{"_block": 0, "_rows": 2, "_h1": 1, "_h2": 2},
+                                                {"_block": 1, "_rows": 1, "_h1": 3, "_h2": 4}],
+                   ("LIB.COPY", "Backup"): [{"_block": 0, "_rows": 2, "_h1": 1, "_h2": 2},
+                                            {"_block": 1, "_rows": 1, "_h1": 3, "_h2": 5}]},
+            {"LIB.DATA": [{"ID": 3, "NAME": "c"}], "LIB.COPY": [{"ID": 3, "NAME": "C"}]})
+    result = client.reconcile_datasets("LIB", "DATA", "id", "SCRATCH", server_name="SASApp",
+                                       target_dataset_name="COPY", target_repository_name="Backup", blocks=2)
+    assert result["differing_blocks"] == [1]
+    assert (result["source_records"], result["target_records"]) == (3, 3)
+    assert result["changed"] == [({"ID": 3, "NAME": "c"}, [{"ID": 3, "NAME": "C"}])]
+    assert result["missing"] == result["extra"] == []
+    # The scratch tables are deleted
+    assert sorted(stub.datasets) == [("LIB", "COPY"), ("LIB", "DATA")]
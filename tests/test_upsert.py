@@ -0,0 +1,45 @@
+import datetime
+
+import pytest
+from conftest import column
+
+from sas9api import _sas_literal
+
+
+COLUMNS = [column("ID"), column("NAME", "char"), column("DAY", format="DATE9.")]
+
+
+def test_sas_literal_of_iso_dates():
+    assert _sas_literal("2020-01-05", "num") == "'05JAN2020'D"
+    assert _sas_literal("2020-01-05T10:20:30", "num") == "'05JAN2020:10:20:30'DT"
+    assert _sas_literal(datetime.date(2020, 1, 5), "num") == "'05JAN2020'D"
+    assert _sas_literal("O'Neil", "char") == "'O''Neil'"
+
+
+def test_upsert_changes_sends_only_changed_records(stub, client):
+    stub.add_dataset("LIB", "DATA", COLUMNS, [{"ID": index, "NAME": f"n{index}", "DAY": "2020-01-01"}
+                                              for index in range(5)])
+    records = [{"ID": 0, "NAME": "n0", "DAY": "2020-01-01"}, {"ID": 1, "NAME": "changed", "DAY": "2020-01-01"},
+               {"ID": 9, "NAME": "new", "DAY": "2020-01-02"}]
+    summary = client.upsert_changes("LIB", "DATA", records, "ID", server_name="SASApp")
+    assert (summary["inserted"], summary["changed"], summary["unchanged"], summary["deleted"]) == (1, 1, 1, 3)
+    sent = stub.requests("PUT", "/data")
+    assert len(sent) == 1 and sent[0][2]["byKey"] == "ID"
+    assert {record["ID"]: record["NAME"] for record in stub.records("LIB", "DATA")}[1] == "changed"
+
+
+def test_upsert_changes_deletes_unseen_date_keys(stub, client):
+    stub.add_dataset("LIB", "DATA", COLUMNS, [{"ID": index, "NAME": "a", "DAY": f"2020-01-0{index + 1}"}
+                                              for index in range(3)])
+    records = [{"DAY": "2020-01-01", "NAME": "a", "ID": 0}]
+    summary = client.upsert_changes("LIB", "DATA", records, "DAY", server_name="SASApp", delete=True)
+    assert summary["deleted"] == 2
+    assert stub.commands == ["proc sql; delete from LIB.DATA where DAY in ('02JAN2020'D, '03JAN2020'D); quit;"]
+
+
+def test_upsert_changes_rejects_duplicate_keys(stub, client):
+    stub.add_dataset("LIB", "DATA", COLUMNS, [{"ID": 1, "NAME": "a", "DAY": None},
+                                              {"ID": 1, "NAME": "b", "DAY": None}])
+    with pytest.raises(ValueError, match="not unique in LIB.DATA"):
+        client.upsert_changes("LIB", "DATA", [{"ID": 1, "NAME": "a", "DAY": None}], "ID", server_name="SASApp")
+    assert stub.requests("PUT") == []